@@ -0,0 +1,176 @@
+"""
+An ASGI serving mode of the microservice, run with any ASGI server, e.g. uvicorn asgi:app.
+
+Solves are CPU bound, so they're offloaded to a bounded executor (worker processes when RUBIK_WORKERS is greater than
+1, otherwise a worker thread) while check and info requests are answered straight away on the event loop. Once the
+executor's workers and queue are full, further solves are answered with 503 and a Retry-After header rather than
+queueing without bound.
+"""
+import asyncio
+import os
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qsl
+
+from rubik.cache import CACHE, RESPONSE_CACHE
+from rubik.dispatch import dispatch, dispatch_batch, INVALID_JSON, parse_batch
+from rubik.pool import bounded_executor, Saturated
+from rubik.response import dumps, dumps_lines, JSON, JSONL, render, render_cached, render_result
+from rubik.stream import dispatch_item, parse_lines
+
+
+"""
+The executor is sized by the RUBIK_WORKERS and RUBIK_QUEUE_DEPTH environment variables, and saturated responses ask
+clients to retry after RUBIK_RETRY_AFTER seconds.
+"""
+WORKERS = int(os.getenv("RUBIK_WORKERS", "1"))
+QUEUE_DEPTH = int(os.getenv("RUBIK_QUEUE_DEPTH", str(WORKERS * 4)))
+RETRY_AFTER = int(os.getenv("RUBIK_RETRY_AFTER", "1"))
+
+"""
+The ops answered on the event loop, every other op is offloaded to the executor.
+"""
+INLINE_OPS = ("check", "info", "simplify")
+
+EXECUTOR = bounded_executor(WORKERS, QUEUE_DEPTH)
+
+
+async def _offload(function: Callable, *args):
+    """Run function(*args) on the executor, raising Saturated if it's full."""
+    return await asyncio.wrap_future(EXECUTOR.submit(function, *args))
+
+
+async def _cache_io(function: Callable, *args):
+    """Run a response cache lookup or store, on a thread when the cache has a disk tier whose SQLite lock could block
+    the event loop, and straight away when it's only held in memory."""
+    if RESPONSE_CACHE.path is None:
+        return function(*args)
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+async def _read_body(receive: Callable) -> bytes:
+    body, more = b"", True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+    return body
+
+
+def _request_headers(scope: dict) -> Dict[str, str]:
+    return {name.decode().lower(): value.decode() for name, value in scope.get("headers", [])}
+
+
+async def _respond(send: Callable, status: int, headers: Dict[str, str], body: bytes):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _error(send: Callable, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+    await _respond(send, status, {"Content-Type": JSON, **(headers or {})}, dumps({"status": f"error: {message}"}))
+
+
+async def _saturated(send: Callable):
+    await _error(send, 503, "the server is saturated", {"Retry-After": str(RETRY_AFTER)})
+
+
+async def server(scope: dict, receive: Callable, send: Callable):
+    params = {}
+    for param, value in parse_qsl(scope.get("query_string", b"").decode(), keep_blank_values=True):
+        params.setdefault(param, value)
+    cached = await _cache_io(render_cached, params, _request_headers(scope), RESPONSE_CACHE)
+    if cached is not None:
+        return await _respond(send, *cached)
+    try:
+        if params.get("op") in INLINE_OPS:
+            result = dispatch(params)
+        else:
+            result = await _offload(dispatch, params)
+    except Saturated:
+        return await _saturated(send)
+    except Exception as e:
+        return await _error(send, 200, str(e))
+    await _respond(send, *await _cache_io(render_result, params, result, _request_headers(scope), RESPONSE_CACHE))
+
+
+async def batch_server(scope: dict, receive: Callable, send: Callable):
+    body = (await _read_body(receive)).decode()
+    try:
+        items, jsonl = parse_batch(body)
+        results = await _offload(dispatch_batch, items)
+    except Saturated:
+        return await _saturated(send)
+    except Exception as e:
+        return await _error(send, 200, str(e))
+    body = dumps_lines(results) if jsonl else dumps(results)
+    await _respond(send, *render(body, JSONL if jsonl else JSON, _request_headers(scope)))
+
+
+async def _offload_waiting(function: Callable, *args):
+    """Run function(*args) on the executor, waiting for room rather than raising Saturated."""
+    while True:
+        try:
+            return await _offload(function, *args)
+        except Saturated:
+            await asyncio.sleep(0.01)
+
+
+async def _lines(receive: Callable):
+    """Yield each line of a request body as it arrives."""
+    buffer, more = b"", True
+    while more:
+        message = await receive()
+        buffer += message.get("body", b"")
+        more = message.get("more_body", False)
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def stream_server(scope: dict, receive: Callable, send: Callable):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", JSONL.encode())]})
+    async for line in _lines(receive):
+        for item in parse_lines([line]):
+            if item is INVALID_JSON or not isinstance(item, dict) or item.get("op") in INLINE_OPS:
+                result = dispatch_item(item)
+            else:
+                result = await _offload_waiting(dispatch_item, item)
+            await send({"type": "http.response.body", "body": dumps(result) + b"\n", "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def cache_server(scope: dict, receive: Callable, send: Callable):
+    await _respond(send, 200, {"Content-Type": JSON}, dumps({**CACHE.stats(), "responses": RESPONSE_CACHE.stats()}))
+
+
+ROUTES = {
+    ("GET", "/rubik"): server,
+    ("POST", "/rubik/batch"): batch_server,
+    ("POST", "/rubik/stream"): stream_server,
+    ("GET", "/rubik/cache"): cache_server,
+}
+
+
+async def app(scope: dict, receive: Callable, send: Callable):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                EXECUTOR.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    elif scope["type"] == "http":
+        route = ROUTES.get((scope["method"], scope["path"]))
+        if route is None:
+            await _error(send, 404, "not found")
+        else:
+            await route(scope, receive, send)
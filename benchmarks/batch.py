@@ -0,0 +1,52 @@
+"""
+Compares the moves/second of rotating cubes one at a time against rotating them all at once as a CubeBatch.
+
+Usage: python benchmarks/batch.py [--cubes N] [--moves N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.batch import CubeBatch  # noqa: E402
+from rubik.cube import Cube, ROTATIONS  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cubes", type=int, default=10_000)
+    parser.add_argument("--moves", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+    moves = [[rng.choice(faces) for _ in range(args.cubes)] for _ in range(args.moves)]
+    total = args.cubes * args.moves
+
+    cubes = [Cube(SOLVED_CUBE) for _ in range(args.cubes)]
+    start = time.perf_counter()
+    for step in moves:
+        for cube, face in zip(cubes, step):
+            cube.rotate(face)
+    single = total / (time.perf_counter() - start)
+
+    batch = CubeBatch([SOLVED_CUBE] * args.cubes)
+    start = time.perf_counter()
+    for step in moves:
+        batch.rotate_each(step)
+    batched = total / (time.perf_counter() - start)
+
+    assert batch.to_strings() == [str(cube) for cube in cubes]
+    print(f"cube:  {single:>14,.0f} moves/s")
+    print(f"batch: {batched:>14,.0f} moves/s ({batched / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
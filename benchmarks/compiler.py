@@ -0,0 +1,58 @@
+"""
+Compares rotating a cube one char at a time against applying a compiled rotation sequence.
+
+Usage: python benchmarks/compiler.py [--lengths N ...] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube, ROTATIONS, _compile_block  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 1_000, 100_000])
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+    print(f"{'length':>8} {'per char':>12} {'compile':>12} {'compiled':>12}")
+    for length in args.lengths:
+        rotations = "".join(rng.choice(faces) for _ in range(length))
+        repeat = max(1, 10_000 // length)
+
+        def per_char():
+            cube = Cube(SOLVED_CUBE)
+            for rotation in rotations:
+                cube.rotate(rotation)
+
+        def compiled():
+            Cube(SOLVED_CUBE).rotate_sequence(rotations)
+
+        per_char_time = timed(per_char, repeat)
+        _compile_block.cache_clear()
+        compile_time = timed(compiled, 1)
+        compiled_time = timed(compiled, repeat)
+        print(
+            f"{length:>8} {per_char_time * 1e3:>10.3f}ms {compile_time * 1e3:>10.3f}ms {compiled_time * 1e3:>10.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
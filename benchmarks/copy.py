@@ -0,0 +1,76 @@
+"""
+Compares the ways of branching on a cube's state: the Cube(str(cube)) round trip, Cube.copy, snapshot/restore and
+undoing moves with push/pop.
+
+Each is timed branching a scrambled cube, trying one move and going back, as a search would for every node.
+
+Usage: python benchmarks/copy.py [--branches N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube, ROTATIONS  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def round_trip(cube: Cube, face: str) -> Cube:
+    branch = Cube(str(cube))
+    branch.rotate(face)
+    return cube
+
+
+def copy(cube: Cube, face: str) -> Cube:
+    branch = cube.copy()
+    branch.rotate(face)
+    return cube
+
+
+def snapshot(cube: Cube, face: str) -> Cube:
+    state = cube.snapshot()
+    cube.rotate(face)
+    cube.restore(state)
+    return cube
+
+
+def push_pop(cube: Cube, face: str) -> Cube:
+    cube.push(face)
+    cube.pop()
+    return cube
+
+
+BRANCHES = {"str round trip": round_trip, "copy": copy, "snapshot/restore": snapshot, "push/pop": push_pop}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--branches", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    faces = [rng.choice(list(ROTATIONS.keys())) for _ in range(args.branches)]
+    for use_cubelets in (False, True):
+        print("cubelets" if use_cubelets else "permutations")
+        baseline = None
+        for name, branch in BRANCHES.items():
+            cube = Cube(SOLVED_CUBE, use_cubelets=use_cubelets)
+            cube.rotate_sequence("FRuLBd")
+            before = str(cube)
+            start = time.perf_counter()
+            for face in faces:
+                branch(cube, face)
+            rate = args.branches / (time.perf_counter() - start)
+            assert str(cube) == before
+            baseline = baseline or rate
+            print(f"  {name:>16}: {rate:>12,.0f} branches/s ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compares the moves/second of the sticker permutation engine against the cubelet object model.
+
+Usage: python benchmarks/engine.py [--moves N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube, ROTATIONS  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def moves_per_second(use_cubelets: bool, moves: str) -> float:
+    cube = Cube(SOLVED_CUBE, use_cubelets=use_cubelets)
+    start = time.perf_counter()
+    for move in moves:
+        cube.rotate(move)
+    return len(moves) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--moves", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+    moves = "".join(rng.choice(faces) for _ in range(args.moves))
+
+    cubelets = moves_per_second(True, moves)
+    permutations = moves_per_second(False, moves)
+    print(f"cubelets:     {cubelets:>12,.0f} moves/s")
+    print(f"permutations: {permutations:>12,.0f} moves/s ({permutations / cubelets:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares the beginner method's top layer stages against the cfop method's OLL/PLL lookups for the last layer.
+
+Each method solves the same scrambles, both outright and from the cubes with their first two layers already solved, as
+the methods only differ in the last layer.
+
+Usage: python benchmarks/lastlayer.py [--cubes N] [--seed N]
+"""
+import argparse
+from itertools import groupby
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik import lastlayer  # noqa: E402
+from rubik.cube import Cube  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+"""
+The stage that solves the last layer in each method.
+"""
+LAST_LAYERS = {"beginner": "_top_layer", "cfop": "_last_layer"}
+
+
+def moves(solution: str) -> int:
+    """Count the face turns of a solution, each run of the same rotation char counting as one (or none if it's 4)."""
+    return sum(1 for _, run in groupby(solution) if len(list(run)) % 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cubes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scrambles, first_two_layers = [], []
+    for _ in range(args.cubes):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble()
+        scrambles.append(str(cube))
+        cube._middle_layer()
+        first_two_layers.append(str(cube))
+    lastlayer.cases()
+
+    for method, stage in LAST_LAYERS.items():
+        start, solutions = time.perf_counter(), []
+        for cube_str in first_two_layers:
+            solutions.append(getattr(Cube(cube_str), stage)())
+        last_layer = (time.perf_counter() - start) / args.cubes
+        last_layer_moves = sum(map(moves, solutions)) / args.cubes
+
+        start, solutions = time.perf_counter(), []
+        for cube_str in scrambles:
+            solutions.append(Cube(cube_str).solve(method))
+        solve = (time.perf_counter() - start) / args.cubes
+        solve_moves = sum(map(moves, solutions)) / args.cubes
+
+        print(
+            f"{method:>8}: last layer {last_layer * 1000:.3f} ms {last_layer_moves:5.1f} moves"
+            f"  solve {solve * 1000:.3f} ms {solve_moves:5.1f} moves"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Load tests the ASGI app with concurrent mixed traffic and reports the latency of each op.
+
+By default requests are driven straight through asgi.app in process, so no server is needed. Given --url, they're sent
+over HTTP to a running server instead, e.g. one started with uvicorn asgi:app.
+
+Usage: python benchmarks/load.py [--requests N] [--concurrency N] [--solves F] [--seed N] [--url URL]
+"""
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def traffic(count: int, solves: float, seed: int) -> List[Tuple[str, dict]]:
+    """Generate a mix of solve, check and info requests, a fraction solves of them solves of random scrambles."""
+    random.seed(seed)
+    result = []
+    for _ in range(count):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble()
+        op = "solve" if random.random() < solves else random.choice(("check", "info"))
+        result.append((op, {"op": op, "cube": str(cube)}))
+    return result
+
+
+async def in_process(params: dict) -> int:
+    """Send a request straight through the ASGI app, returning the status code."""
+    from asgi import app
+
+    scope = {"type": "http", "method": "GET", "path": "/rubik", "query_string": urlencode(params).encode()}
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+def over_http(url: str):
+    """Obtain a function that sends a request to a running server, returning the status code."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+
+    async def request(params: dict) -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f"GET /rubik?{urlencode(params)} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        await reader.read()
+        writer.close()
+        return status
+
+    return request
+
+
+async def run(requests: List[Tuple[str, dict]], concurrency: int, send) -> Tuple[dict, float]:
+    latencies, statuses = defaultdict(list), defaultdict(Counter)
+    queue = list(reversed(requests))
+
+    async def client():
+        while queue:
+            op, params = queue.pop()
+            start = time.perf_counter()
+            status = await send(params)
+            latencies[op].append(time.perf_counter() - start)
+            statuses[op][status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return {op: (latencies[op], statuses[op]) for op in sorted(latencies)}, time.perf_counter() - start
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--solves", type=float, default=0.5, help="the fraction of requests that are solves")
+    parser.add_argument("--seed", type=int, default=5700)
+    parser.add_argument("--url", help="the base url of a running server, e.g. http://localhost:8000")
+    args = parser.parse_args()
+
+    requests = traffic(args.requests, args.solves, args.seed)
+    results, elapsed = asyncio.run(run(requests, args.concurrency, over_http(args.url) if args.url else in_process))
+
+    print(f"{len(requests) / elapsed:,.0f} requests/s at a concurrency of {args.concurrency}")
+    for op, (latencies, statuses) in results.items():
+        codes = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+        print(
+            f"{op:>6}: p50 {percentile(latencies, 0.5) * 1000:>8.2f} ms"
+            f"  p99 {percentile(latencies, 0.99) * 1000:>8.2f} ms  ({codes})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares the moves/second of the cubelet object model against the sticker array NxN engine as the degree n grows.
+
+Each engine applies the same random slice moves, the tables of the NxN engine are built (and timed) before it's timed.
+The cubelet object model is only timed up to --cubelets-max, as it gets too slow beyond it.
+
+Usage: python benchmarks/nxn.py [--degrees N ...] [--moves N] [--cubelets-max N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube, ROTATIONS  # noqa: E402
+from rubik.nxn import layer_runs, NxNCube  # noqa: E402
+
+
+def moves_per_second(cube, moves) -> float:
+    start = time.perf_counter()
+    for face, offset in moves:
+        cube.rotate(face, offset)
+    return len(moves) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--degrees", type=int, nargs="+", default=[3, 5, 7, 11, 21, 51, 100])
+    parser.add_argument("--moves", type=int, default=2000)
+    parser.add_argument("--cubelets-max", type=int, default=21)
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+    print(f"{'n':>4} {'cubelets':>14} {'nxn':>14} {'speedup':>8} {'tables':>9}")
+    for n in args.degrees:
+        rng = random.Random(args.seed)
+        moves = [(rng.choice(faces), rng.randrange(n)) for _ in range(args.moves)]
+        cube_str = "".join(color * n**2 for color in "bbrgoy")
+
+        start = time.perf_counter()
+        for face in faces:
+            for offset in range(n):
+                layer_runs(n, ROTATIONS[face.lower()]["normal"], offset, 1 if face.isupper() else 3)
+        tables = time.perf_counter() - start
+
+        nxn = NxNCube(cube_str)
+        array = moves_per_second(nxn, moves)
+        if n <= args.cubelets_max:
+            cube = Cube(cube_str, use_cubelets=True)
+            cubelets = moves_per_second(cube, moves)
+            assert str(cube) == str(nxn)
+            print(f"{n:>4} {cubelets:>14,.0f} {array:>14,.0f} {array / cubelets:>7.1f}x {tables:>8.3f}s")
+        else:
+            print(f"{n:>4} {'-':>14} {array:>14,.0f} {'-':>8} {tables:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Reports the solve throughput of SolverPool at 1, 2, 4 and N workers on random scrambles.
+
+Usage: python benchmarks/pool.py [--cubes N] [--seed N] [--workers N ...]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube  # noqa: E402
+from rubik.pool import SolverPool  # noqa: E402
+from rubik.solve import solve_many  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def scrambles(count: int, seed: int):
+    random.seed(seed)
+    result = []
+    for _ in range(count):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble()
+        result.append({"op": "solve", "cube": str(cube)})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cubes", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=5700)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    items = scrambles(args.cubes, args.seed)
+
+    start = time.perf_counter()
+    solve_many(items)
+    serial = len(items) / (time.perf_counter() - start)
+    print(f"serial:     {serial:>10,.0f} cubes/s")
+
+    for workers in args.workers:
+        with SolverPool(workers) as pool:
+            pool.solve_many(items[: workers * 4])  # make sure every worker is started and warm
+            start = time.perf_counter()
+            pool.solve_many(items)
+            throughput = len(items) / (time.perf_counter() - start)
+        print(f"{workers:>2} workers: {throughput:>10,.0f} cubes/s ({throughput / serial:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compares the solve progress predicates (is_solved, is_bottom_crossed, ... is_top_cornered) tracked as the cube rotates
+against re-scanning the faces on every call, as they did before.
+
+Each is timed calling every predicate on the cubes a solve passes through, then solving the scrambles outright.
+
+Usage: python benchmarks/progress.py [--cubes N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube, SIDES  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+PREDICATES = (
+    "is_solved",
+    "is_bottom_crossed",
+    "is_bottom_layered",
+    "is_middle_layered",
+    "is_top_crossed",
+    "is_top_surfaced",
+    "is_top_cornered",
+)
+
+CROSS = ((0, 1), (1, 0), (1, 2), (2, 1))
+
+
+class ScanningCube(Cube):
+    """A cube whose progress predicates scan its faces on every call, and that doesn't track its mismatches."""
+
+    def _mismatches(self) -> int:
+        return 0
+
+    def is_solved(self) -> bool:
+        size, stickers = self.n**2, self._stickers
+        return all(stickers.count(stickers[i + size // 2], i, i + size) == size for i in range(0, 6 * size, size))
+
+    def is_top_cornered(self) -> bool:
+        return self.is_top_surfaced() and all(
+            self._sticker(y, x, normal) == self._color(normal) for normal in SIDES for y, x in ((0, 0), (2, 0))
+        )
+
+    def is_top_surfaced(self) -> bool:
+        return self.is_middle_layered() and self._face_matches("z_pos")
+
+    def is_top_crossed(self) -> bool:
+        return self.is_middle_layered() and all(self._sticker(y, x, "z_pos") == self._color("z_pos") for y, x in CROSS)
+
+    def is_middle_layered(self) -> bool:
+        return self.is_bottom_layered() and all(
+            sticker == self._color(normal) for normal in SIDES for sticker in self._face_stickers(normal)[1]
+        )
+
+    def is_bottom_layered(self) -> bool:
+        return self._face_matches("z_neg") and all(
+            sticker == self._color(normal) for normal in SIDES for sticker in self._face_stickers(normal)[2]
+        )
+
+    def is_bottom_crossed(self) -> bool:
+        return all(self._sticker(y, x, "z_neg") == self._color("z_neg") for y, x in CROSS) and all(
+            self._sticker(2, 1, normal) == self._color(normal) for normal in SIDES
+        )
+
+    def _face_matches(self, normal: str) -> bool:
+        return all(sticker == self._color(normal) for row in self._face_stickers(normal) for sticker in row)
+
+
+def stages(scrambles: list) -> list:
+    """Obtain every cube string a beginner solve of each scramble passes through."""
+    result = []
+    for cube_str in scrambles:
+        cube = Cube(cube_str)
+        for rotation in Cube(cube_str).solve():
+            cube.rotate(rotation)
+            result.append(str(cube))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cubes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scrambles = []
+    for _ in range(args.cubes):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble()
+        scrambles.append(str(cube))
+    states = stages(scrambles)
+
+    baseline = None
+    for name, cls in (("scanning", ScanningCube), ("tracked", Cube)):
+        cubes = [cls(cube_str) for cube_str in states]
+        start = time.perf_counter()
+        for cube in cubes:
+            for predicate in PREDICATES:
+                getattr(cube, predicate)()
+        calls = len(cubes) * len(PREDICATES) / (time.perf_counter() - start)
+
+        cubes = [cls(cube_str) for cube_str in scrambles]
+        start = time.perf_counter()
+        for cube in cubes:
+            cube.solve()
+        solves = len(cubes) / (time.perf_counter() - start)
+
+        baseline = baseline or (calls, solves)
+        print(
+            f"{name:>8}: {calls:>12,.0f} predicate calls/s ({calls / baseline[0]:.1f}x)"
+            f"  {solves:>8,.1f} solves/s ({solves / baseline[1]:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares the requests/second of the Flask development server against the gunicorn production entry point.
+
+Each server is started on a free port, warmed up, and sent the same mixed traffic as benchmarks/load.py.
+
+Usage: python benchmarks/serve.py [--requests N] [--concurrency N] [--solves F] [--seed N]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load import over_http, percentile, run, traffic  # noqa: E402
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "flask dev server": [sys.executable, "microservice.py"],
+    "gunicorn": [sys.executable, "-m", "gunicorn", "microservice:app"],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Nothing is listening on port {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--solves", type=float, default=0.5, help="the fraction of requests that are solves")
+    parser.add_argument("--seed", type=int, default=5700)
+    args = parser.parse_args()
+
+    requests = traffic(args.requests, args.solves, args.seed)
+    for name, command in ENTRY_POINTS.items():
+        port = free_port()
+        env = dict(os.environ, PORT=str(port), RUBIK_LOG_BUFFER=os.getenv("RUBIK_LOG_BUFFER", "64"))
+        server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_listening(port)
+            send = over_http(f"http://127.0.0.1:{port}")
+            asyncio.run(run(requests[:100], args.concurrency, send))
+            results, elapsed = asyncio.run(run(requests, args.concurrency, send))
+        finally:
+            server.terminate()
+            server.wait()
+
+        latencies = [latency for op_latencies, _ in results.values() for latency in op_latencies]
+        print(
+            f"{name:>16}: {len(requests) / elapsed:>8,.0f} requests/s"
+            f"  p50 {percentile(latencies, 0.5) * 1000:>7.2f} ms  p99 {percentile(latencies, 0.99) * 1000:>7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Times the cube operations end to end on a seeded corpus of scrambles and writes the results as JSON.
+
+Every case reports its ops/second and the p50/p99 latency of a single call, and the solve cases also report the
+distribution of solution lengths. Results of two commits can be compared by passing the output of one as --baseline.
+
+Usage: python benchmarks/suite.py [--cubes N] [--seed N] [--method M] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cache import CACHE  # noqa: E402
+from rubik.check import check  # noqa: E402
+from rubik.cube import Cube, ROTATIONS, SOLVE_METHODS  # noqa: E402
+from rubik.dispatch import dispatch  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+"""
+The stages of the beginner method in the order they're reached, each stage calls the one before it if it's unmet.
+"""
+STAGES = (
+    "_daisy",
+    "_bottom_cross",
+    "_bottom_layer",
+    "_middle_layer",
+    "_top_cross",
+    "_top_surface",
+    "_top_corners",
+    "_top_layer",
+)
+
+
+def corpus(count: int, seed: int) -> List[str]:
+    """Generate count scrambled cubes with Cube.scramble, the same cubes for the same seed."""
+    random.seed(seed)
+    result = []
+    for _ in range(count):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble()
+        result.append(str(cube))
+    return result
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Obtain the nearest-rank percentile of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def summarize(samples: List[float]) -> dict:
+    """Summarize the seconds taken by each call of a case."""
+    return {
+        "calls": len(samples),
+        "ops_per_sec": round(len(samples) / sum(samples), 1) if sum(samples) else None,
+        "p50_us": round(percentile(samples, 0.50) * 1e6, 2),
+        "p99_us": round(percentile(samples, 0.99) * 1e6, 2),
+    }
+
+
+def lengths(solutions: Iterable[str]) -> dict:
+    """Summarize the distribution of solution lengths."""
+    values = [len(solution) for solution in solutions]
+    return {
+        "min": min(values),
+        "max": max(values),
+        "mean": round(statistics.mean(values), 2),
+        "p50": percentile(values, 0.50),
+        "p99": percentile(values, 0.99),
+        "histogram": {str(length): values.count(length) for length in sorted(set(values))},
+    }
+
+
+def timed(function: Callable, args: Iterable) -> List[float]:
+    """Call function once per argument, returning the seconds taken by each call."""
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        function(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(cubes: List[str], method: str, seed: int) -> Dict[str, dict]:
+    """Run every case on the corpus."""
+    rng = random.Random(seed)
+    chars = list(ROTATIONS.keys()) + [rotation.upper() for rotation in ROTATIONS.keys()]
+    results = {}
+
+    results["init"] = summarize(timed(Cube, cubes))
+
+    cube = Cube(cubes[0])
+    results["rotate"] = summarize(timed(cube.rotate, [rng.choice(chars) for _ in range(len(cubes) * 20)]))
+
+    results["str"] = summarize(timed(str, [Cube(cube_str) for cube_str in cubes]))
+
+    results["check"] = summarize(timed(check, [{"op": "check", "cube": cube_str} for cube_str in cubes]))
+
+    solutions = []
+
+    def solve(cube_str: str):
+        solutions.append(Cube(cube_str).solve(method))
+
+    results["solve"] = summarize(timed(solve, cubes))
+    results["solve"]["solution_length"] = lengths(solutions)
+
+    if method == "beginner":
+        stages = {stage: ([], []) for stage in STAGES}
+        for cube_str in cubes:
+            cube = Cube(cube_str)
+            for stage in STAGES:
+                start = time.perf_counter()
+                solution = getattr(cube, stage)()
+                stages[stage][0].append(time.perf_counter() - start)
+                stages[stage][1].append(solution)
+        for stage, (samples, solutions) in stages.items():
+            results[f"stage{stage}"] = summarize(samples)
+            results[f"stage{stage}"]["solution_length"] = lengths(solutions)
+
+    CACHE.clear()
+    params = [{"op": "solve", "cube": cube_str, "method": method} for cube_str in cubes]
+    results["dispatch"] = summarize(timed(dispatch, params))
+    return results
+
+
+def commit() -> Optional[str]:
+    """Obtain the commit the benchmark is run on, if it's run in a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cubes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=5700)
+    parser.add_argument("--method", choices=SOLVE_METHODS, default=SOLVE_METHODS[0])
+    parser.add_argument("--output", help="write the results to a file rather than stdout")
+    parser.add_argument("--baseline", help="compare the ops/sec against the results of an earlier run")
+    args = parser.parse_args()
+
+    report = {
+        "commit": commit(),
+        "python": sys.version.split()[0],
+        "cubes": args.cubes,
+        "seed": args.seed,
+        "method": args.method,
+        "results": run(corpus(args.cubes, args.seed), args.method, args.seed),
+    }
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        for case, result in report["results"].items():
+            before = baseline.get(case, {}).get("ops_per_sec")
+            if before and result["ops_per_sec"]:
+                result["speedup"] = round(result["ops_per_sec"] / before, 2)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Profiles Cube.solve with cProfile, reporting the share of the time spent building and reading face views.
+
+With --baseline the cubes instead build each view by slicing planes of the cubelet grid on every call, as they did before
+the views were looked up from face_slots(), so the two can be compared.
+
+Usage: python benchmarks/views.py [--cubes N] [--seed N] [--top N] [--baseline]
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rubik.cube import Cube, FACES  # noqa: E402
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+"""
+The functions of rubik/cube.py (and of PlaneCube) that build or read the stickers of a face view.
+"""
+VIEW_FUNCTIONS = (
+    "_face",
+    "_face_stickers",
+    "_sticker",
+    "_color",
+    "_center_colors",
+    "_front",
+    "_right",
+    "_back",
+    "_left",
+    "_up",
+    "_down",
+    "_xy_plane",
+    "_yz_plane",
+    "_xz_plane",
+    "face_slots",
+)
+
+
+class PlaneCube(Cube):
+    """A cube that slices each face view out of planes of its cubelet grid on every call, rather than looking it up."""
+
+    def _color(self, normal: str) -> str:
+        if self._stickers is not None:
+            return self._colors[normal]
+        return getattr(getattr(self, FACES[normal]["method"])()[self.n // 2][self.n // 2], normal)
+
+    def _sticker(self, y: int, x: int, normal: str) -> str:
+        if self._stickers is not None:
+            return super()._sticker(y, x, normal)
+        return getattr(getattr(self, FACES[normal]["method"])()[y][x], normal)
+
+    def _face(self, normal: str, offset: int = 0) -> list:
+        return getattr(self, FACES[normal]["method"])(offset)
+
+    def _front(self, offset: int = 0) -> list:
+        return self._xz_plane(self.n - 1 - offset)[::-1]
+
+    def _right(self, offset: int = 0) -> list:
+        return [row[::-1] for row in self._yz_plane(self.n - 1 - offset)[::-1]]
+
+    def _back(self, offset: int = 0) -> list:
+        return [row[::-1] for row in self._xz_plane(0 + offset)[::-1]]
+
+    def _left(self, offset: int = 0) -> list:
+        return self._yz_plane(0 + offset)[::-1]
+
+    def _up(self, offset: int = 0) -> list:
+        return self._xy_plane(self.n - 1 - offset)
+
+    def _down(self, offset: int = 0) -> list:
+        return self._xy_plane(0 + offset)[::-1]
+
+    def _xy_plane(self, z: int) -> list:
+        return self._cube[z]
+
+    def _yz_plane(self, x: int) -> list:
+        return [[row[x] for row in plane] for plane in self._cube]
+
+    def _xz_plane(self, y: int) -> list:
+        return [plane[y] for plane in self._cube]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cubes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=5700)
+    parser.add_argument("--top", type=int, default=8, help="the number of functions listed by their own time")
+    parser.add_argument("--baseline", action="store_true", help="slice the views out of planes, as before")
+    args = parser.parse_args()
+    cls = PlaneCube if args.baseline else Cube
+
+    random.seed(args.seed)
+    scrambles = []
+    for _ in range(args.cubes):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble()
+        scrambles.append(str(cube))
+
+    for use_cubelets in (False, True):
+        cubes = [cls(cube_str, use_cubelets=use_cubelets) for cube_str in scrambles]
+        start = time.perf_counter()
+        for cube in [cls(cube_str, use_cubelets=use_cubelets) for cube_str in scrambles]:
+            cube.solve()
+        elapsed = time.perf_counter() - start
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for cube in cubes:
+            cube.solve()
+        profiler.disable()
+
+        stats = pstats.Stats(profiler)
+        total = sum(tottime for _, _, tottime, _, _ in stats.stats.values())
+        views = {}
+        for (filename, _, name), (_, calls, tottime, _, _) in stats.stats.items():
+            if (
+                filename.endswith((os.path.join("rubik", "cube.py"), os.path.join("benchmarks", "views.py")))
+                and name in VIEW_FUNCTIONS
+            ):
+                views[name] = (views.get(name, (0, 0))[0] + calls, views.get(name, (0, 0))[1] + tottime)
+        view_time = sum(tottime for _, tottime in views.values())
+
+        print(f"{'cubelets' if use_cubelets else 'permutations'}: {args.cubes / elapsed:,.1f} solves/s unprofiled")
+        print(f"  face views: {view_time / total:.1%} of the profiled time")
+        for name, (calls, tottime) in sorted(views.items(), key=lambda item: -item[1][1])[: args.top]:
+            print(f"    {name:>16}: {calls:>10,} calls {tottime / total:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+The production configuration of the microservice, loaded by gunicorn microservice:app.
+
+The app and every solver table are loaded in the master process before the workers are forked, so the workers share
+them copy-on-write (the two-phase tables are also mmapped, so they're shared between separate masters too). The
+number of workers follows the CPUs and memory the process is limited to, and can be overridden with WEB_CONCURRENCY
+and GUNICORN_THREADS.
+"""
+import os
+
+from rubik.log import JsonFormatter
+from rubik.pool import cpu_limit, memory_limit, preload
+
+
+"""
+The memory a worker is budgeted beyond what it shares with the master, set by RUBIK_WORKER_MEMORY_MB.
+"""
+WORKER_MEMORY = int(os.getenv("RUBIK_WORKER_MEMORY_MB", "48")) * 2**20
+
+
+def _workers() -> int:
+    """One worker per CPU, as solves are CPU bound, unless there isn't the memory for them."""
+    workers = cpu_limit()
+    limit = memory_limit()
+    if limit is not None:
+        workers = min(workers, limit // WORKER_MEMORY)
+    return max(1, workers)
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+preload_app = True
+workers = int(os.getenv("WEB_CONCURRENCY", str(_workers())))
+# a second thread per worker keeps check and info requests answered while a worker is busy solving
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+worker_class = "gthread"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+keepalive = 5
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = None
+logconfig_dict = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"json": {"()": JsonFormatter}},
+    "handlers": {"console": {"class": "logging.StreamHandler", "formatter": "json", "stream": "ext://sys.stdout"}},
+    "loggers": {
+        "gunicorn.error": {"level": "INFO", "handlers": ["console"], "propagate": False},
+    },
+}
+
+
+def on_starting(server):
+    """Build the permutation, solver and symmetry tables before any worker is forked."""
+    preload()
+    server.log.info("preloaded solver tables")
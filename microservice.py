@@ -1,20 +1,94 @@
-from flask import Flask, request
+from flask import Flask, Response, request, stream_with_context
 import os
+import threading
+from typing import Optional
 
-from rubik.dispatch import dispatch
+from rubik.cache import CACHE, RESPONSE_CACHE
+from rubik.dispatch import dispatch, dispatch_batch, parse_batch
+from rubik.log import configure
+from rubik.pool import SolverPool
+from rubik.response import dumps, dumps_lines, JSON, JSONL, render, render_cached, render_result
+from rubik.solve import solve_many
+from rubik.stream import dispatch_stream, parse_lines
 
 
 app = Flask(__name__)
+LOGGER = configure()
+
+"""
+Batches are solved across a pool of worker processes when RUBIK_WORKERS is greater than 1.
+"""
+WORKERS = int(os.getenv("RUBIK_WORKERS", "1"))
+_POOL: Optional[SolverPool] = None
+_POOL_PID: Optional[int] = None
+_POOL_LOCK = threading.Lock()
+
+
+def pool() -> Optional[SolverPool]:
+    """Obtain this process's SolverPool, or None if batches are solved in process.
+
+    The pool is created on first use rather than at import, as gunicorn imports the app in its master before forking
+    the workers, and a pool's call and result queues must not be shared between workers.
+    """
+    global _POOL, _POOL_PID
+    if WORKERS <= 1:
+        return None
+    with _POOL_LOCK:
+        if _POOL_PID != os.getpid():
+            _POOL, _POOL_PID = SolverPool(WORKERS), os.getpid()
+        return _POOL
+
+
+def _response(status: int, headers: dict, body: bytes) -> Response:
+    return Response(body, status, headers)
+
+
+def _error(e: Exception) -> Response:
+    return Response(dumps({"status": f"error: {e}"}), mimetype=JSON)
 
 
 @app.route("/rubik")
 def server():
     try:
-        result = dispatch({param: str(request.args.get(param, "")) for param in request.args})
-        print(f"Response --> {result}")
-        return str(result)
+        params = {param: str(request.args.get(param, "")) for param in request.args}
+        cached = render_cached(params, request.headers, RESPONSE_CACHE)
+        if cached is not None:
+            LOGGER.info("response", extra={"op": params.get("op"), "status": "cached"})
+            return _response(*cached)
+        result = dispatch(params)
+        LOGGER.info("response", extra={"op": params.get("op"), "status": result.get("status")})
+        return _response(*render_result(params, result, request.headers, RESPONSE_CACHE))
     except Exception as e:
-        return str(e)
+        LOGGER.exception("request failed")
+        return _error(e)
+
+
+@app.route("/rubik/batch", methods=["POST"])
+def batch_server():
+    try:
+        items, jsonl = parse_batch(request.get_data(as_text=True))
+        solver_pool = pool()
+        results = dispatch_batch(items, solver_pool.solve_many if solver_pool else solve_many)
+        LOGGER.info("batch response", extra={"items": len(results)})
+        body = dumps_lines(results) if jsonl else dumps(results)
+        return _response(*render(body, JSONL if jsonl else JSON, request.headers))
+    except Exception as e:
+        LOGGER.exception("request failed")
+        return _error(e)
+
+
+@app.route("/rubik/stream", methods=["POST"])
+def stream_server():
+    def results():
+        for result in dispatch_stream(parse_lines(request.stream)):
+            yield dumps(result) + b"\n"
+
+    return Response(stream_with_context(results()), mimetype=JSONL)
+
+
+@app.route("/rubik/cache")
+def cache_server():
+    return Response(dumps({**CACHE.stats(), "responses": RESPONSE_CACHE.stats()}), mimetype=JSON)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+import sys
+
+from rubik.cli import main
+
+
+sys.exit(main())
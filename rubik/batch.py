@@ -0,0 +1,115 @@
+"""
+A batch engine holding many 3x3 cubes in one NumPy array, so a move is applied to every cube with a single fancy index.
+
+NumPy is an optional dependency (pip install rubik[batch]), the rest of the package never imports this module.
+"""
+from typing import Iterable, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from rubik.cube import FACES, normalize, ROTATIONS, permutations
+
+
+"""
+The face index opposite each face index, e.g. the back (2) opposite the front (0).
+"""
+OPPOSITES = [list(FACES.keys()).index(normal[:2] + ("neg" if normal.endswith("pos") else "pos")) for normal in FACES]
+
+"""
+Every rotation char in the order of the rows of the move table, which is followed by one row for no move.
+"""
+MOVES = "".join(ROTATIONS.keys()) + "".join(ROTATIONS.keys()).upper()
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The batch engine requires numpy, install it with pip install rubik[batch]")
+
+
+class CubeBatch:
+    """A class representing N 3x3 cubes as an (N, 54) uint8 array.
+
+    Each sticker is stored as the index of the face whose center has its color on that cube, normalized by the same
+    normalize() as Cube.state, and the colors of each cube are kept aside so the cubes convert back to the strings they
+    came from.
+
+    Attributes:
+        stickers (numpy.ndarray): The (N, 54) uint8 array of face indices.
+        palettes (numpy.ndarray): The (N, 6) uint32 array of the color code point of each face index per cube.
+
+    Args:
+        cube_strs: The one-line string representations of the cubes, as given by Cube.__str__.
+    """
+
+    def __init__(self, cube_strs: Iterable[str]):
+        _require_numpy()
+        cube_strs = list(cube_strs)
+        if any(len(cube_str) != 54 for cube_str in cube_strs):
+            raise ValueError("Every cube of a batch must be a 3x3 cube of 54 stickers")
+
+        normalized = [normalize(cube_str) for cube_str in cube_strs]
+        if any(len(palette) != len(FACES) for _, palette in normalized):
+            raise ValueError("The stickers of a cube must be the six distinct colors of its centers")
+        states = b"".join(state for state, _ in normalized)
+        palettes = [ord(color) for _, palette in normalized for color in palette]
+        self.stickers = np.frombuffer(states, dtype=np.uint8).reshape(len(cube_strs), 54).copy()
+        # code points rather than bytes, as any alphanumeric char (e.g. "é") is a color
+        self.palettes = np.array(palettes, dtype=np.uint32).reshape(len(cube_strs), 6)
+
+        tables = permutations(3)
+        self._moves = np.array([tables.moves[(rotation, 0)][1][0] for rotation in MOVES] + [list(range(54))])
+        self._pieces = np.array(
+            [(a, b) for stickers in tables.slot_stickers for a in stickers.values() for b in stickers.values() if a < b]
+        )
+        self._opposites = np.array(OPPOSITES, dtype=np.uint8)
+        self._rows = {face: row for row, face in enumerate(MOVES)}
+        self._rows[""] = len(MOVES)
+
+    def __len__(self) -> int:
+        return len(self.stickers)
+
+    def __iter__(self):
+        return iter(self.to_strings())
+
+    def to_strings(self) -> List[str]:
+        """Obtain the one-line string representation of every cube, the same as Cube.__str__."""
+        chars = np.take_along_axis(self.palettes, self.stickers.astype(np.intp), axis=1)
+        data = chars.astype("<u4").tobytes().decode("utf-32-le")
+        return [data[i : i + 54] for i in range(0, len(data), 54)]
+
+    def rotate(self, face: str):
+        """Rotate the given face of every cube."""
+        if not face or face not in self._rows:
+            raise ValueError("The face specified for rotation is not present in " + str(list(ROTATIONS.keys())))
+        self.stickers = self.stickers[:, self._moves[self._rows[face]]]
+
+    def rotate_each(self, faces: Sequence[str]):
+        """Rotate a face of each cube, faces[i] of the ith cube. An empty string leaves its cube as it is."""
+        if len(faces) != len(self.stickers):
+            raise ValueError("A face must be given for every cube of the batch")
+        rows = [self._rows.get(face) for face in faces]
+        if None in rows:
+            raise ValueError("The face specified for rotation is not present in " + str(list(ROTATIONS.keys())))
+        self.stickers = np.take_along_axis(self.stickers, self._moves[np.array(rows, dtype=np.intp)], axis=1)
+
+    def rotate_sequence(self, rotations: str):
+        """Rotate every cube by a string of rotation chars, composed into a single permutation first."""
+        if any(rotation not in MOVES for rotation in rotations):
+            raise ValueError("The face specified for rotation is not present in " + str(list(ROTATIONS.keys())))
+        perm = self._moves[len(MOVES)]
+        for rotation in rotations:
+            perm = perm[self._moves[self._rows[rotation]]]
+        self.stickers = self.stickers[:, perm]
+
+    def is_solved(self) -> "np.ndarray":
+        """Check which cubes are solved, as a boolean array."""
+        faces = self.stickers.reshape(len(self.stickers), 6, 9)
+        return (faces == faces[:, :, 4:5]).all(axis=(1, 2))
+
+    def is_adjacency_safe(self) -> "np.ndarray":
+        """Check which cubes have no cubelet with stickers of opposite faces, as a boolean array."""
+        a, b = self.stickers[:, self._pieces[:, 0]], self.stickers[:, self._pieces[:, 1]]
+        return ~(self._opposites[a] == b).any(axis=1)
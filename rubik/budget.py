@@ -0,0 +1,79 @@
+"""
+Cooperative work budgets for the solver.
+
+A Budget bounds the number of rotations and/or the wall time a solve may spend. The solver charges it as it works and
+it raises BudgetExceeded once either limit is passed, so a cube the solver can't finish never pins a worker.
+"""
+from contextlib import contextmanager
+import os
+import time
+from typing import Callable, Iterator, Optional
+
+
+"""
+The budget of every solve unless another is given, set by the RUBIK_MAX_ROTATIONS and RUBIK_TIMEOUT_MS environment
+variables (0 disables a limit). A beginner solve takes a few hundred rotations and a two-phase solve about a second.
+"""
+MAX_ROTATIONS = int(os.getenv("RUBIK_MAX_ROTATIONS", "5000"))
+TIMEOUT_MS = int(os.getenv("RUBIK_TIMEOUT_MS", "10000"))
+
+
+class BudgetExceeded(Exception):
+    """Raised when a solve spends more than its budget."""
+
+
+class Budget:
+    """A class representing the work a solve may still spend.
+
+    Args:
+        max_rotations: The maximum number of rotations, None for no limit.
+        timeout_ms: The maximum number of milliseconds from now, None for no limit.
+
+    Attributes:
+        rotations (int): The number of rotations charged so far.
+    """
+
+    def __init__(self, max_rotations: Optional[int] = None, timeout_ms: Optional[float] = None):
+        self.max_rotations = max_rotations
+        self.deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms is not None else None
+        self.rotations = 0
+
+    @classmethod
+    def default(cls, timeout_ms: Optional[float] = None) -> "Budget":
+        """Obtain the default budget, with its timeout lowered to timeout_ms if given."""
+        if TIMEOUT_MS and timeout_ms is not None:
+            timeout_ms = min(timeout_ms, TIMEOUT_MS)
+        elif timeout_ms is None:
+            timeout_ms = TIMEOUT_MS or None
+        return cls(MAX_ROTATIONS or None, timeout_ms)
+
+    def charge(self, rotations: int = 1):
+        """Charge rotations to the budget, raising BudgetExceeded if it's spent."""
+        self.rotations += rotations
+        if self.max_rotations is not None and self.rotations > self.max_rotations:
+            raise BudgetExceeded(f"The solve exceeded its budget of {self.max_rotations} rotations")
+        self.check()
+
+    def check(self):
+        """Raise BudgetExceeded if the deadline has passed."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded("The solve exceeded its deadline")
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Leave the time spent in the block out of the deadline, e.g. building tables that every later solve shares."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            if self.deadline is not None:
+                self.deadline += time.monotonic() - start
+
+    def charged(self, rotate: Callable[..., str]) -> Callable[..., str]:
+        """Wrap a cube's rotate so every call is charged to the budget."""
+
+        def wrapper(*args, **kwargs) -> str:
+            self.charge()
+            return rotate(*args, **kwargs)
+
+        return wrapper
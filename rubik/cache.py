@@ -0,0 +1,394 @@
+from collections import OrderedDict
+from functools import lru_cache
+import json
+from operator import itemgetter
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rubik.cube import FACES, normalize as cube_normalize, permutations, SOLVE_METHODS
+
+
+"""
+The digit of each color index of a normalized cube.
+"""
+DIGITS = bytes.maketrans(bytes(range(len(FACES))), "".join(str(i) for i in range(len(FACES))).encode())
+
+
+def normalize(cube_str: str) -> str:
+    """Relabel the colors of a 3x3 cube as the digit of its normalized color index (see Cube.state), i.e. the index of
+    the face whose center has that color, e.g. every sticker with the color of the front center becomes "0"."""
+    return cube_normalize(cube_str)[0].translate(DIGITS).decode("latin-1")
+
+
+class Symmetry:
+    """A class representing one of the 48 symmetries of a cube, i.e. a rotation of the whole cube, optionally mirrored.
+
+    Attributes:
+        stickers (tuple): The sticker permutation of the symmetry, the sticker at stickers[i] moves to i.
+        forward (dict): For each rotation char of the original cube, the equivalent rotation char in the symmetric cube.
+        backward (dict): The inverse of forward.
+    """
+
+    def __init__(self, stickers: Tuple[int, ...], forward: Dict[str, str]):
+        self.stickers = stickers
+        self.forward = forward
+        self.backward = {b: a for a, b in forward.items()}
+        self._getter = itemgetter(*stickers)
+
+    def apply(self, cube_str: str) -> str:
+        """Obtain the cube as seen through the symmetry."""
+        return "".join(self._getter(cube_str))
+
+
+def _symmetries() -> List[Symmetry]:
+    """Generate the 48 symmetries of a 3x3 cube from whole cube rotations about the x and z axes and a mirror."""
+    tables = permutations(3)
+    identity = tuple(range(54))
+
+    def compose(*perms: Tuple[int, ...]) -> Tuple[int, ...]:
+        result = identity
+        for perm in perms:
+            result = tuple(result[i] for i in perm)
+        return result
+
+    def whole(face: str) -> Tuple[int, ...]:
+        return compose(*(tables.moves[(face, offset)][1][0] for offset in range(3)))
+
+    index = {
+        (slot, normal): sticker
+        for slot, stickers in enumerate(tables.slot_stickers)
+        for normal, sticker in stickers.items()
+    }
+    mirror = [0] * 54
+    for (slot, normal), sticker in index.items():
+        z, y, x = slot // 9, slot // 3 % 3, slot % 3
+        mirrored = {"x_pos": "x_neg", "x_neg": "x_pos"}.get(normal, normal)
+        mirror[sticker] = index[((z * 3 + y) * 3 + 2 - x, mirrored)]
+    generators = [whole(FACES["x_pos"]["rotation"].upper()), whole(FACES["z_pos"]["rotation"].upper()), tuple(mirror)]
+
+    group, frontier = {identity}, [identity]
+    while frontier:
+        found = []
+        for perm in frontier:
+            for generator in generators:
+                moved = compose(perm, generator)
+                if moved not in group:
+                    group.add(moved)
+                    found.append(moved)
+        frontier = found
+
+    rotations = [face["rotation"] for face in FACES.values()]
+    rotations += [rotation.upper() for rotation in rotations]
+    moves = {rotation: tables.moves[(rotation, 0)][1][0] for rotation in rotations}
+    result = []
+    for perm in sorted(group):
+        # the rotation b of the symmetric cube that is equivalent to a of the original cube, i.e. perm * a = b * perm
+        forward = {
+            a: next(b for b in rotations if compose(moves[a], perm) == compose(perm, moves[b])) for a in rotations
+        }
+        result.append(Symmetry(perm, forward))
+    return result
+
+
+@lru_cache(maxsize=None)
+def symmetries() -> Tuple[Symmetry, ...]:
+    """Obtain the (lazily generated and cached) symmetries of a 3x3 cube. The first symmetry is the identity."""
+    return tuple(_symmetries())
+
+
+def canonical(cube_str: str, symmetry: bool = True) -> Tuple[str, Symmetry]:
+    """Obtain the canonical form of a 3x3 cube, i.e. the smallest normalized string of every symmetric cube.
+
+    Returns:
+        The canonical form and the symmetry which turns the cube into it.
+    """
+    if not symmetry:
+        return normalize(cube_str), symmetries()[0]
+    return min(((normalize(s.apply(cube_str)), s) for s in symmetries()), key=itemgetter(0))
+
+
+class SolutionCache:
+    """A bounded least recently used cache of cube solutions keyed on the canonical form of the cube.
+
+    Cubes which only differ by their color labels share an entry, as do (when symmetry is enabled) cubes which are
+    rotations or mirror images of one another. The solution of the canonical form is cached, and remapped to the
+    orientation of the cube asking.
+
+    Attributes:
+        maxsize (int): The maximum number of cached solutions. A maxsize of 0 disables the cache.
+        symmetry (bool): If the cube's 48 symmetries are reduced to one entry.
+        hits (int): The number of solutions served from the cache.
+        misses (int): The number of solutions that had to be computed.
+        evictions (int): The number of solutions evicted to stay within maxsize.
+    """
+
+    def __init__(self, maxsize: int = 1024, symmetry: bool = True):
+        if maxsize < 0:
+            raise ValueError("The maxsize of the cache must not be negative")
+
+        self.maxsize = maxsize
+        self.symmetry = symmetry
+        self.hits = self.misses = self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def solve(self, cube_str: str, method: str, solver: Callable[[str, str], str]) -> str:
+        """Obtain the solution of a 3x3 cube from the cache, or from solver(cube_str, method) if it isn't cached.
+
+        A miss solves the canonical form of the cube rather than the cube itself, so a cube's solution is the same
+        whichever of its symmetric cubes was cached first.
+        """
+        if not self.maxsize:
+            return solver(cube_str, method)
+
+        key, symmetry = canonical(cube_str, self.symmetry)
+        solution = self._get((key, method))
+        if solution is None:
+            solution = solver(key, method)
+            self._put((key, method), solution)
+        return "".join(symmetry.backward[rotation] for rotation in solution)
+
+    def stats(self) -> dict:
+        """Obtain the counters of the cache."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Remove every cached solution and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def _get(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            solution = self._entries.get(key)
+            if solution is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return solution
+
+    def _put(self, key: Tuple[str, str], solution: str):
+        with self._lock:
+            self._entries[key] = solution
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+"""
+The cache in front of solve(), sized by the RUBIK_CACHE_SIZE environment variable (0 disables it).
+"""
+CACHE = SolutionCache(int(os.getenv("RUBIK_CACHE_SIZE", "1024")))
+
+
+"""
+The params each op's result depends on, only the responses of these ops are cached.
+"""
+RESPONSE_KEYS = {"check": ("cube",), "info": (), "simplify": ("rotate",), "solve": ("cube", "rotate", "method")}
+
+"""
+Statuses that depend on more than the params of RESPONSE_KEYS, so responses with them aren't cached.
+"""
+UNCACHED_STATUSES = ("error: solve exceeded its work budget", "error: timeout_ms must be a positive integer")
+
+
+def cacheable(params: dict, result: dict) -> bool:
+    """If the result of dispatching params only depends on the params of its response_key()."""
+    return response_key(params) is not None and result.get("status") not in UNCACHED_STATUSES
+
+
+def response_key(params: dict) -> Optional[str]:
+    """Obtain the canonical key of a request's params, or None if its response can't be cached.
+
+    Params an op doesn't read are left out of the key and a solve's default method is filled in, so requests which
+    only differ by them share an entry.
+    """
+    if not isinstance(params, dict) or params.get("op") not in RESPONSE_KEYS or params.get("debug"):
+        return None
+    values = {name: params.get(name) for name in RESPONSE_KEYS[params["op"]]}
+    if params["op"] == "solve":
+        values["method"] = values["method"] or SOLVE_METHODS[0]
+    return json.dumps([params["op"], values], sort_keys=True)
+
+
+class ResponseCache:
+    """A cache of encoded response bodies keyed on response_key(), in front of dispatch.
+
+    Entries are kept in a bounded least recently used cache in memory, and optionally in a SQLite database which every
+    worker process on the host shares. An entry read from the database is copied into memory.
+
+    Attributes:
+        maxsize (int): The maximum number of entries in memory. A maxsize of 0 disables the cache.
+        ttl (float): The seconds an entry is served for.
+        path (str): The path of the SQLite database, or None if entries are only kept in memory.
+        disk_maxsize (int): The maximum number of entries in the database, the oldest are evicted first.
+        hits (int): The number of responses served from memory.
+        disk_hits (int): The number of responses served from the database.
+        misses (int): The number of responses that had to be computed.
+    """
+
+    # the database is trimmed to disk_maxsize once every TRIM_INTERVAL puts, as counting its entries isn't free
+    TRIM_INTERVAL = 64
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600,
+        path: Optional[str] = None,
+        disk_maxsize: int = 100000,
+        clock: Callable[[], float] = time.time,
+    ):
+        if maxsize < 0 or disk_maxsize < 0:
+            raise ValueError("The maxsize of the cache must not be negative")
+        if ttl <= 0:
+            raise ValueError("The ttl of the cache must be positive")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.disk_maxsize = disk_maxsize
+        self.hits = self.disk_hits = self.misses = 0
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._puts = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Optional[str]) -> Optional[Tuple[bytes, str]]:
+        """Obtain a cached body.
+
+        Returns:
+            The body and where it was found, "memory" or "disk", or None if it isn't cached.
+        """
+        if key is None or not self.maxsize:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0], "memory"
+            if entry is not None:
+                del self._entries[key]
+
+            entry = self._disk_get(key, now)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+            return entry[0], "disk"
+
+    def put(self, key: Optional[str], body: bytes):
+        """Cache a body for ttl seconds."""
+        if key is None or not self.maxsize:
+            return
+        entry = (body, self._clock() + self.ttl)
+        with self._lock:
+            self._remember(key, entry)
+            self._disk_put(key, entry)
+
+    def stats(self) -> dict:
+        """Obtain the counters of the cache."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "disk": self.path is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        """Remove every cached body, including those in the database, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM responses")
+
+    def _remember(self, key: str, entry: Tuple[bytes, float]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Connect to the database, once per process as a connection mustn't be shared with a forked worker."""
+        if self.path is None:
+            return None
+        if self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=0.25, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, expires REAL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[bytes, float]]:
+        try:
+            db = self._connection()
+            if db is None:
+                return None
+            row = db.execute("SELECT body, expires FROM responses WHERE key = ? AND expires > ?", (key, now)).fetchone()
+        except sqlite3.Error:
+            # the database is a best effort, e.g. it may be locked by another worker for longer than the timeout
+            return None
+        return (bytes(row[0]), row[1]) if row is not None else None
+
+    def _disk_put(self, key: str, entry: Tuple[bytes, float]):
+        try:
+            db = self._connection()
+            if db is None:
+                return
+            db.execute("INSERT OR REPLACE INTO responses (key, body, expires) VALUES (?, ?, ?)", (key, *entry))
+            self._puts += 1
+            if self._puts % self.TRIM_INTERVAL == 0:
+                self._trim(db)
+        except sqlite3.Error:
+            pass
+
+    def _trim(self, db: sqlite3.Connection):
+        """Remove the expired entries, then the entries closest to expiring while there are more than disk_maxsize."""
+        db.execute("DELETE FROM responses WHERE expires <= ?", (self._clock(),))
+        (size,) = db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if size > self.disk_maxsize:
+            db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY expires, rowid LIMIT ?)",
+                (size - self.disk_maxsize,),
+            )
+
+
+"""
+The cache in front of dispatch for GET /rubik, sized by RUBIK_RESPONSE_CACHE_SIZE (0 disables it) with entries served
+for RUBIK_RESPONSE_CACHE_TTL seconds. Entries are shared between workers through a SQLite database at
+RUBIK_RESPONSE_CACHE_PATH, if it's set, holding at most RUBIK_RESPONSE_CACHE_DISK_SIZE entries.
+"""
+RESPONSE_CACHE = ResponseCache(
+    int(os.getenv("RUBIK_RESPONSE_CACHE_SIZE", "1024")),
+    float(os.getenv("RUBIK_RESPONSE_CACHE_TTL", "3600")),
+    os.getenv("RUBIK_RESPONSE_CACHE_PATH") or None,
+    int(os.getenv("RUBIK_RESPONSE_CACHE_DISK_SIZE", "100000")),
+)
@@ -1,6 +1,14 @@
 from collections import Counter
+from itertools import combinations
+from typing import Iterable, List
 
-from rubik.cube import Cube
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from rubik.cube import FACES, normalize
+from rubik.cubie import CORNER_FACELETS, CORNERS, EDGE_FACELETS, EDGES, FACE_NORMALS, parity
 
 ADJACENT_PIECES = [
     (0, 29, 42),
@@ -32,46 +40,163 @@ OPPOSITE_FACES = [
 ]
 
 
-def _2d_adjacency_check(cube: str) -> bool:
-    """Checks if the pieces on each cuboid have valid colors given the opposing faces of the cube.
+"""
+The pairs of stickers on the same piece, which must not be the colors of opposite faces.
+"""
+ADJACENT_PAIRS = [pair for piece in ADJACENT_PIECES for pair in combinations(piece, 2)]
+
+"""
+The statuses of a cube with valid stickers, in the order its pieces are checked.
+"""
+PIECE_STATUSES = (
+    "ok",
+    "error: cube adjacent pieces must be valid",
+    "error: cube must have each corner and edge piece exactly once",
+    "error: cube corners must not be twisted",
+    "error: cube edges must not be flipped",
+    "error: cube pieces must not be swapped",
+)
+
+
+def _opposites() -> List[int]:
+    """Obtain the normalized color (see Cube.state) opposite each normalized color, from OPPOSITE_FACES."""
+    result = [0] * len(FACES)
+    for a, b in OPPOSITE_FACES:
+        result[a // 9], result[b // 9] = b // 9, a // 9
+    return result
+
+
+def _piece_codes(names: Iterable[str], orientations: int) -> List[int]:
+    """Obtain the piece * orientations + orientation of each code of a piece's normalized stickers, or -1 if they
+    aren't a piece. The code of stickers (a, b, c) is a * 36 + b * 6 + c, and of (a, b) a * 6 + b."""
+    faces = {face: list(FACES.keys()).index(normal) for face, normal in FACE_NORMALS.items()}
+    result = [-1] * len(FACES) ** orientations
+    for piece, name in enumerate(names):
+        for orientation in range(orientations):
+            # the piece's stickers as to_cubie reads them in this orientation, e.g. a twisted corner's turned by one
+            if orientations == 3:
+                stickers = name[-orientation:] + name[:-orientation]
+            else:
+                stickers = name[::-1] if orientation else name
+            code = 0
+            for face in stickers:
+                code = code * len(FACES) + faces[face]
+            result[code] = piece * orientations + orientation
+    return result
+
+
+OPPOSITES = _opposites()
+CORNER_CODES, EDGE_CODES = _piece_codes(CORNERS, 3), _piece_codes(EDGES, 2)
+
+
+def _check_pieces(state: bytes) -> str:
+    """Checks if the pieces of a cube have valid colors and could be reached by rotating a solved cube.
 
     Args:
-        cube: A validated (but not necessarily solved) rubik's cube.
+        state: The normalized stickers (see Cube.state) of a cube whose stickers are valid.
 
     Returns:
-        If the cube passes the adjacent pieces check. True for pass, False otherwise.
+        The status of the cube, "ok" if it's solvable.
     """
-    invalid_colors = {}
-    for a, b in OPPOSITE_FACES:
-        invalid_colors[cube[a]] = cube[b]
-        invalid_colors[cube[b]] = cube[a]
-    for adjacent in ADJACENT_PIECES:
-        adjacent = tuple(cube[i] for i in adjacent)
-        for color in adjacent:
-            if invalid_colors[color] in adjacent:
-                return False
-    return True
+    if any(OPPOSITES[state[a]] == state[b] for a, b in ADJACENT_PAIRS):
+        return PIECE_STATUSES[1]
+    corners = [CORNER_CODES[(state[a] * 6 + state[b]) * 6 + state[c]] for a, b, c in CORNER_FACELETS]
+    edges = [EDGE_CODES[state[a] * 6 + state[b]] for a, b in EDGE_FACELETS]
+    cp, ep = [corner // 3 for corner in corners], [edge // 2 for edge in edges]
+    if -1 in corners or -1 in edges or len(set(cp)) != 8 or len(set(ep)) != 12:
+        result = PIECE_STATUSES[2]
+    elif sum(corner % 3 for corner in corners) % 3:
+        result = PIECE_STATUSES[3]
+    elif sum(edge % 2 for edge in edges) % 2:
+        result = PIECE_STATUSES[4]
+    elif parity(cp) != parity(ep):
+        result = PIECE_STATUSES[5]
+    else:
+        result = PIECE_STATUSES[0]
+    return result
 
 
-def check(params: dict) -> dict:
-    result = {}
-    encoded_cube = params.get("cube")
+def _check_pieces_many(states: List[bytes]) -> List[str]:
+    """Checks the pieces of many cubes, as _check_pieces does, but all at once as arrays when numpy is installed."""
+    if np is None:
+        return [_check_pieces(state) for state in states]
+
+    stickers = np.frombuffer(b"".join(states), dtype=np.uint8).reshape(len(states), 54).astype(np.intp)
+    pairs, corner_facelets, edge_facelets = np.array(ADJACENT_PAIRS), np.array(CORNER_FACELETS), np.array(EDGE_FACELETS)
+    adjacent = (np.array(OPPOSITES)[stickers[:, pairs[:, 0]]] == stickers[:, pairs[:, 1]]).any(axis=1)
+
+    codes = (stickers[:, corner_facelets[:, 0]] * 6 + stickers[:, corner_facelets[:, 1]]) * 6
+    corners = np.array(CORNER_CODES)[codes + stickers[:, corner_facelets[:, 2]]]
+    edges = np.array(EDGE_CODES)[stickers[:, edge_facelets[:, 0]] * 6 + stickers[:, edge_facelets[:, 1]]]
+    cp, ep = corners // 3, edges // 2
+    pieces = (
+        (corners >= 0).all(axis=1)
+        & (edges >= 0).all(axis=1)
+        & (np.sort(cp, axis=1) == np.arange(8)).all(axis=1)
+        & (np.sort(ep, axis=1) == np.arange(12)).all(axis=1)
+    )
+    twisted = (corners % 3).sum(axis=1) % 3 != 0
+    flipped = (edges % 2).sum(axis=1) % 2 != 0
+    corner_pairs, edge_pairs = np.triu_indices(8, 1), np.triu_indices(12, 1)
+    swapped = (cp[:, corner_pairs[0]] > cp[:, corner_pairs[1]]).sum(axis=1) % 2 != (
+        ep[:, edge_pairs[0]] > ep[:, edge_pairs[1]]
+    ).sum(axis=1) % 2
+
+    # the first check each cube fails, in the order of PIECE_STATUSES
+    failed = np.select([adjacent, ~pieces, twisted, flipped, swapped], [1, 2, 3, 4, 5], 0)
+    return [PIECE_STATUSES[i] for i in failed]
+
+
+def _check_stickers(encoded_cube: object) -> str:
+    """Checks if an encoded cube has the stickers of a 3x3 cube, before its pieces are looked at.
+
+    Returns:
+        The status of the cube, "ok" if its stickers are valid.
+    """
     if encoded_cube is None:
-        result["status"] = "error: cube must be present"
+        result = "error: cube must be present"
     elif not isinstance(encoded_cube, str):
-        result["status"] = "error: cube must be given as a string"
+        result = "error: cube must be given as a string"
     elif not encoded_cube.isalnum():
-        result["status"] = "error: cube must be given as a solely alphanumeric string"
+        result = "error: cube must be given as a solely alphanumeric string"
     elif len(encoded_cube) != 54:
-        result["status"] = "error: cube must have exactly 54 pieces"
+        result = "error: cube must have exactly 54 pieces"
     elif len((piece_counter := Counter(encoded_cube))) != 6:
-        result["status"] = "error: cube must have exactly 6 different colors"
+        result = "error: cube must have exactly 6 different colors"
     elif any(count != 9 for count in piece_counter.values()):
-        result["status"] = "error: cube must have exactly 9 pieces to each color"
+        result = "error: cube must have exactly 9 pieces to each color"
     elif len(set(encoded_cube[i] for i in range(4, 54, 9))) != 6:
-        result["status"] = "error: cube must have uniquely colored pieces at the center of each face"
-    elif not Cube(encoded_cube).is_adjacency_safe():
-        result["status"] = "error: cube adjacent pieces must be valid"
+        result = "error: cube must have uniquely colored pieces at the center of each face"
     else:
-        result["status"] = "ok"
+        result = "ok"
     return result
+
+
+def check(params: dict) -> dict:
+    encoded_cube = params.get("cube")
+    status = _check_stickers(encoded_cube)
+    if status == "ok":
+        status = _check_pieces(normalize(encoded_cube)[0])
+    return {"status": status}
+
+
+def check_many(items: Iterable[dict]) -> List[dict]:
+    """Check a batch of cubes, returning each item's result in the order the items were given.
+
+    The stickers of each cube are checked in turn, then the pieces of every cube with valid stickers at once. Cubes with
+    the same normalized stickers (see Cube.state), i.e. which only differ by their color labels, are only checked once.
+    """
+    results, states = [], {}
+    for params in items:
+        if not isinstance(params, dict):
+            results.append({"status": "error: parameter is not a dictionary"})
+            continue
+        encoded_cube = params.get("cube")
+        status = _check_stickers(encoded_cube)
+        if status == "ok":
+            states.setdefault(normalize(encoded_cube)[0], []).append(len(results))
+        results.append({"status": status})
+    for state, status in zip(states, _check_pieces_many(list(states))):
+        for i in states[state]:
+            results[i]["status"] = status
+    return results
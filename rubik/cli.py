@@ -0,0 +1,149 @@
+"""
+The command line interface, run as python -m rubik.
+
+Cubes are read one per line from the files given (or stdin) and dispatched the same way as the microservice's
+requests, so bulk jobs can run without a server. The exit status is 1 if any cube's status wasn't ok.
+
+Usage:
+    python -m rubik check [FILE ...]
+    python -m rubik solve [--method M] [FILE ...]
+    python -m rubik rotate ROTATIONS [FILE ...]
+    python -m rubik scramble [--count N] [--rotations N] [--seed N]
+    python -m rubik bench [--count N] [--seed N] [--method M]
+"""
+import argparse
+from collections import deque
+import csv
+import fileinput
+import json
+import random
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from rubik.cube import Cube, SOLVE_METHODS
+from rubik.dispatch import dispatch
+from rubik.stream import dispatch_stream
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+"""
+The key of the result each command writes in the text format, the status is written instead if it isn't ok.
+"""
+OUTPUTS = {"check": "status", "solve": "solution", "rotate": "cube", "scramble": "cube"}
+
+
+def read_cubes(files: List[str]) -> Iterator[str]:
+    """Read the cube strings, one per non-blank line, of files (or stdin if there are none)."""
+    with fileinput.input(files or ("-",)) as lines:
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+
+
+def scrambles(count: int, rotations: int = 20, seed: Optional[int] = None) -> Iterator[str]:
+    """Generate count scrambled cube strings with Cube.scramble, the same cubes for the same seed."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        cube = Cube(SOLVED_CUBE)
+        cube.scramble(rotations, rng)
+        yield str(cube)
+
+
+def write(records: Iterable[dict], command: str, output_format: str, output: TextIO) -> bool:
+    """Write a record per cube in the given format. Returns if every record's status was ok."""
+    ok, writer = True, None
+    for record in records:
+        ok = ok and record.get("status", "ok") == "ok"
+        if output_format == "jsonl":
+            output.write(json.dumps(record) + "\n")
+        elif output_format == "csv":
+            if writer is None:
+                fieldnames = ["input", "status", OUTPUTS[command]] if command != "scramble" else ["cube"]
+                writer = csv.DictWriter(output, list(dict.fromkeys(fieldnames)), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(record)
+        else:
+            status = record.get("status", "ok")
+            output.write((record.get(OUTPUTS[command], "") if status == "ok" else status) + "\n")
+    return ok
+
+
+def bench(count: int, seed: int, method: str, output: TextIO):
+    """Solve count scrambles through dispatch, reporting the throughput and latency."""
+    latencies, lengths = [], []
+    for cube in scrambles(count, seed=seed):
+        start = time.perf_counter()
+        result = dispatch({"op": "solve", "cube": cube, "method": method})
+        latencies.append(time.perf_counter() - start)
+        lengths.append(len(result.get("solution", "")))
+    latencies.sort()
+    output.write(
+        f"{count / sum(latencies):,.1f} solves/s  p50 {latencies[len(latencies) // 2] * 1000:.2f} ms"
+        f"  p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.2f} ms"
+        f"  mean length {sum(lengths) / len(lengths):.1f}\n"
+    )
+
+
+def parser() -> argparse.ArgumentParser:
+    result = argparse.ArgumentParser(prog="python -m rubik", description=__doc__.strip().splitlines()[0])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=("text", "jsonl", "csv"), default="text", dest="output_format")
+    # only the commands reading cubes dispatch them through worker processes
+    streamed = argparse.ArgumentParser(add_help=False, parents=[common])
+    streamed.add_argument("--workers", type=int, default=1, help="the number of worker processes")
+    commands = result.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check", parents=[streamed], help="check cubes are valid")
+    check.add_argument("files", nargs="*")
+
+    solve = commands.add_parser("solve", parents=[streamed], help="solve cubes")
+    solve.add_argument("--method", choices=SOLVE_METHODS, default=SOLVE_METHODS[0])
+    solve.add_argument("files", nargs="*")
+
+    rotate = commands.add_parser("rotate", parents=[streamed], help="rotate cubes")
+    rotate.add_argument("rotations")
+    rotate.add_argument("files", nargs="*")
+
+    scramble = commands.add_parser("scramble", parents=[common], help="generate scrambled cubes")
+    scramble.add_argument("--count", type=int, default=1)
+    scramble.add_argument("--rotations", type=int, default=20)
+    scramble.add_argument("--seed", type=int)
+
+    bench_ = commands.add_parser("bench", help="time solving scrambled cubes")
+    bench_.add_argument("--count", type=int, default=200)
+    bench_.add_argument("--seed", type=int, default=5700)
+    bench_.add_argument("--method", choices=SOLVE_METHODS, default=SOLVE_METHODS[0])
+    return result
+
+
+def main(argv: Optional[List[str]] = None, output: Optional[TextIO] = None) -> int:
+    args = parser().parse_args(argv)
+    output = output or sys.stdout
+
+    if args.command == "bench":
+        bench(args.count, args.seed, args.method, output)
+        return 0
+    if args.command == "scramble":
+        records = ({"cube": cube} for cube in scrambles(args.count, args.rotations, args.seed))
+        return 0 if write(records, args.command, args.output_format, output) else 1
+
+    cubes = read_cubes(args.files)
+    if args.command == "check":
+        params = ({"op": "check", "cube": cube} for cube in cubes)
+    elif args.command == "solve":
+        params = ({"op": "solve", "cube": cube, "method": args.method} for cube in cubes)
+    else:
+        params = ({"op": "solve", "cube": cube, "rotate": args.rotations} for cube in cubes)
+
+    inputs = deque()
+
+    def remember(items: Iterable[dict]) -> Iterator[dict]:
+        for item in items:
+            inputs.append(item["cube"])
+            yield item
+
+    results = dispatch_stream(remember(params), args.workers)
+    records = ({"input": inputs.popleft(), **result} for result in results)
+    return 0 if write(records, args.command, args.output_format, output) else 1
@@ -1,7 +1,12 @@
-from collections import Counter, OrderedDict
+from collections import OrderedDict
+from functools import cached_property, lru_cache
 from math import sqrt
+from operator import itemgetter
 import random
-from typing import Any, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from rubik.budget import Budget
+from rubik.profiling import stage
 
 
 """
@@ -29,6 +34,54 @@ The side faces of the cube
 """
 SIDES = list(FACES.keys())[:4]
 
+"""
+The position of each face within the one-line string representation of the cube
+"""
+FACE_OFFSETS = {normal: i for i, normal in enumerate(FACES.keys())}
+
+"""
+The methods Cube.solve() is able to solve with. The beginner method solves layer by layer, the twophase method uses
+Kociemba's two-phase algorithm to find much shorter solutions. The cfop method solves the first two layers the same as
+the beginner method, then the last layer with a single OLL and a single PLL algorithm, see rubik.lastlayer.
+"""
+SOLVE_METHODS = ("beginner", "twophase", "cfop")
+
+"""
+The degrees of cube that are backed by precomputed sticker permutations rather than the cubelet object model. Big cubes
+that only need to be rotated are far faster with rubik.nxn.NxNCube.
+"""
+PERMUTATION_DEGREES = (3,)
+
+
+def _sticker_mask(stickers: List[Tuple[str, int, int]], n: int = 3) -> int:
+    """Obtain the mask of the given (normal, row, column) stickers' bytes within a cube's state read as a little endian
+    integer, see Cube._mismatched."""
+    return sum(0xFF << 8 * (FACE_OFFSETS[normal] * n**2 + y * n + x) for normal, y, x in set(stickers))
+
+
+def _progress_masks() -> Dict[str, int]:
+    face = [(y, x) for y in range(3) for x in range(3)]
+    cross = [(0, 1), (1, 0), (1, 2), (2, 1)]
+    bottom_crossed = [("z_neg", y, x) for y, x in cross] + [(normal, 2, 1) for normal in SIDES]
+    bottom_layered = [("z_neg", y, x) for y, x in face] + [(normal, 2, x) for normal in SIDES for x in range(3)]
+    middle_layered = bottom_layered + [(normal, 1, x) for normal in SIDES for x in range(3)]
+    top_surfaced = middle_layered + [("z_pos", y, x) for y, x in face]
+    return {
+        "bottom_crossed": _sticker_mask(bottom_crossed),
+        "bottom_layered": _sticker_mask(bottom_layered),
+        "middle_layered": _sticker_mask(middle_layered),
+        "top_crossed": _sticker_mask(middle_layered + [("z_pos", y, x) for y, x in cross]),
+        "top_surfaced": _sticker_mask(top_surfaced),
+        "top_cornered": _sticker_mask(top_surfaced + [(normal, y, 0) for normal in SIDES for y in (0, 2)]),
+    }
+
+
+"""
+The stickers of a 3rd degree cube each solve stage predicate (e.g. is_middle_layered) requires to match their face's
+center, including those of the stages it builds on, as a mask of a permutation backed cube's mismatched stickers.
+"""
+PROGRESS_MASKS = _progress_masks()
+
 
 class Cubelet:
     """A class representing the cubelets that compose a rubik's cube."""
@@ -44,6 +97,12 @@ class Cubelet:
         """Obtain a sticker of the cubelet given a normal vector."""
         return getattr(self, normal)
 
+    def copy(self) -> "Cubelet":
+        """Obtain a copy of the cubelet's stickers."""
+        cubelet = Cubelet.__new__(Cubelet)
+        cubelet.__dict__.update(self.__dict__)
+        return cubelet
+
     def rotate(self, normal: str, clockwise: bool) -> "Cubelet":
         """Rotate the stickers of the cubelet given a normal vector and whether the rotation is clockwise."""
         clockwise = clockwise if (normal.split("_")[1] == "pos") ^ (normal.split("_")[0] == "z") else not clockwise
@@ -78,6 +137,234 @@ class CubeletWrapper:
         return repr(self.cubelet)
 
 
+class PermutationWrapper:
+    """A class that mimics a CubeletWrapper for a fixed position of a permutation backed cube."""
+
+    def __init__(self, cube: "Cube", slot: int):
+        self.__dict__["_cube"] = cube
+        self.__dict__["_slot"] = slot
+
+    def __getattr__(self, item: str):
+        """Obtain the sticker facing a normal vector as if it were a property of a cubelet."""
+        if item not in FACES:
+            raise AttributeError(item)
+        return self.sticker(item)
+
+    def __repr__(self) -> str:
+        """A print out of the wrapped position for debugging purposes."""
+        return f"({', '.join(f'{key}: [{self.sticker(key)}]' for key in FACES.keys())})"
+
+    @property
+    def cubelet(self) -> "PermutationCubelet":
+        """Obtain the cubelet currently occupying this position."""
+        return PermutationCubelet(self._cube, self._cube._slots[self._slot])
+
+    def sticker(self, normal: str) -> Union[int, str]:
+        """Obtain a sticker of the position given a normal vector, as its normalized color index (see Cube.state)."""
+        index = self._cube._permutations.slot_stickers[self._slot].get(normal)
+        return "" if index is None else self._cube._stickers[index]
+
+
+class PermutationCubelet:
+    """A class that mimics a Cubelet of a permutation backed cube. It follows a cubelet as it moves around the cube."""
+
+    def __init__(self, cube: "Cube", cubelet: int):
+        self._cube = cube
+        self._cubelet = cubelet
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, PermutationCubelet) and self._cubelet == other._cubelet and self._cube is other._cube
+
+    def __hash__(self) -> int:
+        return hash(self._cubelet)
+
+    def __repr__(self) -> str:
+        """A print out of the cubelet for debugging purposes."""
+        return f"({', '.join(f'{key}: [{self.sticker(key)}]' for key in FACES.keys())})"
+
+    def sticker(self, normal: str) -> Union[int, str]:
+        """Obtain a sticker of the cubelet given a normal vector, as its normalized color index (see Cube.state)."""
+        index = self._cube._permutations.slot_stickers[self._cube._slots.index(self._cubelet)].get(normal)
+        return "" if index is None else self._cube._stickers[index]
+
+
+class Permutations:
+    """A class holding the precomputed permutations for every layer rotation of an nth degree cube.
+
+    The permutations are derived once from the cubelet object model, so both representations always agree.
+
+    Attributes:
+        n (int): The degree of cube the permutations apply to.
+        slot_stickers (list): For each cubelet position, a mapping of normal vector to the index of its sticker.
+        moves (dict): For each (rotation char, offset), the (stickers, slots) permutations of 0 to 3 rotations.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        labels = list(range(6 * n**2))
+        reference = Cube(labels, use_cubelets=True)
+        positions = [wrapper for plane in reference._cube for row in plane for wrapper in row]
+        self.slot_stickers = [
+            {normal: wrapper.sticker(normal) for normal in FACES.keys() if wrapper.sticker(normal) != ""}
+            for wrapper in positions
+        ]
+
+        self.moves: Dict[Tuple[str, int], List[Tuple[Tuple[int, ...], Tuple[int, ...]]]] = {}
+        for face in list(ROTATIONS.keys()) + [rotation.upper() for rotation in ROTATIONS.keys()]:
+            for offset in range(n):
+                cube = Cube(labels, use_cubelets=True)
+                origins = {id(wrapper.cubelet): slot for slot, wrapper in enumerate(self._positions(cube))}
+                cube.rotate(face, offset)
+                stickers = tuple(
+                    getattr(wrapper, normal)
+                    for normal in FACES.keys()
+                    for wrapper in (wrapper for row in cube._face(normal) for wrapper in row)
+                )
+                slots = tuple(origins[id(wrapper.cubelet)] for wrapper in self._positions(cube))
+                powers = [(tuple(range(len(stickers))), tuple(range(len(slots))))]
+                for _ in range(3):
+                    powers.append(
+                        (
+                            tuple(powers[-1][0][i] for i in stickers),
+                            tuple(powers[-1][1][i] for i in slots),
+                        )
+                    )
+                self.moves[(face, offset)] = powers
+
+        self.getters = {
+            move: [(itemgetter(*stickers), itemgetter(*slots)) for stickers, slots in powers]
+            for move, powers in self.moves.items()
+        }
+
+    @staticmethod
+    def _positions(cube: "Cube") -> List["CubeletWrapper"]:
+        """Obtain every cubelet position of a cube in slot order."""
+        return [wrapper for plane in cube._cube for row in plane for wrapper in row]
+
+
+_PERMUTATIONS: Dict[int, Permutations] = {}
+
+
+def permutations(n: int) -> Permutations:
+    """Obtain the (lazily computed and cached) permutations for an nth degree cube."""
+    if n not in _PERMUTATIONS:
+        _PERMUTATIONS[n] = Permutations(n)
+    return _PERMUTATIONS[n]
+
+
+@lru_cache(maxsize=None)
+def face_slots(n: int, normal: str, offset: int = 0) -> Tuple[Tuple[int, ...], ...]:
+    """Obtain the slot, (z * n + y) * n + x, of each cubelet position of a layer of an nth degree cube, computed once
+    per (n, normal, offset). The rows and columns are as the face is seen from outside the cube, the layout of the
+    one-line string representation."""
+    last = n - 1
+    depth = last - offset
+    # the (z, y, x) of the position at each row and column of the layer
+    position = {
+        "y_pos": lambda row, column: (last - row, depth, column),
+        "x_pos": lambda row, column: (last - row, last - column, depth),
+        "y_neg": lambda row, column: (last - row, offset, last - column),
+        "x_neg": lambda row, column: (last - row, column, offset),
+        "z_pos": lambda row, column: (depth, row, column),
+        "z_neg": lambda row, column: (offset, last - row, column),
+    }[normal]
+    slots = []
+    for row in range(n):
+        slots.append(tuple((z * n + y) * n + x for z, y, x in (position(row, column) for column in range(n))))
+    return tuple(slots)
+
+
+"""
+The char standing in for each color index while a cube is normalized, see normalize().
+"""
+_INDEX_CHARS = "".join(map(chr, range(256)))
+
+
+def normalize(cube_str: str) -> Tuple[bytes, List[str]]:
+    """Normalize the colors of the one-line string representation of a cube, as a permutation backed cube keeps them.
+
+    Returns:
+        The state, each sticker given as the index of its color, and the palette, the color of each index. The colors
+        of the face centers are indexed 0 to 5 in the order of FACES, any other colors after them. See Cube.state.
+    """
+    size = len(cube_str) // 6
+    centers = cube_str[size // 2 :: size] if int(sqrt(size)) % 2 else ""
+    palette = list(dict.fromkeys(centers + cube_str))
+    if len(palette) > len(_INDEX_CHARS):
+        raise ValueError(f"A cube must have at most {len(_INDEX_CHARS)} colors")
+    return cube_str.translate(str.maketrans("".join(palette), _INDEX_CHARS[: len(palette)])).encode("latin-1"), palette
+
+
+def simplify_rotations(rotations: str) -> str:
+    """Simplify a string of rotation chars into the shortest equivalent string reachable by cancelling inverse turns,
+    merging turns of the same face, and reordering turns of opposite faces (which commute).
+
+    Turns are pushed on to a stack of groups, each holding the quarter turns per face of a single axis. Adjacent groups
+    never share an axis, so a single pass reaches the fixed point in linear time.
+    """
+    axes = {face["rotation"]: normal[0] for normal, face in FACES.items()}
+    order = {face["rotation"]: i for i, face in enumerate(FACES.values())}
+    groups: List[Tuple[str, Dict[str, int]]] = []
+    for rotation in rotations:
+        face = rotation.lower()
+        if face not in axes:
+            raise ValueError("The face specified for rotation is not present in " + str(list(ROTATIONS.keys())))
+        if not groups or groups[-1][0] != axes[face]:
+            groups.append((axes[face], {}))
+        turns = groups[-1][1]
+        turns[face] = (turns.get(face, 0) + (1 if rotation.isupper() else 3)) % 4
+        if not any(turns.values()):
+            groups.pop()
+
+    result = ""
+    for _, turns in groups:
+        for face in sorted(turns, key=order.get):
+            result += {0: "", 1: face.upper(), 2: face.upper() * 2, 3: face}[turns[face]]
+    return result
+
+
+"""
+The length of the blocks a rotation string is compiled in. Blocks are memoized, so substrings that recur at a block
+boundary (e.g. a scripted sequence that's repeated) are only ever composed once.
+"""
+COMPILE_BLOCK = 16
+
+
+def _compose(first: Tuple[int, ...], second: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Obtain the permutation of applying the first permutation, then the second."""
+    return tuple(map(first.__getitem__, second))
+
+
+@lru_cache(maxsize=4096)
+def _compile_block(n: int, rotations: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Compose a block of rotation chars into a single (stickers, slots) permutation."""
+    getters = permutations(n).getters
+    stickers, slots = tuple(range(6 * n**2)), tuple(range(n**3))
+    i = 0
+    while i < len(rotations):
+        j = i
+        while j < len(rotations) and rotations[j] == rotations[i]:
+            j += 1
+        rotated_stickers, rotated_slots = getters[(rotations[i], 0)][(j - i) % 4]
+        stickers, slots = rotated_stickers(stickers), rotated_slots(slots)
+        i = j
+    return stickers, slots
+
+
+def compile_rotations(n: int, rotations: str) -> Tuple[Callable, Callable]:
+    """Compose a string of rotation chars into a single permutation, so applying it costs the same as one rotation.
+    Only the blocks are memoized, as the strings themselves are the caller's and of any length.
+
+    Returns:
+        The (stickers, slots) getters of the composed permutation, the same as Permutations.getters.
+    """
+    stickers, slots = _compile_block(n, rotations[:COMPILE_BLOCK])
+    for i in range(COMPILE_BLOCK, len(rotations), COMPILE_BLOCK):
+        block_stickers, block_slots = _compile_block(n, rotations[i : i + COMPILE_BLOCK])
+        stickers, slots = _compose(stickers, block_stickers), _compose(slots, block_slots)
+    return itemgetter(*stickers), itemgetter(*slots)
+
+
 class Cube:
     """A class representing a rubik's cube.
 
@@ -87,6 +374,10 @@ class Cube:
     Attributes:
         n (int): Which nth rubik's cube is represented. e.g. if n = 3 then one side of the cube is a 3x3 square.
 
+    Args:
+        cube_str: The one-line string representation of the cube.
+        use_cubelets: Force the cubelet object model even if the cube's degree is backed by sticker permutations.
+
     Notes:
         The cube is defined along the x, y, and z axis. If you were looking at the corner of the rubik's cube that joins
         the front, right, and top faces, the x-axis would extend normal to the right face, the y-axis normal to the
@@ -97,17 +388,75 @@ class Cube:
         So, the first character in the input string will be the top left sticker of the front face, etc. etc.
     """
 
-    def __init__(self, cube_str: str):
+    def __init__(self, cube_str: str, use_cubelets: bool = False):
         self.n = int(sqrt(len(cube_str) // 6))
+        self._stickers = None
+        self._journal: List[Tuple[str, int, int]] = []
+        self._views: Dict[Tuple[str, int], List[List[Any]]] = {}
+
+        if self.n in PERMUTATION_DEGREES and not use_cubelets:
+            # normalize the colors once, the face whose center has a color gives the color's index
+            self._init_permutations(*normalize(cube_str))
+            return
+
         self._cube = [[[CubeletWrapper() for _ in range(self.n)] for _ in range(self.n)] for _ in range(self.n)]
 
         for offset, (normal, face) in enumerate(FACES.items()):
             face, offset = self._face(normal), self.n**2 * offset
             for i in range(self.n**2):
                 setattr(face[i // self.n][i % self.n], normal, cube_str[i + offset])
+        self._colors = self._center_colors()
+
+    def _init_permutations(self, stickers: bytes, palette: List[str]):
+        """Initialize the cube to be backed by sticker permutations."""
+        self._permutations = permutations(self.n)
+        self._stickers = stickers
+        self._palette = palette
+        self._slots = tuple(range(self.n**3))
+        self._colors = self._center_colors()
+        self._targets = self._center_targets()
+        self._mismatched = self._mismatches()
+
+    @cached_property
+    def _cube(self) -> List[List[List[PermutationWrapper]]]:
+        """The cubelet positions of a permutation backed cube, only built once the solvers look at them. A cubelet
+        backed cube sets its own in __init__."""
+        return [
+            [[PermutationWrapper(self, (z * self.n + y) * self.n + x) for x in range(self.n)] for y in range(self.n)]
+            for z in range(self.n)
+        ]
+
+    @classmethod
+    def from_state(cls, state: bytes, palette: List[str]) -> "Cube":
+        """Create a permutation backed cube from a normalized state and the colors of its indices, see Cube.state."""
+        cube = cls.__new__(cls)
+        cube.n = int(sqrt(len(state) // 6))
+        cube._journal = []
+        cube._views = {}
+        if cube.n not in PERMUTATION_DEGREES:
+            raise ValueError(f"Only cubes of degree {PERMUTATION_DEGREES} are backed by sticker permutations")
+        cube._init_permutations(bytes(state), list(palette))
+        return cube
+
+    @property
+    def state(self) -> bytes:
+        """The normalized stickers of a permutation backed cube. Each sticker is given as the index of its color, where
+        the colors of the face centers (as given to the constructor) are indexed 0 to 5 in the order of FACES."""
+        if self._stickers is None:
+            raise ValueError("Only cubes backed by sticker permutations have a normalized state")
+        return self._stickers
+
+    @property
+    def palette(self) -> List[str]:
+        """The color of each index of the normalized state, see Cube.state."""
+        if self._stickers is None:
+            raise ValueError("Only cubes backed by sticker permutations have a normalized state")
+        return list(self._palette)
 
     def __str__(self) -> str:
         """The one-line string representation of the cube."""
+        if self._stickers is not None:
+            return "".join(map(self._palette.__getitem__, self._stickers))
         return "".join(
             "".join(sticker for row in self._face_stickers(normal) for sticker in row) for normal in FACES.keys()
         )
@@ -117,7 +466,10 @@ class Cube:
         result = ""
         for normal, face in FACES.items():
             result += f"\n\n{face['name'].upper()}\n"
-            result += "\n".join(str(row) for row in self._face_stickers(normal))
+            rows = self._face_stickers(normal)
+            if self._stickers is not None:
+                rows = [[self._palette[sticker] for sticker in row] for row in rows]
+            result += "\n".join(str(row) for row in rows)
         return result
 
     def rotate(self, face: str, offset: int = 0, rotations: int = 1) -> str:
@@ -129,6 +481,15 @@ class Cube:
         if rotations < 0:
             raise ValueError("The number of rotations specified must be greater than 0")
 
+        if self._stickers is not None:
+            if rotations % 4:
+                stickers, slots = self._permutations.getters[(face, offset)][rotations % 4]
+                self._stickers, self._slots = bytes(stickers(self._stickers)), slots(self._slots)
+                if 0 < offset < self.n - 1:
+                    self._colors, self._targets = self._center_colors(), self._center_targets()
+                self._mismatched = self._mismatches()
+            return f"{offset if offset != 0 else ''}{face}" * rotations
+
         normal = ROTATIONS[face.lower()]["normal"]
         layer = self._face(normal, offset)
         clockwise = face.isupper()
@@ -149,36 +510,161 @@ class Cube:
                         layer[self.n-x-1][self.n-y-1].cubelet = layer[self.n-y-1][x].rotate(normal, clockwise)
                         layer[self.n-y-1][x].cubelet = swap
                     # fmt: on
+        if 0 < offset < self.n - 1:
+            self._colors = self._center_colors()
         return f"{offset if offset != 0 else ''}{face}" * rotations
 
-    def scramble(self, rotations: int = 20):
-        """Scramble the cube randomly given a number of random rotations."""
+    def rotate_sequence(self, rotations: str) -> str:
+        """Rotate the outer layers of the cube by a string of rotation chars, e.g. "FRrU"."""
+        invalid = set(rotations) - set(ROTATIONS.keys()) - set(face.upper() for face in ROTATIONS.keys())
+        if invalid:
+            raise ValueError("The faces specified for rotation are not present in " + str(list(ROTATIONS.keys())))
+
+        if self._stickers is not None and rotations:
+            stickers, slots = compile_rotations(self.n, rotations)
+            self._stickers, self._slots = bytes(stickers(self._stickers)), slots(self._slots)
+            self._mismatched = self._mismatches()
+            return rotations
+        return "".join(self.rotate(rotation) for rotation in rotations)
+
+    def scramble(self, rotations: int = 20, rng: Optional[random.Random] = None):
+        """Scramble the cube randomly given a number of random rotations, drawn from rng (or the random module)."""
+        rng = rng or random
         chars = list(ROTATIONS.keys())
         for _ in range(rotations):
-            self.rotate(random.choice(chars), offset=random.randint(0, self.n // 2 - 1), rotations=random.randint(1, 3))
+            self.rotate(rng.choice(chars), offset=rng.randint(0, self.n // 2 - 1), rotations=rng.randint(1, 3))
+
+    def copy(self) -> "Cube":
+        """Obtain an independent copy of the cube without parsing its string representation. A permutation backed cube
+        shares its immutable state with the copy, so copying it costs the same however scrambled it is."""
+        cube = Cube.__new__(Cube)
+        cube.n = self.n
+        cube._journal = list(self._journal)
+        cube._views = {}
+        cube._stickers = self._stickers
+        cube._colors = self._colors
+        if self._stickers is not None:
+            cube._permutations, cube._palette, cube._slots = self._permutations, self._palette, self._slots
+            cube._targets, cube._mismatched = self._targets, self._mismatched
+        else:
+            cube._cube = self._copy_cubelets(self._cube)
+        return cube
+
+    def push(self, face: str, offset: int = 0, rotations: int = 1) -> str:
+        """Rotate a layer of the cube the same as rotate(), recording the rotation so pop() is able to undo it."""
+        result = self.rotate(face, offset, rotations)
+        self._journal.append((face, offset, rotations))
+        return result
+
+    def pop(self, count: int = 1) -> str:
+        """Undo the last count rotations recorded by push() by applying their inverses, the latest first.
+
+        Returns:
+            The rotations applied to undo them.
+        """
+        if count < 0 or count > len(self._journal):
+            raise ValueError(f"The count specified must be between 0 <= count <= {len(self._journal)}")
+        result = ""
+        for _ in range(count):
+            face, offset, rotations = self._journal.pop()
+            result += self.rotate(face.swapcase(), offset, rotations)
+        return result
+
+    @property
+    def journal(self) -> List[Tuple[str, int, int]]:
+        """The (face, offset, rotations) recorded by push() that pop() is yet to undo, the oldest first."""
+        return list(self._journal)
 
-    def solve(self) -> str:
-        """Perform rotations on the cube to solve it."""
+    def snapshot(self) -> tuple:
+        """Capture the state of the cube and its journal, to be put back by restore(). A permutation backed cube's
+        state is immutable, so the snapshot only holds references to it."""
+        if self._stickers is not None:
+            state = (self._stickers, self._slots, self._colors, self._targets, self._mismatched)
+        else:
+            state = (self._copy_cubelets(self._cube), self._colors)
+        return state, tuple(self._journal)
+
+    def restore(self, snapshot: tuple):
+        """Put the cube back to a state captured by snapshot(), which is able to be restored any number of times."""
+        state, journal = snapshot
+        if self._stickers is not None:
+            self._stickers, self._slots, self._colors, self._targets, self._mismatched = state
+        else:
+            cubelets, self._colors = state
+            self._cube = self._copy_cubelets(cubelets)
+            self._views = {}
+        self._journal = list(journal)
+
+    @staticmethod
+    def _copy_cubelets(positions: List[List[List["CubeletWrapper"]]]) -> List[List[List["CubeletWrapper"]]]:
+        """Copy the cubelet positions of a cubelet backed cube, with a copy of the cubelet at each."""
+
+        def wrap(cubelet: "Cubelet") -> "CubeletWrapper":
+            wrapper = CubeletWrapper.__new__(CubeletWrapper)
+            wrapper.__dict__["cubelet"] = cubelet
+            return wrapper
+
+        return [[[wrap(wrapper.cubelet.copy()) for wrapper in row] for row in plane] for plane in positions]
+
+    def solve(self, method: str = "beginner", budget: Optional[Budget] = None) -> str:
+        """Perform rotations on the cube to solve it using a method in SOLVE_METHODS.
+
+        Args:
+            method: The method to solve the cube with.
+            budget: The work the solve may spend, unlimited if None.
+
+        Raises:
+            BudgetExceeded: If the solve spends more than its budget, leaving the cube part way solved.
+        """
         if self.n != 3:
             raise ValueError("solve() is only defined for cubes of the 3rd degree")
+        if method not in SOLVE_METHODS:
+            raise ValueError("The method specified for solving is not present in " + str(list(SOLVE_METHODS)))
+
+        if method == "twophase":
+            return self._two_phase(budget)
+        solver = self._last_layer if method == "cfop" else self._top_layer
+        if budget is None:
+            return self._simplify(solver())
+
+        self.rotate = budget.charged(self.rotate)
+        try:
+            return self._simplify(solver())
+        finally:
+            del self.rotate
+
+    @stage
+    def _two_phase(self, budget: Optional[Budget] = None) -> str:
+        """Perform rotations on the cube to solve it with the two-phase algorithm."""
+        from rubik import twophase
+
+        result = twophase.solve(str(self), budget=budget)
+        for rotation in result:
+            self.rotate(rotation)
+        return result
+
+    @stage
+    def _last_layer(self) -> str:
+        """Perform rotations on the cube to solve the last layer, orienting and then permuting it with an algorithm
+        looked up from its case."""
+        from rubik import lastlayer
+
+        result = ""
+        if self.is_solved():
+            return result
+        if not self.is_middle_layered():
+            result = self._middle_layer()
 
-        return self._simplify(self._top_layer())
+        result += "".join(self.rotate(rotation) for rotation in lastlayer.orient(self))
+        result += "".join(self.rotate(rotation) for rotation in lastlayer.permute(self))
+        return result
 
     @staticmethod
     def _simplify(solution: str) -> str:
         """Simplifies a string of rotations into a shorter, equivalent solution string."""
-        result, i = "", 0
-        while i < len(solution):
-            if i + 3 < len(solution) and len(Counter(solution[i : i + 4])) == 1:
-                i += 4
-            elif i + 2 < len(solution) and len(Counter(solution[i : i + 3])) == 1:
-                result += solution[i].upper() if solution[i].islower() else solution[i].lower()
-                i += 3
-            else:
-                result += solution[i]
-                i += 1
-        return result
+        return simplify_rotations(solution)
 
+    @stage
     def _top_layer(self) -> str:
         """Perform rotations on the cube to make the top layer."""
         result = ""
@@ -191,7 +677,7 @@ class Cube:
         while not self.is_solved():
             middle = next((middle for middle in middles if self._is_cubelet_solved(middle)), None)
             normal = self._next_normal(
-                next(normal for normal in SIDES if middle.sticker(normal)) if middle else "y_neg", 2
+                next(normal for normal in SIDES if middle.sticker(normal) != "") if middle else "y_neg", 2
             )
             left, mid, right, up = self._perspective(normal)
             FFUrLFFlRUFF = (
@@ -211,6 +697,7 @@ class Cube:
             result += "".join(self.rotate(rotation) for rotation in FFUrLFFlRUFF)
         return result
 
+    @stage
     def _top_corners(self) -> str:
         """Perform rotations on the cube to make the top corners."""
         result = ""
@@ -241,6 +728,7 @@ class Cube:
             result += "".join(self.rotate(rotation) for rotation in RUrURUUr)  # solve the fish
         return result
 
+    @stage
     def _top_surface(self) -> str:
         """Perform rotations on the cube to make the top surface."""
         result = ""
@@ -282,6 +770,7 @@ class Cube:
             result += "".join(self.rotate(rotation) for rotation in RUrURUUr)
         return result
 
+    @stage
     def _top_cross(self) -> str:
         """Perform rotations on the cube to make the top cross."""
         result = ""
@@ -318,6 +807,7 @@ class Cube:
         result += "".join(self.rotate(rotation) for rotation in FURurf)
         return result
 
+    @stage
     def _middle_layer(self) -> str:
         """Perform rotations on the cube to make the middle layer."""
         result = ""
@@ -349,11 +839,11 @@ class Cube:
         if self._is_cubelet_solved(middle):
             return result
 
-        if not middle.sticker("z_pos"):
-            normal = next(normal for normal in SIDES if middle.sticker(normal))
-            result += self._trigger(normal, bool(middle.sticker(self._next_normal(normal)))) + self._bottom_layer()
+        if middle.sticker("z_pos") == "":
+            normal = next(normal for normal in SIDES if middle.sticker(normal) != "")
+            result += self._trigger(normal, middle.sticker(self._next_normal(normal)) != "") + self._bottom_layer()
 
-        normal = next(normal for normal in SIDES if middle.sticker(normal))
+        normal = next(normal for normal in SIDES if middle.sticker(normal) != "")
         while middle.sticker(normal) != self._color(normal):
             result += self.rotate(FACES["z_pos"]["rotation"])
             normal = self._next_normal(normal)
@@ -362,6 +852,7 @@ class Cube:
         result += self._trigger(normal, right) + self._bottom_layer()
         return result
 
+    @stage
     def _bottom_layer(self) -> str:
         """Perform rotations on the cube to make the bottom layer."""
         result = ""
@@ -393,9 +884,12 @@ class Cube:
             normal
             for normal in SIDES
             if corner.sticker(normal) == self._color("z_neg")
-            or (corner.sticker(normal) and self._color("z_neg") in (corner.sticker("z_neg"), corner.sticker("z_pos")))
+            or (
+                corner.sticker(normal) != ""
+                and self._color("z_neg") in (corner.sticker("z_neg"), corner.sticker("z_pos"))
+            )
         )
-        right = bool(corner.sticker(self._next_normal(normal)))
+        right = corner.sticker(self._next_normal(normal)) != ""
 
         if self._is_cubelet_solved(corner):
             return result
@@ -409,7 +903,7 @@ class Cube:
             result += self._trigger(normal, right)
         if corner.sticker("z_pos") not in ("", self._color("z_neg")):  # top row
             normal = next(normal for normal in SIDES if corner.sticker(normal) not in ("", self._color("z_neg")))
-            right = bool(corner.sticker(self._next_normal(normal)))
+            right = corner.sticker(self._next_normal(normal)) != ""
             while self._color(normal) != corner.sticker(normal):
                 result += self.rotate(FACES["z_pos"]["rotation"])
                 normal = self._next_normal(normal)
@@ -432,6 +926,7 @@ class Cube:
             result += self.rotate(left.upper())
         return result
 
+    @stage
     def _bottom_cross(self) -> str:
         """Perform rotations on the cube to make the bottom cross."""
         if self.is_bottom_crossed():
@@ -444,13 +939,14 @@ class Cube:
             petals.append(self._up()[y][x].cubelet)
 
         for petal in petals:
-            normal = next(normal for normal in SIDES if petal.sticker(normal))
+            normal = next(normal for normal in SIDES if petal.sticker(normal) != "")
             while self._color(normal) != petal.sticker(normal):
                 result += self.rotate(FACES["z_pos"]["rotation"])
                 normal = self._next_normal(normal)
             result += self.rotate(FACES[normal]["rotation"]) + self.rotate(FACES[normal]["rotation"])
         return result
 
+    @stage
     def _daisy(self) -> str:
         """Perform rotations on the cube to make the daisy."""
         petals = []
@@ -470,7 +966,7 @@ class Cube:
                 while self._face(normal)[0][1].sticker("z_pos") == self._color("z_neg"):
                     result += self.rotate(FACES["z_pos"]["rotation"])
                 left, mid, right, up = self._perspective(normal)
-                if petal.sticker("z_pos"):  # top
+                if petal.sticker("z_pos") != "":  # top
                     result += self.rotate(mid) + self.rotate(up.upper()) + self.rotate(left) + self.rotate(up)
                 else:  # bottom
                     result += self.rotate(mid) + self.rotate(up) + self.rotate(right.upper()) + self.rotate(up.upper())
@@ -495,6 +991,8 @@ class Cube:
 
     def is_solved(self) -> bool:
         """Check if the cube is solved."""
+        if self._stickers is not None and self.n % 2 == 1:
+            return not self._mismatched
         for normal in FACES.keys():
             for sticker in (sticker for row in self._face_stickers(normal) for sticker in row):
                 if sticker != self._color(normal):
@@ -506,6 +1004,8 @@ class Cube:
         if self.n != 3:
             raise ValueError("is_top_cornered() is only defined for cubes of the 3rd degree")
 
+        if self._stickers is not None:
+            return not self._mismatched & PROGRESS_MASKS["top_cornered"]
         if not self.is_top_surfaced():
             return False
         for normal in SIDES:
@@ -518,6 +1018,8 @@ class Cube:
         if self.n != 3:
             raise ValueError("is_top_surfaced() is only defined for cubes of the 3rd degree")
 
+        if self._stickers is not None:
+            return not self._mismatched & PROGRESS_MASKS["top_surfaced"]
         if not self.is_middle_layered():
             return False
         for sticker in (sticker for row in self._face_stickers("z_pos") for sticker in row):
@@ -530,6 +1032,8 @@ class Cube:
         if self.n != 3:
             raise ValueError("is_top_crossed() is only defined for cubes of the 3rd degree")
 
+        if self._stickers is not None:
+            return not self._mismatched & PROGRESS_MASKS["top_crossed"]
         if not self.is_middle_layered():
             return False
         if not all(self._sticker(y, x, "z_pos") == self._color("z_pos") for y, x in ((0, 1), (1, 0), (1, 2), (2, 1))):
@@ -541,6 +1045,8 @@ class Cube:
         if self.n != 3:
             raise ValueError("is_middle_layered() is only defined for cubes of the 3rd degree")
 
+        if self._stickers is not None:
+            return not self._mismatched & PROGRESS_MASKS["middle_layered"]
         if not self.is_bottom_layered():
             return False
         for normal in SIDES:
@@ -553,6 +1059,8 @@ class Cube:
         if self.n != 3:
             raise ValueError("is_bottom_layered() is only defined for cubes of the 3rd degree")
 
+        if self._stickers is not None:
+            return not self._mismatched & PROGRESS_MASKS["bottom_layered"]
         for sticker in (sticker for row in self._face_stickers("z_neg") for sticker in row):
             if sticker != self._color("z_neg"):
                 return False
@@ -566,6 +1074,8 @@ class Cube:
         if self.n != 3:
             raise ValueError("is_bottom_crossed() is only defined for cubes of the 3rd degree")
 
+        if self._stickers is not None:
+            return not self._mismatched & PROGRESS_MASKS["bottom_crossed"]
         if not all(self._sticker(y, x, "z_neg") == self._color("z_neg") for y, x in ((0, 1), (1, 0), (1, 2), (2, 1))):
             return False
         for normal, face in list(FACES.items())[:4]:
@@ -588,27 +1098,63 @@ class Cube:
                 for cubelet in row:
                     cubelet = set(cubelet.sticker(normal) for normal in FACES.keys())
                     for color in cubelet:
-                        if color and invalid_colors.get(color) in cubelet:
+                        if color != "" and invalid_colors.get(color) in cubelet:
                             return False
         return True
 
-    def _color(self, normal: str) -> str:
-        """Obtain the color of a face on the cube."""
-        if self.n % 2 != 1:
-            raise ValueError("The parity of the cube's n degree must be odd to obtain a face's color")
+    def _color(self, normal: str) -> Union[int, str]:
+        """Obtain the color of a face on the cube, in the same form as _sticker()."""
+        try:
+            return self._colors[normal]
+        except KeyError:
+            raise ValueError("The parity of the cube's n degree must be odd to obtain a face's color") from None
 
-        return getattr(getattr(self, FACES[normal]["method"])()[self.n // 2][self.n // 2], normal)
+    def _center_colors(self) -> Dict[str, Union[int, str]]:
+        """Obtain the color of each face's center, cached in _colors as only middle slice moves change them."""
+        if self.n % 2 != 1:
+            return {}
+        return {normal: self._sticker(self.n // 2, self.n // 2, normal) for normal in FACES.keys()}
 
-    def _sticker(self, y: int, x: int, normal: str) -> str:
-        """Obtain a sticker given a normal vector and a coordinate pair."""
-        return getattr(getattr(self, FACES[normal]["method"])()[y][x], normal)
+    def _center_targets(self) -> int:
+        """Obtain the state of a permutation backed cube with every sticker the color of its face's center, read as a
+        little endian integer. Even cubes have no centers, so 0."""
+        if self.n % 2 != 1:
+            return 0
+        size = self.n**2
+        centers = [self._stickers[i * size + size // 2] for i in range(len(FACES))]
+        return int.from_bytes(bytes(center for center in centers for _ in range(size)), "little")
+
+    def _mismatches(self) -> int:
+        """Obtain the stickers of a permutation backed cube that don't match their face's center, as the nonzero bytes
+        of an integer masked by PROGRESS_MASKS. It's kept in _mismatched as the cube rotates, a single xor of the state
+        rather than a scan of its faces."""
+        return int.from_bytes(self._stickers, "little") ^ self._targets
+
+    def _sticker(self, y: int, x: int, normal: str) -> Union[int, str]:
+        """Obtain a sticker given a normal vector and a coordinate pair. A permutation backed cube gives the normalized
+        color index of the sticker (see Cube.state), so the solvers compare ints rather than looking up colors."""
+        if self._stickers is not None:
+            return self._stickers[FACE_OFFSETS[normal] * self.n**2 + y * self.n + x]
+        return getattr(self._face(normal)[y][x], normal)
 
     def _face(self, normal: str, offset: int = 0) -> List[List["CubeletWrapper"]]:
-        """Obtain a layer respective to a normal vector."""
-        return getattr(self, FACES[normal]["method"])(offset)
-
-    def _face_stickers(self, normal: str) -> List[List[str]]:
-        """Obtain a 2d array containing all the stickers for a given face."""
+        """Obtain a layer respective to a normal vector.
+
+        The positions of a cube never move (the cubelets move between them), so each layer is only looked up once from
+        face_slots() and the same lists are returned from then on. They must not be modified.
+        """
+        view = self._views.get((normal, offset))
+        if view is None:
+            positions = [wrapper for plane in self._cube for row in plane for wrapper in row]
+            view = [[positions[slot] for slot in row] for row in face_slots(self.n, normal, offset)]
+            self._views[(normal, offset)] = view
+        return view
+
+    def _face_stickers(self, normal: str) -> List[List[Union[int, str]]]:
+        """Obtain a 2d array containing all the stickers for a given face, in the same form as _sticker()."""
+        if self._stickers is not None:
+            offset = FACE_OFFSETS[normal] * self.n**2
+            return [list(self._stickers[offset + y * self.n : offset + (y + 1) * self.n]) for y in range(self.n)]
         return [[getattr(cubelet, normal) for cubelet in row] for row in self._face(normal)]
 
     @staticmethod
@@ -622,39 +1168,27 @@ class Cube:
 
     def _front(self, offset: int = 0) -> List[List["CubeletWrapper"]]:
         """Obtain a layer respective to the front of the cube."""
-        return self._xz_plane(self.n - 1 - offset)[::-1]
+        return self._face("y_pos", offset)
 
     def _right(self, offset: int = 0) -> List[List["CubeletWrapper"]]:
         """Obtain a layer respective to the right of the cube."""
-        return [row[::-1] for row in self._yz_plane(self.n - 1 - offset)[::-1]]
+        return self._face("x_pos", offset)
 
     def _back(self, offset: int = 0) -> List[List["CubeletWrapper"]]:
         """Obtain a layer respective to the back of the cube."""
-        return [row[::-1] for row in self._xz_plane(0 + offset)[::-1]]
+        return self._face("y_neg", offset)
 
     def _left(self, offset: int = 0) -> List[List["CubeletWrapper"]]:
         """Obtain a layer respective to the left of the cube."""
-        return self._yz_plane(0 + offset)[::-1]
+        return self._face("x_neg", offset)
 
     def _up(self, offset: int = 0) -> List[List["CubeletWrapper"]]:
         """Obtain a layer respective to the top of the cube."""
-        return self._xy_plane(self.n - 1 - offset)
+        return self._face("z_pos", offset)
 
     def _down(self, offset: int = 0) -> List[List["CubeletWrapper"]]:
         """Obtain a layer respective to the bottom of the cube."""
-        return self._xy_plane(0 + offset)[::-1]
-
-    def _xy_plane(self, z: int) -> List[List["CubeletWrapper"]]:
-        """Obtain a plane parallel to the x and y axis."""
-        return self._cube[z]
-
-    def _yz_plane(self, x: int) -> List[List["CubeletWrapper"]]:
-        """Obtain a plane parallel to the y and z axis."""
-        return [[row[x] for row in plane] for plane in self._cube]
-
-    def _xz_plane(self, y: int) -> List[List["CubeletWrapper"]]:
-        """Obtain a plane parallel to the x and z axis."""
-        return [plane[y] for plane in self._cube]
+        return self._face("z_neg", offset)
 
 
 """
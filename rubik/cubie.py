@@ -0,0 +1,182 @@
+"""
+The cubie model of a 3x3 cube, the permutation and orientation of its corner and edge pieces, and its conversion to and
+from the one-line string representation.
+
+It's kept apart from rubik.twophase, so that checking a cube's pieces doesn't have to import the solver's tables.
+"""
+from itertools import combinations
+from typing import List, Optional, Sequence, Tuple
+
+from rubik.cube import FACES, permutations as cube_permutations
+
+
+"""
+The corner and edge positions named by the faces their stickers are on. Corner stickers are listed clockwise starting
+from the up or down face, edge stickers starting from the up or down face (or the front or back face for the middle
+slice edges).
+"""
+CORNERS = ("URF", "UFL", "ULB", "UBR", "DFR", "DLF", "DBL", "DRB")
+EDGES = ("UR", "UF", "UL", "UB", "DR", "DF", "DL", "DB", "FR", "FL", "BL", "BR")
+
+"""
+The normal vector of each face letter used to name the positions.
+"""
+FACE_NORMALS = {"F": "y_pos", "R": "x_pos", "B": "y_neg", "L": "x_neg", "U": "z_pos", "D": "z_neg"}
+
+SLICE_COMBINATIONS = list(combinations(range(12), 4))
+SLICE_INDEX = {positions: i for i, positions in enumerate(SLICE_COMBINATIONS)}
+SLICE_SOLVED = SLICE_INDEX[(8, 9, 10, 11)]
+
+
+class CubieCube:
+    """A class representing a 3x3 cube by the permutation and orientation of its corner and edge cubies.
+
+    Attributes:
+        cp (list): The corner cubie at each corner position.
+        co (list): The orientation (0 to 2) of the corner at each corner position.
+        ep (list): The edge cubie at each edge position.
+        eo (list): The orientation (0 or 1) of the edge at each edge position.
+    """
+
+    def __init__(self, cp=None, co=None, ep=None, eo=None):
+        self.cp = list(cp) if cp is not None else list(range(8))
+        self.co = list(co) if co is not None else [0] * 8
+        self.ep = list(ep) if ep is not None else list(range(12))
+        self.eo = list(eo) if eo is not None else [0] * 12
+
+    def __eq__(self, other) -> bool:
+        return (self.cp, self.co, self.ep, self.eo) == (other.cp, other.co, other.ep, other.eo)
+
+    def multiply(self, other: "CubieCube") -> "CubieCube":
+        """Obtain the cube that results from applying other after this cube."""
+        return CubieCube(
+            [self.cp[other.cp[i]] for i in range(8)],
+            [(self.co[other.cp[i]] + other.co[i]) % 3 for i in range(8)],
+            [self.ep[other.ep[i]] for i in range(12)],
+            [(self.eo[other.ep[i]] + other.eo[i]) % 2 for i in range(12)],
+        )
+
+    def is_solvable(self) -> bool:
+        """Check if the cube can be solved, i.e. the twist, flip, and permutation parities are consistent."""
+        return (
+            sorted(self.cp) == list(range(8))
+            and sorted(self.ep) == list(range(12))
+            and sum(self.co) % 3 == 0
+            and sum(self.eo) % 2 == 0
+            and parity(self.cp) == parity(self.ep)
+        )
+
+    def twist(self) -> int:
+        """The corner orientation coordinate."""
+        result = 0
+        for co in self.co[:7]:
+            result = 3 * result + co
+        return result
+
+    def flip(self) -> int:
+        """The edge orientation coordinate."""
+        result = 0
+        for eo in self.eo[:11]:
+            result = 2 * result + eo
+        return result
+
+    def slice(self) -> int:
+        """The coordinate of which positions the middle slice edges are in."""
+        return SLICE_INDEX[tuple(i for i, edge in enumerate(self.ep) if edge >= 8)]
+
+    def corners(self) -> int:
+        """The corner permutation coordinate."""
+        return _perm_rank(self.cp)
+
+    def ud_edges(self) -> int:
+        """The permutation coordinate of the up and down edges. Only meaningful in phase 2."""
+        return _perm_rank(self.ep[:8])
+
+    def slice_edges(self) -> int:
+        """The permutation coordinate of the middle slice edges. Only meaningful in phase 2."""
+        return _perm_rank([edge - 8 for edge in self.ep[8:]])
+
+
+def parity(perm: Sequence[int]) -> int:
+    """Obtain the parity of a permutation, 0 for even and 1 for odd."""
+    return sum(1 for i in range(len(perm)) for j in range(i) if perm[j] > perm[i]) % 2
+
+
+def _perm_rank(perm: Sequence[int]) -> int:
+    """Obtain the lexicographic rank of a permutation of range(len(perm))."""
+    result, remaining = 0, sorted(perm)
+    for value in perm:
+        i = remaining.index(value)
+        result = result * len(remaining) + i
+        remaining.pop(i)
+    return result
+
+
+def _facelets() -> Tuple[List[List[int]], List[List[int]]]:
+    """Obtain the sticker indices of every corner and edge position, in the order of CORNERS and EDGES."""
+    slot_stickers = cube_permutations(3).slot_stickers
+
+    def stickers(name: str) -> List[int]:
+        coordinates = {"x": 1, "y": 1, "z": 1}
+        for face in name:
+            normal = FACE_NORMALS[face]
+            coordinates[normal[0]] = 2 if normal.endswith("pos") else 0
+        slot = (coordinates["z"] * 3 + coordinates["y"]) * 3 + coordinates["x"]
+        return [slot_stickers[slot][FACE_NORMALS[face]] for face in name]
+
+    return [stickers(name) for name in CORNERS], [stickers(name) for name in EDGES]
+
+
+CORNER_FACELETS, EDGE_FACELETS = _facelets()
+CENTER_FACELETS = {face: list(FACES.keys()).index(normal) * 9 + 4 for face, normal in FACE_NORMALS.items()}
+
+
+def to_cubie(cube_str: str) -> Optional[CubieCube]:
+    """Convert the one-line string representation of a 3x3 cube to cubies. Returns None if the stickers don't form
+    valid cubies."""
+    colors = {cube_str[i]: face for face, i in CENTER_FACELETS.items()}
+    if len(colors) != 6:
+        return None
+    faces = [colors.get(color, "") for color in cube_str]
+
+    cubie = CubieCube([-1] * 8, [0] * 8, [-1] * 12, [0] * 12)
+    for i, facelets in enumerate(CORNER_FACELETS):
+        stickers = [faces[facelet] for facelet in facelets]
+        orientation = next((j for j, face in enumerate(stickers) if face in ("U", "D")), None)
+        if orientation is None:
+            return None
+        name = "".join(stickers[(orientation + j) % 3] for j in range(3))
+        if name not in CORNERS:
+            return None
+        cubie.cp[i], cubie.co[i] = CORNERS.index(name), orientation
+    for i, facelets in enumerate(EDGE_FACELETS):
+        name = "".join(faces[facelet] for facelet in facelets)
+        if name in EDGES:
+            cubie.ep[i], cubie.eo[i] = EDGES.index(name), 0
+        elif name[::-1] in EDGES:
+            cubie.ep[i], cubie.eo[i] = EDGES.index(name[::-1]), 1
+        else:
+            return None
+    return cubie
+
+
+def from_cubie(cubie: CubieCube, colors: str = "FRBLUD") -> str:
+    """Convert cubies to the one-line string representation of a 3x3 cube, the inverse of to_cubie.
+
+    Args:
+        cubie: The cubies of the cube.
+        colors: The color of each face letter, in the order of FACE_NORMALS.
+    """
+    color = dict(zip(FACE_NORMALS.keys(), colors))
+    stickers = [""] * 54
+    for face, i in CENTER_FACELETS.items():
+        stickers[i] = color[face]
+    for i, facelets in enumerate(CORNER_FACELETS):
+        name = CORNERS[cubie.cp[i]]
+        for j, facelet in enumerate(facelets):
+            stickers[facelet] = color[name[(j - cubie.co[i]) % 3]]
+    for i, facelets in enumerate(EDGE_FACELETS):
+        name = EDGES[cubie.ep[i]] if not cubie.eo[i] else EDGES[cubie.ep[i]][::-1]
+        for j, facelet in enumerate(facelets):
+            stickers[facelet] = color[name[j]]
+    return "".join(stickers)
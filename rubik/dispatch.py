@@ -1,16 +1,39 @@
-from rubik.check import check
+import json
+from typing import Callable, Iterable, List, Tuple
+
+from rubik.check import check, check_many
 from rubik.info import info
-from rubik.solve import solve
+from rubik.profiling import profile
+from rubik.simplify import simplify
+from rubik.solve import solve, solve_many
 
 
 OPS = {
     "check": check,
     "info": info,
+    "simplify": simplify,
     "solve": solve,
 }
 
 
-def dispatch(params: dict = None):
+class _InvalidJson:
+    """The type of INVALID_JSON, which pickles by reference so it's still INVALID_JSON in a worker process."""
+
+    def __reduce__(self):
+        return "INVALID_JSON"
+
+    def __repr__(self):
+        return "INVALID_JSON"
+
+
+"""
+Stands in for each item of a batch that isn't valid JSON.
+"""
+INVALID_JSON = _InvalidJson()
+
+
+def _invalid(params) -> dict:
+    """Obtain the error for params that cannot be dispatched, or an empty dict if they can be."""
     if params is None:
         result = {"status": "error: no parameters are given"}
     elif not isinstance(params, dict):
@@ -19,6 +42,70 @@ def dispatch(params: dict = None):
         result = {"status": "error: no op is specified"}
     elif params["op"] not in OPS:
         result = {"status": "error: op is not legal"}
+    else:
+        result = {}
+    return result
+
+
+def dispatch(params: dict = None):
+    result = _invalid(params)
+    if result:
+        return result
+    if params.get("debug") == "timings":
+        # a cached solve wouldn't run any of the stages being timed
+        with profile() as timings:
+            result = solve(params, cached=False) if params["op"] == "solve" else OPS[params["op"]](params)
+        result["timings"] = timings.to_dict()
     else:
         result = OPS[params["op"]](params)
     return result
+
+
+def dispatch_many(items: Iterable[dict], solver: Callable[[Iterable[dict]], List[dict]] = solve_many) -> List[dict]:
+    """Dispatch a batch of params, returning each item's result in order. Solves are batched through the solver and
+    checks through check_many."""
+    items = list(items)
+    results = [_invalid(params) for params in items]
+    solves = [i for i, params in enumerate(items) if not results[i] and params["op"] == "solve"]
+    for i, result in zip(solves, solver([items[i] for i in solves])):
+        results[i] = result
+    checks = [i for i, params in enumerate(items) if not results[i] and params["op"] == "check"]
+    for i, result in zip(checks, check_many([items[i] for i in checks])):
+        results[i] = result
+    for i, params in enumerate(items):
+        if not results[i]:
+            try:
+                results[i] = OPS[params["op"]](params)
+            except Exception as e:
+                results[i] = {"status": f"error: {e}"}
+    return results
+
+
+def parse_batch(body: str) -> Tuple[list, bool]:
+    """Parse a batch body given as either a JSON array or a JSONL stream. Returns the items and if it was JSONL."""
+    try:
+        items = json.loads(body)
+        if isinstance(items, list):
+            return items, False
+        return [items], True
+    except ValueError:
+        pass
+
+    items = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            items.append(INVALID_JSON)
+    return items, True
+
+
+def dispatch_batch(items: List, solver: Callable[[Iterable[dict]], List[dict]] = solve_many) -> List[dict]:
+    """Dispatch a parsed batch, reporting the items which were INVALID_JSON."""
+    results = dispatch_many((item if item is not INVALID_JSON else {} for item in items), solver)
+    return [
+        result if item is not INVALID_JSON else {"status": "error: item is not valid json"}
+        for item, result in zip(items, results)
+    ]
@@ -0,0 +1,175 @@
+"""
+The last layer of the cfop method. Once the first two layers are solved, the last layer is oriented with a single OLL
+algorithm and then permuted with a single PLL algorithm, each looked up from the case the layer is in rather than
+repeating a few algorithms until the layer is done.
+
+The algorithms only turn outer faces and are written with the face letters of FACE_NORMALS, uppercase for a clockwise
+turn and lowercase for a counterclockwise turn. Which case each algorithm solves is derived from the algorithm itself,
+for every turn of the up face before it (and after it, for PLL), so the index can't disagree with Cube.rotate.
+"""
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from rubik.cube import Cube, FACES, SIDES, simplify_rotations
+from rubik.cubie import FACE_NORMALS
+
+
+"""
+The stickers of the last layer as (normal, row, column): the up face, then the top row of each side.
+"""
+LAST_LAYER = tuple(("z_pos", y, x) for y in range(3) for x in range(3)) + tuple(
+    (normal, 0, x) for normal in SIDES for x in range(3)
+)
+
+"""
+An algorithm for each of the 57 cases of orienting the last layer (OLL). Each is the shortest of a standard algorithm,
+its inverse, and their mirror images.
+"""
+OLL = (
+    "FURurf",
+    "fluLUF",
+    "fulULF",
+    "RBlBLBBr",
+    "RUUruRur",
+    "RUrURUUr",
+    "RBBlbLbr",
+    "lBBRBrBL",
+    "lbRbrBBL",
+    "FrfLFRfl",
+    "FrfRURur",
+    "LFrflFRf",
+    "RUrurFRf",
+    "rurFRfUR",
+    "LUfulULFl",
+    "LfLLBLLFLLbL",
+    "LfluLUFul",
+    "RRdRUUrDRUUR",
+    "RUURRFRfRUUr",
+    "RUURRuRRuRRUUR",
+    "lBLLfLLbLLFl",
+    "rFRUrufUR",
+    "ruFURurfR",
+    "FRUruRUruf",
+    "FURurURurf",
+    "FUfrFRurfR",
+    "LFRlUruLfl",
+    "LFrfRlURur",
+    "LfluLFlfUF",
+    "RUrURuBubr",
+    "RUrurLFRfl",
+    "fluLUluLUF",
+    "fuFLflULFl",
+    "rFRUrfRFuf",
+    "rfRluLUrFR",
+    "FrFRRuruRUrFF",
+    "FrfRUUFrfRRUUr",
+    "LFrFrDRdRFFl",
+    "LFFrfRFrfRfl",
+    "RURRurFRURuf",
+    "RUURRFRfUUrFRf",
+    "RUUruRUruRur",
+    "fLfLLULUluLFF",
+    "rFFLFlfLFlFR",
+    "rfLfLdlDlFFR",
+    "FrfRRlBRbrbrL",
+    "RUrURururFRf",
+    "RlBRBrbRRLFRf",
+    "luLulULULflF",
+    "BULulbuFRUruf",
+    "FURurfUBLUlub",
+    "LFrFRFFLLbRbrBBL",
+    "LFrfRRLLBRbrbrL",
+    "RUrURUUrFRUruf",
+    "luLulUULfluLUF",
+    "lbLurURurURlBL",
+    "rFRURuRRfRRurURUr",
+)
+
+"""
+An algorithm for each of the 21 cases of permuting an oriented last layer (PLL), chosen the same way as OLL.
+"""
+PLL = (
+    "rFrBBRfrBBRR",
+    "RRBBRFrBBRfR",
+    "RRLLDRRLLUURRLLDRRLL",
+    "RuRURURuruRR",
+    "RRURUrururUr",
+    "LUUlUULfluLULFLL",
+    "RUrfRUrurFRRur",
+    "luLFluLULfLLUL",
+    "rUURUUrFRUrurfRR",
+    "RUrurFRRuruRUrf",
+    "rLFRRLLBRRLLFrLDDRRLL",
+    "rUrubrBBubUbRBR",
+    "DruRUdRRUrURuRuRR",
+    "RRUrUruRuRRuDrURd",
+    "dLUluDLLuLulUlULL",
+    "LLuLuLUlULLUdLulD",
+    "RbrFRBrfRBrFRbrf",
+    "FRuruRUrfRUrurFRf",
+    "LulULFUfluLfLFlUl",
+    "rURurfuFRUrFrfRuR",
+    "rufRUrurFRRuruRUrUR",
+)
+
+"""
+The rotation char of each face letter the algorithms are written with.
+"""
+TRANSLATION = str.maketrans(
+    "".join(FACE_NORMALS) + "".join(FACE_NORMALS).lower(),
+    "".join(FACES[normal]["rotation"].upper() for normal in FACE_NORMALS.values())
+    + "".join(FACES[normal]["rotation"] for normal in FACE_NORMALS.values()),
+)
+
+"""
+The 0 to 3 clockwise quarter turns of the up face that line the last layer up with an algorithm (AUF).
+"""
+AUF = tuple(FACES["z_pos"]["rotation"].upper() * turns for turns in (0, 1, 2)) + (FACES["z_pos"]["rotation"],)
+
+SOLVED_CUBE = "".join(str(i) * 9 for i in range(len(FACES)))
+
+
+def oll_case(cube: Cube) -> Tuple[bool, ...]:
+    """Obtain the orientation case of a cube's last layer, which of its stickers are the color of the up face."""
+    up = cube._color("z_pos")
+    return tuple(cube._sticker(y, x, normal) == up for normal, y, x in LAST_LAYER)
+
+
+def pll_case(cube: Cube) -> Tuple[int, ...]:
+    """Obtain the permutation case of a cube's oriented last layer, the side whose color each top row sticker is."""
+    sides = {cube._color(normal): i for i, normal in enumerate(SIDES)}
+    return tuple(sides.get(cube._sticker(0, x, normal), -1) for normal in SIDES for x in range(3))
+
+
+@lru_cache(maxsize=None)
+def cases() -> Tuple[Dict[Tuple[bool, ...], str], Dict[Tuple[int, ...], str]]:
+    """Obtain the (lazily computed and cached) OLL and PLL indices, the rotations that solve each case of the last
+    layer, up face turns included. The solved case of each is indexed too, with no algorithm."""
+    oll, pll = {}, {}
+    for algorithms, index, case, afters in ((OLL, oll, oll_case, AUF[:1]), (PLL, pll, pll_case, AUF)):
+        for algorithm in ("",) + algorithms:
+            for before in AUF:
+                for after in afters:
+                    rotations = simplify_rotations(before + algorithm.translate(TRANSLATION) + after)
+                    cube = Cube(SOLVED_CUBE)
+                    cube.rotate_sequence(rotations[::-1].swapcase())
+                    key = case(cube)
+                    if key not in index or len(rotations) < len(index[key]):
+                        index[key] = rotations
+    return oll, pll
+
+
+def orient(cube: Cube) -> str:
+    """Obtain the rotations that orient the last layer of a cube whose first two layers are solved."""
+    try:
+        return cases()[0][oll_case(cube)]
+    except KeyError:
+        raise ValueError("The last layer is not any OLL case, the cube is not solvable") from None
+
+
+def permute(cube: Cube) -> str:
+    """Obtain the rotations that permute the oriented last layer of a cube whose first two layers are solved."""
+    try:
+        return cases()[1][pll_case(cube)]
+    except KeyError:
+        raise ValueError("The last layer is not any PLL case, the cube is not solvable") from None
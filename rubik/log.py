@@ -0,0 +1,62 @@
+"""
+Structured logging for the servers.
+
+Records are written as one JSON object per line, with any extra fields given to the logger included as keys, and are
+buffered so a busy worker isn't blocked on stdout for every response. The buffer is flushed once it's full, on any
+error, and when the process exits.
+"""
+import json
+import logging
+from logging.handlers import MemoryHandler
+import os
+import sys
+import time
+from typing import IO, Optional
+
+
+"""
+The number of records buffered before they're written, set by the RUBIK_LOG_BUFFER environment variable (1 writes
+every record straight away).
+"""
+LOG_BUFFER = int(os.getenv("RUBIK_LOG_BUFFER", "64"))
+LOG_LEVEL = os.getenv("RUBIK_LOG_LEVEL", "INFO")
+
+"""
+The attributes every LogRecord has, anything else on a record was given as an extra field.
+"""
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """A formatter writing each record as a single line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        result = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "message": record.getMessage(),
+        }
+        result.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_info:
+            result["exception"] = self.formatException(record.exc_info)
+        return json.dumps(result, default=str)
+
+
+def configure(
+    name: str = "rubik", level: str = LOG_LEVEL, buffer: int = LOG_BUFFER, stream: Optional[IO] = None
+) -> logging.Logger:
+    """Obtain a logger writing buffered JSON lines to stream (stdout by default), replacing any handlers it had."""
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    if buffer > 1:
+        handler = MemoryHandler(buffer, flushLevel=logging.ERROR, target=handler)
+
+    logger = logging.getLogger(name)
+    for previous in logger.handlers:
+        previous.close()
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -0,0 +1,216 @@
+"""
+An engine for cubes of any degree that only stores the 6n^2 stickers, for big cubes the cubelet object model is too slow
+and too large for (it holds n^3 cubelets, most of them in the interior without a sticker).
+
+The stickers are held in a flat bytearray in the order of the one-line string representation. The permutation of each
+layer turn is derived once per (face, offset, quarter turns) from the 3D position of every sticker, then compressed into
+runs that are each a contiguous or strided slice of both the source and the target, so a turn costs O(n) slice copies
+rather than O(n^2) Python operations.
+"""
+import random
+import re
+from functools import lru_cache
+from math import isqrt
+from typing import Dict, List, Tuple
+
+from rubik.cube import FACES, ROTATIONS
+
+
+"""
+The unit normal vector (x, y, z) of each face.
+"""
+NORMALS = {
+    normal: tuple((1 if normal.endswith("pos") else -1) if axis == normal[0] else 0 for axis in "xyz")
+    for normal in FACES.keys()
+}
+
+"""
+A rotation of the rotate_sequence notation, an optional offset followed by a rotation char, the same as returned by
+Cube.rotate, e.g. "2F" turns the layer two in from the front.
+"""
+TOKEN = re.compile(r"(\d*)([" + "".join(ROTATIONS.keys()) + "".join(ROTATIONS.keys()).upper() + "])")
+
+Position = Tuple[int, int, int]
+Run = Tuple[slice, slice]
+
+
+def _position(n: int, normal: str, y: int, x: int) -> Position:
+    """Obtain the (x, y, z) cubelet position of the sticker at row y and column x of a face, the layout of Cube._face.
+
+    Positions are doubled and centered on the cube's center, so they stay integers under rotation.
+    """
+    last = n - 1
+    cubelet = {
+        "y_pos": (x, last, last - y),
+        "x_pos": (last, last - x, last - y),
+        "y_neg": (last - x, 0, last - y),
+        "x_neg": (0, x, last - y),
+        "z_pos": (x, y, last),
+        "z_neg": (x, last - y, 0),
+    }[normal]
+    return tuple(2 * coordinate - last for coordinate in cubelet)
+
+
+class Stickers:
+    """A class locating every sticker of an nth degree cube in 3D, computed once per n by stickers().
+
+    Attributes:
+        positions (list): The (position, normal vector) of each sticker, in the order of the one-line string.
+        index (dict): The index of each (position, normal vector).
+        layers (dict): For each (axis, coordinate), the index of every sticker of a cubelet in that layer.
+    """
+
+    def __init__(self, n: int):
+        self.positions = [
+            (_position(n, normal, i // n, i % n), NORMALS[normal]) for normal in FACES.keys() for i in range(n**2)
+        ]
+        self.index = {sticker: index for index, sticker in enumerate(self.positions)}
+        self.layers: Dict[Tuple[int, int], List[int]] = {}
+        for index, (position, _) in enumerate(self.positions):
+            for axis, coordinate in enumerate(position):
+                self.layers.setdefault((axis, coordinate), []).append(index)
+
+
+@lru_cache(maxsize=8)
+def stickers(n: int) -> Stickers:
+    """Obtain the (lazily computed and cached) sticker positions of an nth degree cube."""
+    return Stickers(n)
+
+
+def _turn(vector: Position, axis: Position) -> Position:
+    """Turn a vector a quarter about the (unit) vector axis, the direction Cube.rotate turns an uppercase face."""
+    ax, ay, az = axis
+    vx, vy, vz = vector
+    # a quarter turn about axis by the right hand rule is (axis x vector) + axis (axis . vector)
+    dot = ax * vx + ay * vy + az * vz
+    return (
+        ay * vz - az * vy + ax * dot,
+        az * vx - ax * vz + ay * dot,
+        ax * vy - ay * vx + az * dot,
+    )
+
+
+def _runs(pairs: List[Tuple[int, int]]) -> List[Run]:
+    """Compress (target, source) index pairs into (target, source) slices, each an arithmetic progression of both."""
+    pairs = sorted(pairs)
+    runs, i = [], 0
+    while i < len(pairs):
+        j = i + 1
+        if j < len(pairs):
+            target_step, source_step = pairs[j][0] - pairs[i][0], pairs[j][1] - pairs[i][1]
+            while (
+                j + 1 < len(pairs)
+                and pairs[j + 1][0] - pairs[j][0] == target_step
+                and pairs[j + 1][1] - pairs[j][1] == source_step
+            ):
+                j += 1
+            j += 1
+        else:
+            target_step = source_step = 1
+        runs.append((_slice(pairs[i][0], j - i, target_step), _slice(pairs[i][1], j - i, source_step)))
+        i = j
+    return runs
+
+
+def _slice(start: int, length: int, step: int) -> slice:
+    stop = start + length * step
+    return slice(start, stop if stop >= 0 else None, step)
+
+
+@lru_cache(maxsize=None)
+def layer_runs(n: int, normal: str, offset: int, quarters: int) -> List[Run]:
+    """Obtain the runs of a layer turn of an nth degree cube, computed once per (n, normal, offset, quarters).
+
+    Args:
+        n: The degree of the cube.
+        normal: The normal vector of the face the layer is counted from.
+        offset: The layer, 0 being the face itself.
+        quarters: The number of quarter turns in the direction of an uppercase rotation char, 1 to 3.
+
+    Returns:
+        The (target, source) slices of the turn, the stickers at source move to target.
+    """
+    located = stickers(n)
+    vector = NORMALS[normal]
+    axis = next(i for i, component in enumerate(vector) if component)
+    # positions are doubled and centered, so the face is at n - 1 along its normal and each layer 2 further in
+    coordinate = (n - 1 - 2 * offset) * vector[axis]
+    pairs = []
+    for source in located.layers[(axis, coordinate)]:
+        position, facing = located.positions[source]
+        for _ in range(quarters):
+            position, facing = _turn(position, vector), _turn(facing, vector)
+        pairs.append((located.index[(position, facing)], source))
+    return _runs(pairs)
+
+
+class NxNCube:
+    """A class representing an nth degree cube as a flat array of its 6n^2 stickers.
+
+    It accepts and produces the same one-line string representation as Cube, and its rotations turn the same way. The
+    degree must be at least 2, as a 1x1 cube only turns as a whole, which Cube doesn't do at all.
+
+    Attributes:
+        n (int): Which nth rubik's cube is represented. e.g. if n = 3 then one side of the cube is a 3x3 square.
+
+    Args:
+        cube_str: The one-line string representation of the cube.
+    """
+
+    def __init__(self, cube_str: str):
+        self.n = isqrt(len(cube_str) // 6)
+        if 6 * self.n**2 != len(cube_str) or self.n < 2:
+            raise ValueError("The cube must have 6 * n^2 stickers, with n at least 2")
+        self._stickers = bytearray(cube_str.encode("ascii"))
+
+    def __str__(self) -> str:
+        """The one-line string representation of the cube."""
+        return self._stickers.decode("ascii")
+
+    def rotate(self, face: str, offset: int = 0, rotations: int = 1) -> str:
+        """Rotate a layer of the cube given the face you're looking at, an offset from that face, and # of rotations.
+
+        Offsets between 0 and n - 1 are slice moves, e.g. the middle layer of an odd cube is at offset n // 2.
+        """
+        if not ROTATIONS.get(face.lower()):
+            raise ValueError("The face specified for rotation is not present in " + str(list(ROTATIONS.keys())))
+        if offset < 0 or offset >= self.n:
+            raise ValueError(f"The offset specified must be between 0 <= offset < {self.n}")
+        if rotations < 0:
+            raise ValueError("The number of rotations specified must be greater than 0")
+
+        quarters = (rotations if face.isupper() else -rotations) % 4
+        if quarters:
+            runs = layer_runs(self.n, ROTATIONS[face.lower()]["normal"], offset, quarters)
+            # read every source before writing any target, as the runs of a turn overlap
+            values = [self._stickers[source] for _, source in runs]
+            for (target, _), value in zip(runs, values):
+                self._stickers[target] = value
+        return f"{offset if offset != 0 else ''}{face}" * rotations
+
+    def rotate_wide(self, face: str, depth: int = 2, rotations: int = 1) -> str:
+        """Rotate the outer depth layers of the cube together, a wide move. A depth of n rotates the whole cube."""
+        if depth < 1 or depth > self.n:
+            raise ValueError(f"The depth specified must be between 1 <= depth <= {self.n}")
+        return "".join(self.rotate(face, offset, rotations) for offset in range(depth))
+
+    def rotate_sequence(self, rotations: str) -> str:
+        """Rotate the cube by a string of rotations, each a rotation char with an optional offset, e.g. "F2Rr"."""
+        tokens = TOKEN.findall(rotations)
+        if "".join(offset + face for offset, face in tokens) != rotations:
+            raise ValueError("The faces specified for rotation are not present in " + str(list(ROTATIONS.keys())))
+        return "".join(self.rotate(face, int(offset or 0)) for offset, face in tokens)
+
+    def scramble(self, rotations: int = 20):
+        """Scramble the cube randomly given a number of random rotations, the same moves as Cube.scramble."""
+        chars = list(ROTATIONS.keys())
+        for _ in range(rotations):
+            self.rotate(random.choice(chars), offset=random.randint(0, self.n // 2 - 1), rotations=random.randint(1, 3))
+
+    def is_solved(self) -> bool:
+        """Test if every face of the cube is a single color."""
+        size = self.n**2
+        return all(
+            self._stickers.count(self._stickers[start : start + 1], start, start + size) == size
+            for start in range(0, 6 * size, size)
+        )
@@ -0,0 +1,180 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import threading
+from typing import Callable, Iterable, List, Optional
+
+from rubik.solve import solve_many
+
+
+def warm():
+    """Initialize a worker process so its first chunk doesn't pay for imports and permutation tables."""
+    from rubik.cube import PERMUTATION_DEGREES, permutations
+
+    for n in PERMUTATION_DEGREES:
+        permutations(n)
+
+
+def preload():
+    """Build everything a solve needs up front, e.g. in a server's master process so forked workers share it."""
+    from rubik import lastlayer, twophase
+    from rubik.cache import symmetries
+
+    warm()
+    twophase.tables()
+    symmetries()
+    lastlayer.cases()
+
+
+def cpu_limit() -> int:
+    """Obtain the number of CPUs this process may use, honoring its affinity and any cgroup CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    for path, parse in (
+        ("/sys/fs/cgroup/cpu.max", lambda text: text.split()),
+        ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", lambda text: [text, _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")]),
+    ):
+        text = _read(path)
+        if text is None:
+            continue
+        quota, period = parse(text)
+        if quota not in ("max", "-1") and period:
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+        break
+    return cpus
+
+
+def memory_limit() -> Optional[int]:
+    """Obtain the bytes of memory this process may use under its cgroup, or None if it isn't limited."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        text = _read(path)
+        if text is not None:
+            # cgroup v1 reports an unlimited group as a huge page aligned number rather than "max"
+            return int(text) if text.isdigit() and int(text) < 2**60 else None
+    return None
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _solve_chunk(chunk: List[dict]) -> List[dict]:
+    """Solve a chunk of params within a worker process."""
+    return solve_many(chunk)
+
+
+class SolverPool:
+    """A pool of worker processes that solve batches of cubes in parallel.
+
+    Batches are split into chunks which are fanned out across the workers. Results are always collected in the order
+    the items were given.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        chunksize (int): The number of items sent to a worker at once. If None, it's derived from each batch's size.
+
+    Args:
+        workers: The number of worker processes. Defaults to the number of CPUs.
+        chunksize: The number of items sent to a worker at once.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunksize: Optional[int] = None):
+        if workers is not None and workers < 1:
+            raise ValueError("The number of workers must be greater than 0")
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("The chunksize must be greater than 0")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm)
+
+    def __enter__(self) -> "SolverPool":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes."""
+        self._executor.shutdown()
+
+    def solve_many(self, items: Iterable[dict]) -> List[dict]:
+        """Solve a batch of cubes across the workers, returning each item's result in order."""
+        items = list(items)
+        if not items:
+            return []
+
+        # aim for a few chunks per worker so that a slow chunk doesn't leave the other workers idle
+        chunksize = self.chunksize or max(1, -(-len(items) // (self.workers * 4)))
+        chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+        return [result for results in self._executor.map(_solve_chunk, chunks) for result in results]
+
+
+class Saturated(Exception):
+    """Raised when a BoundedExecutor already has as much work as it's allowed to queue."""
+
+
+class BoundedExecutor:
+    """An executor that rejects work rather than queueing it without bound.
+
+    Attributes:
+        workers (int): The number of calls run at once.
+        queue_depth (int): The number of calls allowed to wait for a worker.
+        pending (int): The number of calls running or waiting.
+
+    Args:
+        executor: The executor the calls are run by, shut down along with the BoundedExecutor.
+        workers: The number of workers of the executor.
+        queue_depth: The number of calls allowed to wait for a worker. Defaults to 4 per worker.
+    """
+
+    def __init__(self, executor: Executor, workers: int, queue_depth: Optional[int] = None):
+        if queue_depth is not None and queue_depth < 0:
+            raise ValueError("The queue depth must not be negative")
+
+        self.workers = workers
+        self.queue_depth = queue_depth if queue_depth is not None else workers * 4
+        self.pending = 0
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BoundedExecutor":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Shut down the executor."""
+        self._executor.shutdown()
+
+    def submit(self, function: Callable, *args) -> Future:
+        """Schedule function(*args), raising Saturated if the workers and queue are full."""
+        with self._lock:
+            if self.pending >= self.workers + self.queue_depth:
+                raise Saturated(f"{self.pending} calls are already pending")
+            self.pending += 1
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._done()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _=None):
+        with self._lock:
+            self.pending -= 1
+
+
+def bounded_executor(workers: int = 1, queue_depth: Optional[int] = None) -> BoundedExecutor:
+    """Obtain a BoundedExecutor of warm worker processes, or of a single worker thread if workers is 1."""
+    if workers < 1:
+        raise ValueError("The number of workers must be greater than 0")
+    executor = ProcessPoolExecutor(workers, initializer=warm) if workers > 1 else ThreadPoolExecutor(1)
+    return BoundedExecutor(executor, workers, queue_depth)
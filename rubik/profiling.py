@@ -0,0 +1,141 @@
+"""
+Per-stage profiling of the solver.
+
+Solver stages are marked with the @stage decorator. While a Timings is entered (as a context manager) on the current
+thread, each stage records the wall time, number of rotate() calls and moves it emitted, excluding those of the stages
+it calls itself. Otherwise a stage costs a single thread local lookup.
+
+    with profile() as timings:
+        cube.solve()
+    timings.to_dict()
+"""
+from functools import wraps
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+_LOCAL = threading.local()
+
+
+class StageTiming:
+    """A class representing what was spent in one stage of the solver, summed over every call of the stage.
+
+    Attributes:
+        calls (int): The number of times the stage was called.
+        seconds (float): The wall time spent in the stage.
+        rotations (int): The number of rotate() calls made by the stage.
+        moves (int): The number of moves in the solution emitted by the stage.
+    """
+
+    def __init__(self):
+        self.calls = self.rotations = self.moves = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "ms": round(self.seconds * 1000, 3),
+            "rotations": self.rotations,
+            "moves": self.moves,
+        }
+
+
+class Timings:
+    """A context manager which records the stages of every solve on the current thread while it's entered.
+
+    Args:
+        callback: Called as callback(stage, seconds, rotations, moves) each time a stage returns.
+
+    Attributes:
+        stages (dict): The StageTiming of each stage by name, in the order they first returned.
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, float, int, int], Any]] = None):
+        self.callback = callback
+        self.stages: Dict[str, StageTiming] = {}
+        self._frames: List[list] = []
+        self._rotations = 0
+        self._previous: Optional[Timings] = None
+
+    def __enter__(self) -> "Timings":
+        self._previous = getattr(_LOCAL, "timings", None)
+        _LOCAL.timings = self
+        return self
+
+    def __exit__(self, *_):
+        _LOCAL.timings = self._previous
+        self._previous = None
+
+    def to_dict(self) -> dict:
+        """Obtain the stages and their totals."""
+        return {
+            "ms": round(sum(timing.seconds for timing in self.stages.values()) * 1000, 3),
+            "stages": {name: timing.to_dict() for name, timing in self.stages.items()},
+        }
+
+    def _run(self, name: str, method: Callable, cube, args: tuple, kwargs: dict):
+        """Call a stage of the cube, recording it."""
+        outer = not self._frames
+        if outer:
+            previous = cube.__dict__.get("rotate")
+            rotate = cube.rotate
+
+            def counted(*rotate_args, **rotate_kwargs):
+                self._rotations += 1
+                return rotate(*rotate_args, **rotate_kwargs)
+
+            cube.rotate = counted
+
+        frame = [0.0, 0, 0]  # the seconds, rotations and moves of the stages called by this stage
+        self._frames.append(frame)
+        rotations = self._rotations
+        start = time.perf_counter()
+        try:
+            result = method(cube, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            self._frames.pop()
+            if outer and previous is None:
+                del cube.rotate
+            elif outer:
+                cube.rotate = previous
+        rotations = self._rotations - rotations
+        moves = len(result) if isinstance(result, str) else 0
+        if self._frames:
+            parent = self._frames[-1]
+            parent[0] += seconds
+            parent[1] += rotations
+            parent[2] += moves
+        self._record(name, seconds - frame[0], rotations - frame[1], moves - frame[2])
+        return result
+
+    def _record(self, name: str, seconds: float, rotations: int, moves: int):
+        timing = self.stages.get(name)
+        if timing is None:
+            timing = self.stages[name] = StageTiming()
+        timing.calls += 1
+        timing.seconds += seconds
+        timing.rotations += rotations
+        timing.moves += moves
+        if self.callback is not None:
+            self.callback(name, seconds, rotations, moves)
+
+
+def profile(callback: Optional[Callable[[str, float, int, int], Any]] = None) -> Timings:
+    """Obtain a Timings to record the stages of the solves made while it's entered."""
+    return Timings(callback)
+
+
+def stage(method: Callable) -> Callable:
+    """Mark a method of a cube as a stage of the solver, named after the method without its leading underscore."""
+    name = method.__name__.lstrip("_")
+
+    @wraps(method)
+    def wrapper(cube, *args, **kwargs):
+        timings = getattr(_LOCAL, "timings", None)
+        if timings is None:
+            return method(cube, *args, **kwargs)
+        return timings._run(name, method, cube, args, kwargs)
+
+    return wrapper
@@ -0,0 +1,159 @@
+"""
+Renders the microservice's results as HTTP response bodies, shared by the Flask app and the ASGI app.
+
+Results are encoded as JSON with orjson when it's installed (pip install rubik[fast]), falling back to the standard
+library with the same compact output, so a response's bytes (and its ETag) don't depend on which encoder served it.
+Large bodies are compressed with brotli (when installed) or gzip if the client accepts it.
+"""
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from rubik.cache import cacheable, response_key, ResponseCache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+"""
+Bodies smaller than RUBIK_COMPRESS_MIN_BYTES are sent uncompressed, as compressing them saves less than it costs.
+"""
+COMPRESS_MIN_BYTES = int(os.getenv("RUBIK_COMPRESS_MIN_BYTES", "1024"))
+
+JSON = "application/json"
+JSONL = "application/x-ndjson"
+
+
+def dumps(value: object) -> bytes:
+    """Encode value as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_lines(values: Iterable[object]) -> bytes:
+    """Encode each value as a line of JSONL."""
+    return b"".join(dumps(value) + b"\n" for value in values)
+
+
+def _accepts(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into the quality of each coding."""
+    codings = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [token.strip() for token in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            codings[coding.lower()] = quality
+    return codings
+
+
+def coding(body: bytes, accept_encoding: str) -> Optional[str]:
+    """The best coding the client accepts to compress body with, or None if it isn't large enough to be worth it."""
+    if len(body) < COMPRESS_MIN_BYTES:
+        return None
+    accepted = _accepts(accept_encoding)
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def quality(encoding: str) -> float:
+        return accepted.get(encoding, accepted.get("*", 0))
+
+    # the client's most preferred coding, brotli winning a tie as it compresses JSON smaller
+    encoding = max(available, key=lambda encoding: (quality(encoding), encoding == "br"))
+    return encoding if quality(encoding) > 0 else None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Compress body with a coding from coding(), or return it as is if the coding is None."""
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+
+def etag(body: bytes, encoding: Optional[str] = None) -> str:
+    """A strong ETag of a body, each coding being a different representation with a different tag."""
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def _matches(if_none_match: str, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate in (tag, "W/" + tag) for candidate in candidates)
+
+
+def render(
+    body: bytes, content_type: str = JSON, request_headers: Optional[Mapping[str, str]] = None, tagged: bool = False
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Render an encoded body as an HTTP response.
+
+    Args:
+        body: The encoded body, e.g. from dumps().
+        content_type: The Content-Type of the body.
+        request_headers: The request's headers, looked up by lower case name.
+        tagged: If the response is given an ETag, answering 304 Not Modified if the client already has it.
+
+    Returns:
+        The status, headers and (possibly compressed) body of the response.
+    """
+    request_headers = request_headers or {}
+    headers = {"Content-Type": content_type, "Vary": "Accept-Encoding"}
+    encoding = coding(body, request_headers.get("accept-encoding", ""))
+    if tagged:
+        headers["ETag"] = etag(body, encoding)
+        if _matches(request_headers.get("if-none-match", ""), headers["ETag"]):
+            return 304, headers, b""
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return 200, headers, compress(body, encoding)
+
+
+def render_cached(
+    params: dict, request_headers: Optional[Mapping[str, str]] = None, cache: Optional[ResponseCache] = None
+) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+    """Render the cached response to params, or None if it isn't cached and params have to be dispatched."""
+    cached = cache.get(response_key(params)) if cache is not None else None
+    if cached is None:
+        return None
+    body, tier = cached
+    status, headers, body = render(body, JSON, request_headers, tagged=True)
+    headers["Cache-Control"] = f"max-age={int(cache.ttl)}"
+    headers["Cache-Status"] = "rubik; hit" if tier == "memory" else f"rubik; hit; detail={tier}"
+    return status, headers, body
+
+
+def render_result(
+    params: dict,
+    result: dict,
+    request_headers: Optional[Mapping[str, str]] = None,
+    cache: Optional[ResponseCache] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Render the result of dispatching params, tagged and stored in the cache if it only depends on params."""
+    body = dumps(result)
+    tagged = cacheable(params, result)
+    status, headers, rendered = render(body, JSON, request_headers, tagged)
+    if cache is not None:
+        if tagged and cache.maxsize:
+            cache.put(response_key(params), body)
+            headers["Cache-Control"] = f"max-age={int(cache.ttl)}"
+            headers["Cache-Status"] = "rubik; fwd=miss; stored"
+        else:
+            headers["Cache-Status"] = "rubik; fwd=bypass"
+    return status, headers, rendered
@@ -0,0 +1,11 @@
+from rubik.cube import simplify_rotations
+from rubik.solve import check_rotations
+
+
+def simplify(params: dict) -> dict:
+    rotations = params.get("rotate")
+    if rotations is None:
+        result = {"status": "error: rotate must be present"}
+    elif (result := check_rotations(rotations)).get("status") == "ok":
+        result = {"status": "ok", "rotate": simplify_rotations(rotations)}
+    return result
@@ -1,29 +1,93 @@
+from functools import partial
+from typing import Iterable, List, Optional
+
+from rubik.budget import Budget, BudgetExceeded
+from rubik.cache import CACHE
 from rubik.check import check
-from rubik.cube import Cube
+from rubik.cube import Cube, SOLVE_METHODS
 
 
 ALLOWED_ROTATIONS = "FfRrBbLlUuDd"
 ROTATIONS_SET = set(ALLOWED_ROTATIONS)
 
 
-def solve(params):
+def solve(params, cached: bool = True):
+    """Solve or rotate the cube in params. A solve is looked up in the CACHE unless cached is False."""
     cube_check = check(params)
     if cube_check.get("status", "") != "ok":
         return cube_check
 
     rotations = params.get("rotate")
+    method = params.get("method") or SOLVE_METHODS[0]
+    if method not in SOLVE_METHODS:
+        return {"status": f"error: method must be one of {', '.join(SOLVE_METHODS)}"}
+    timeout_ms = params.get("timeout_ms")
+    if timeout_ms is not None and timeout_ms != "":
+        if not str(timeout_ms).isdigit() or not int(timeout_ms):
+            return {"status": "error: timeout_ms must be a positive integer"}
+        timeout_ms = int(timeout_ms)
+    else:
+        timeout_ms = None
+    budget = Budget.default(timeout_ms)
+
     if not rotations:
-        result = {"status": "ok", "solution": Cube(params["cube"]).solve()}
+        try:
+            solver = partial(_solve, budget=budget)
+            solution = CACHE.solve(params["cube"], method, solver) if cached else solver(params["cube"], method)
+            result = {"status": "ok", "solution": solution}
+        except ValueError:
+            result = {"status": "error: cube must be solvable"}
+        except BudgetExceeded:
+            result = {"status": "error: solve exceeded its work budget"}
+    elif (result := check_rotations(rotations)).get("status") == "ok":
+        cube = Cube(params["cube"])
+        cube.rotate_sequence(rotations)
+        result = {"status": "ok", "cube": str(cube)}
+    return result
+
+
+def check_rotations(rotations) -> dict:
+    """Check if the given rotations are a valid string of rotation chars."""
+    if not isinstance(rotations, str):
+        result = {"status": "error: rotate must be given as a string"}
+    elif rotations and not rotations.isalpha():
+        result = {"status": "error: rotate must be given as a solely alphabetical string"}
+    elif not all(rotation in ROTATIONS_SET for rotation in rotations):
+        result = {"status": f"error: rotate must be comprised of characters in {ALLOWED_ROTATIONS}"}
     else:
-        if not isinstance(rotations, str):
-            result = {"status": "error: rotate must be given as a string"}
-        elif not rotations.isalpha():
-            result = {"status": "error: rotate must be given as a solely alphabetical string"}
-        elif not all(rotation in ROTATIONS_SET for rotation in rotations):
-            result = {"status": f"error: rotate must be comprised of characters in {ALLOWED_ROTATIONS}"}
-        else:
-            cube = Cube(params["cube"])
-            for rotation in rotations:
-                cube.rotate(rotation)
-            result = {"status": "ok", "cube": str(cube)}
+        result = {"status": "ok"}
     return result
+
+
+def _solve(cube_str: str, method: str, budget: Optional[Budget] = None) -> str:
+    """Obtain the solution of a cube with a method."""
+    return Cube(cube_str).solve(method, budget)
+
+
+def solve_many(items: Iterable[dict]) -> List[dict]:
+    """Solve a batch of cubes, returning each item's result in the order the items were given.
+
+    Errors are reported per item and never abort the rest of the batch. Items with an identical cube, rotate, method
+    and timeout_ms are only computed once per batch.
+    """
+    results, computed = [], {}
+    for params in items:
+        if not isinstance(params, dict):
+            results.append({"status": "error: parameter is not a dictionary"})
+            continue
+        key = (params.get("cube"), params.get("rotate"), params.get("method"), params.get("timeout_ms"))
+        if not all(value is None or isinstance(value, str) for value in key):
+            results.append(_solve_item(params))
+            continue
+        if key not in computed:
+            computed[key] = _solve_item(params)
+        results.append(dict(computed[key]))
+    return results
+
+
+def _solve_item(params: dict) -> dict:
+    """Solve one item of a batch, reporting any error as its result."""
+    try:
+        return solve(params)
+    except Exception as e:
+        return {"status": f"error: {e}"}
@@ -0,0 +1,89 @@
+"""
+Streams JSONL of dispatch params through dispatch, writing a JSONL result per line as soon as it's ready.
+
+Input is read a line at a time and at most a window of items is in flight, so memory stays bounded however long the
+input is. Results are written in the order of the input.
+
+Usage: python -m rubik.stream [--workers N] [--window N] [INPUT] [OUTPUT]
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import json
+import sys
+from typing import Iterable, Iterator, Optional, Union
+
+from rubik.dispatch import dispatch, INVALID_JSON
+from rubik.pool import warm
+
+
+def parse_lines(lines: Iterable[Union[str, bytes]]) -> Iterator[object]:
+    """Parse each non-blank line of JSONL, yielding INVALID_JSON for any line that isn't valid JSON."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield INVALID_JSON
+
+
+def dispatch_item(item: object) -> dict:
+    """Dispatch a parsed item, reporting an INVALID_JSON item or an exception raised by its op as its status."""
+    if item is INVALID_JSON:
+        return {"status": "error: item is not valid json"}
+    try:
+        return dispatch(item)
+    except Exception as e:
+        return {"status": f"error: {e}"}
+
+
+def dispatch_stream(items: Iterable[object], workers: int = 1, window: Optional[int] = None) -> Iterator[dict]:
+    """Dispatch each item of a stream, yielding the results in order as they complete.
+
+    Args:
+        items: The parsed items, e.g. from parse_lines().
+        workers: The number of worker processes, items are dispatched in this process if 1.
+        window: The maximum number of items in flight across the workers. Defaults to 4 per worker.
+    """
+    if workers <= 1:
+        yield from map(dispatch_item, items)
+        return
+
+    window = window or workers * 4
+    with ProcessPoolExecutor(workers, initializer=warm) as executor:
+        pending = deque()
+        for item in items:
+            if item is INVALID_JSON:
+                pending.append(item)
+            else:
+                pending.append(executor.submit(dispatch_item, item))
+            while pending and (len(pending) >= window or _ready(pending[0])):
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+
+
+def _ready(pending: object) -> bool:
+    return pending is INVALID_JSON or pending.done()
+
+
+def _result(pending: object) -> dict:
+    return dispatch_item(pending) if pending is INVALID_JSON else pending.result()
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(prog="python -m rubik.stream", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", nargs="?", type=argparse.FileType("r"), default=sys.stdin)
+    parser.add_argument("output", nargs="?", type=argparse.FileType("w"), default=sys.stdout)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--window", type=int, help="the maximum number of items in flight, 4 per worker by default")
+    args = parser.parse_args(argv)
+
+    for result in dispatch_stream(parse_lines(args.input), args.workers, args.window):
+        args.output.write(json.dumps(result) + "\n")
+        args.output.flush()
+
+
+if __name__ == "__main__":
+    main()
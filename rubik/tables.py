@@ -0,0 +1,145 @@
+"""
+Persistent storage of precomputed solver tables.
+
+Tables are written once to a single binary file and loaded through mmap, so every process on a machine (e.g. each
+gunicorn worker) shares the same pages rather than holding its own copy. The file starts with a header:
+
+    magic (8 bytes) | version (uint32) | crc32 of the data (uint32) | number of tables (uint32)
+
+followed by one entry per table:
+
+    name (32 bytes) | typecode (1 byte) | offset (uint64) | number of bytes (uint64)
+
+and then the table data, each table aligned to 8 bytes. Tables with the typecode "N" are nibble packed, two values per
+byte with the even index in the low nibble.
+"""
+from array import array
+import mmap
+import os
+import struct
+import tempfile
+from typing import Callable, Dict, Optional, Union
+import zlib
+
+
+MAGIC = b"RUBIKTBL"
+HEADER = struct.Struct("<8sIII")
+ENTRY = struct.Struct("<32scQQ")
+ALIGNMENT = 8
+
+"""
+The directory tables are cached in, which can be overridden with the RUBIK_TABLE_DIR environment variable.
+"""
+TABLE_DIR = os.getenv("RUBIK_TABLE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rubik"))
+
+Table = Union[array, bytes, bytearray, memoryview]
+
+
+def pack_nibbles(values: Union[bytes, bytearray]) -> bytes:
+    """Pack a table of values below 16 into half as many bytes."""
+    if values and max(values) > 0xF:
+        raise ValueError("Every value of a nibble packed table must be less than 16")
+    low, high = values[::2], values[1::2]
+    if len(high) < len(low):
+        high += b"\x00"
+    return bytes(a | b << 4 for a, b in zip(low, high))
+
+
+def nibble(table: Table, index: int) -> int:
+    """Obtain a value of a nibble packed table."""
+    return (table[index >> 1] >> ((index & 1) << 2)) & 0xF
+
+
+def save(path: str, version: int, tables: Dict[str, Table], nibbles: tuple = ()):
+    """Write tables to a file. The file is replaced atomically, so concurrent readers never see a partial file.
+
+    Args:
+        path: The path of the file.
+        version: The version of the tables, a file with any other version is never loaded.
+        tables: The tables to write by name, either arrays of a typecode or bytes.
+        nibbles: The names of the tables which are bytes of values below 16 that should be nibble packed.
+    """
+    entries, data = [], bytearray()
+    for name, table in tables.items():
+        if name in nibbles:
+            typecode, payload = "N", pack_nibbles(table)
+        elif isinstance(table, array):
+            typecode, payload = table.typecode, table.tobytes()
+        else:
+            typecode, payload = "B", bytes(table)
+        data += b"\x00" * (-len(data) % ALIGNMENT)
+        entries.append((name.encode(), typecode.encode(), len(data), len(payload)))
+        data += payload
+
+    start = HEADER.size + ENTRY.size * len(entries)
+    start += -start % ALIGNMENT
+    header = HEADER.pack(MAGIC, version, zlib.crc32(data), len(entries))
+    header += b"".join(ENTRY.pack(name, typecode, start + offset, size) for name, typecode, offset, size in entries)
+    header += b"\x00" * (start - len(header))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(header)
+            file.write(data)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load(path: str, version: int) -> Optional[Dict[str, memoryview]]:
+    """Map tables from a file into memory.
+
+    Returns:
+        The tables by name, or None if the file is missing, corrupt, or of another version. Arrays are returned as
+        memoryviews cast to their typecode, nibble packed tables as memoryviews of their bytes (see nibble()).
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    if len(view) < HEADER.size:
+        return None
+    magic, file_version, checksum, count = HEADER.unpack_from(view)
+    if magic != MAGIC or file_version != version or len(view) < HEADER.size + ENTRY.size * count:
+        return None
+
+    entries = [ENTRY.unpack_from(view, HEADER.size + ENTRY.size * i) for i in range(count)]
+    start = min((offset for _, _, offset, _ in entries), default=len(view))
+    if zlib.crc32(view[start:]) != checksum:
+        return None
+
+    tables = {}
+    for name, typecode, offset, size in entries:
+        table = view[offset : offset + size]
+        typecode = typecode.decode()
+        tables[name.rstrip(b"\x00").decode()] = table if typecode in ("B", "N") else table.cast(typecode)
+    return tables
+
+
+def cached(name: str, version: int, build: Callable[[], Dict[str, Table]], nibbles: tuple = ()) -> Dict[str, Table]:
+    """Obtain tables from the table cache, building and storing them first if they're missing or outdated.
+
+    If the cache can't be written, the freshly built tables are returned from memory instead, packed the same way as
+    they would have been loaded.
+    """
+    path = os.path.join(TABLE_DIR, f"{name}.tbl")
+    tables = load(path, version)
+    if tables is not None:
+        return tables
+
+    built = build()
+    try:
+        save(path, version, built, nibbles)
+        tables = load(path, version)
+    except OSError:
+        tables = None
+    if tables is None:
+        tables = {key: pack_nibbles(table) if key in nibbles else table for key, table in built.items()}
+    return tables
@@ -0,0 +1,315 @@
+"""
+An implementation of Kociemba's two-phase algorithm for 3x3 cubes.
+
+Phase 1 searches for a sequence of moves that orients every corner and edge and places the four middle slice edges in
+the middle slice. Phase 2 then solves the cube using only moves that keep those properties: quarter and half turns of
+the up and down faces plus half turns of the side faces. Both searches are iterative deepening searches guided by
+pruning tables of the minimum number of moves needed to solve a pair of coordinates.
+
+The cubies are derived from the same sticker permutations as Cube, so the facelet layout and rotation directions always
+agree with Cube.rotate.
+"""
+from array import array
+from itertools import permutations
+from operator import add
+import threading
+from typing import Dict, List, Optional, Union
+import zlib
+
+from rubik.budget import Budget
+from rubik.cube import Cube, FACES
+from rubik.cubie import CubieCube, SLICE_COMBINATIONS, SLICE_INDEX, SLICE_SOLVED, to_cubie
+from rubik.tables import cached, nibble, Table
+
+
+"""
+The 18 moves of the search, indexed as 3 * face + (quarter turns - 1) with the faces in the order of FACES.
+"""
+MOVE_FACES = [face["rotation"].upper() for face in FACES.values()]
+MOVES = [(face, power) for face in range(len(MOVE_FACES)) for power in (1, 2, 3)]
+
+"""
+The moves allowed in phase 2, i.e. every up and down turn and half turns of the side faces.
+"""
+UP, DOWN = list(FACES.keys()).index("z_pos"), list(FACES.keys()).index("z_neg")
+PHASE2_MOVES = [m for m, (face, power) in enumerate(MOVES) if face in (UP, DOWN) or power == 2]
+N_MOVES, N_PHASE2_MOVES = len(MOVES), len(PHASE2_MOVES)
+
+"""
+The axis of each face, used to avoid searching both orders of two commuting turns.
+"""
+AXES = [{"x": 0, "y": 1, "z": 2}[normal[0]] for normal in FACES.keys()]
+
+N_TWIST = 3**7
+N_FLIP = 2**11
+N_SLICE = 495
+N_PERM = 40320
+N_SLICE_PERM = 24
+
+"""
+The search checks its budget's deadline once every BUDGET_INTERVAL + 1 nodes.
+"""
+BUDGET_INTERVAL = 0x3FF
+
+
+def _move_cubies() -> List[CubieCube]:
+    """Obtain the cubies of each of the 18 moves, derived from Cube's sticker permutations."""
+    solved = "".join(face * 9 for face in "FRBLUD")
+    result = []
+    for face, power in MOVES:
+        cube = Cube(solved)
+        cube.rotate(MOVE_FACES[face], rotations=power)
+        result.append(to_cubie(str(cube)))
+    return result
+
+
+MOVE_CUBIES = _move_cubies()
+
+
+"""
+The version of the tables' layout. The tables cached on disk are rebuilt whenever it or the moves change.
+"""
+TABLES_VERSION = 1
+PRUNING_TABLES = ("twist_prune", "flip_prune", "corners_prune", "ud_edges_prune")
+
+
+def _build_tables() -> Dict[str, Union[array, bytearray]]:
+    """Build the move and pruning tables of the two-phase algorithm.
+
+    Move tables are flat arrays indexed by coordinate * moves + move. Pruning tables are indexed by
+    coordinate * size of the second coordinate + second coordinate and hold the minimum number of moves to phase end.
+    """
+    result = {
+        "twist_move": _orientation_table(N_TWIST, 3, 8, "co", "cp", lambda c: CubieCube(co=c).twist()),
+        "flip_move": _orientation_table(N_FLIP, 2, 12, "eo", "ep", lambda c: CubieCube(eo=c).flip()),
+        "slice_move": _slice_table(),
+    }
+
+    phase2 = [MOVE_CUBIES[m] for m in PHASE2_MOVES]
+    perms8, perms4 = list(permutations(range(8))), list(permutations(range(4)))
+    rank8, rank4 = {perm: i for i, perm in enumerate(perms8)}, {perm: i for i, perm in enumerate(perms4)}
+    result["corners_move"] = array("H", (rank8[tuple(perm[i] for i in move.cp)] for perm in perms8 for move in phase2))
+    result["ud_edges_move"] = array(
+        "H", (rank8[tuple(perm[i] for i in move.ep[:8])] for perm in perms8 for move in phase2)
+    )
+    result["slice_edges_move"] = array(
+        "H", (rank4[tuple(perm[i - 8] for i in move.ep[8:])] for perm in perms4 for move in phase2)
+    )
+
+    twist, flip, slice_, slice_edges = (
+        result["twist_move"],
+        result["flip_move"],
+        result["slice_move"],
+        result["slice_edges_move"],
+    )
+    result["twist_prune"] = _prune(twist, slice_, N_TWIST, N_SLICE, N_MOVES, SLICE_SOLVED)
+    result["flip_prune"] = _prune(flip, slice_, N_FLIP, N_SLICE, N_MOVES, SLICE_SOLVED)
+    result["corners_prune"] = _prune(result["corners_move"], slice_edges, N_PERM, N_SLICE_PERM, N_PHASE2_MOVES, 0)
+    result["ud_edges_prune"] = _prune(result["ud_edges_move"], slice_edges, N_PERM, N_SLICE_PERM, N_PHASE2_MOVES, 0)
+    return result
+
+
+def _orientation_table(size: int, base: int, pieces: int, orientation: str, permutation: str, encode) -> array:
+    """Build the move table of an orientation coordinate."""
+    result = array("H", bytes(2 * size * N_MOVES))
+    for coordinate in range(size):
+        values, remaining = [0] * pieces, coordinate
+        for i in range(pieces - 2, -1, -1):
+            remaining, values[i] = divmod(remaining, base)
+        values[-1] = -sum(values) % base
+        for m, move in enumerate(MOVE_CUBIES):
+            moved_perm, moved_orientation = getattr(move, permutation), getattr(move, orientation)
+            result[coordinate * N_MOVES + m] = encode(
+                [(values[moved_perm[i]] + moved_orientation[i]) % base for i in range(pieces)]
+            )
+    return result
+
+
+def _slice_table() -> array:
+    """Build the move table of the middle slice edge positions coordinate."""
+    result = array("H", bytes(2 * N_SLICE * N_MOVES))
+    for coordinate, positions in enumerate(SLICE_COMBINATIONS):
+        for m, move in enumerate(MOVE_CUBIES):
+            moved = tuple(i for i in range(12) if move.ep[i] in positions)
+            result[coordinate * N_MOVES + m] = SLICE_INDEX[moved]
+    return result
+
+
+def _prune(move_a: array, move_b: array, size_a: int, size_b: int, moves: int, solved_b: int) -> bytearray:
+    """Build a pruning table over two coordinates with a breadth first search from the solved state."""
+    scaled_a = [value * size_b for value in move_a]
+    table = bytearray(b"\xff") * (size_a * size_b)
+    table[solved_b] = 0
+    frontier, depth = [solved_b], 0
+    while frontier:
+        depth += 1
+        found = []
+        for index in frontier:
+            a, b = divmod(index, size_b)
+            a, b = a * moves, b * moves
+            for j in map(add, scaled_a[a : a + moves], move_b[b : b + moves]):
+                if table[j] == 0xFF:
+                    table[j] = depth
+                    found.append(j)
+        frontier = found
+    return table
+
+
+class Tables:
+    """A class holding the move and pruning tables of the two-phase algorithm, see _build_tables().
+
+    The pruning tables are nibble packed, see rubik.tables.nibble().
+    """
+
+    def __init__(self, tables: Dict[str, Table]):
+        for name, table in tables.items():
+            setattr(self, name, table)
+
+
+_TABLES: Optional[Tables] = None
+_TABLES_LOCK = threading.Lock()
+
+
+def tables() -> Tables:
+    """Obtain the move and pruning tables, loading them from the table cache (or building them) on first use."""
+    global _TABLES
+    if _TABLES is None:
+        with _TABLES_LOCK:
+            # another thread may have loaded the tables while this one waited for the lock
+            if _TABLES is None:
+                moves = repr([(cubie.cp, cubie.co, cubie.ep, cubie.eo) for cubie in MOVE_CUBIES])
+                version = zlib.crc32(f"{TABLES_VERSION}:{moves}".encode())
+                _TABLES = Tables(cached("twophase", version, _build_tables, PRUNING_TABLES))
+    return _TABLES
+
+
+class _Search:
+    """The state of a single two-phase search."""
+
+    def __init__(self, cubie: CubieCube, max_length: int, budget: Optional[Budget] = None):
+        self.cubie = cubie
+        self.max_length = max_length
+        self.budget = budget
+        if budget is not None:
+            # a cold start builds (or loads) the tables, which isn't work the solve should be charged for
+            with budget.paused():
+                self.tables = tables()
+        else:
+            self.tables = tables()
+        self.moves: List[int] = []
+        self.nodes = 0
+
+    def run(self) -> Optional[List[int]]:
+        t = self.tables
+        twist, flip, slice_ = self.cubie.twist(), self.cubie.flip(), self.cubie.slice()
+        start = max(nibble(t.twist_prune, twist * N_SLICE + slice_), nibble(t.flip_prune, flip * N_SLICE + slice_))
+        for depth in range(start, self.max_length + 1):
+            if self._phase1(twist, flip, slice_, depth):
+                return self.moves
+        return None
+
+    def _phase1(self, twist: int, flip: int, slice_: int, togo: int) -> bool:
+        t = self.tables
+        if togo == 0:
+            if self.moves and self.moves[-1] in PHASE2_MOVES:
+                return False  # a shorter phase 1 solution has already been tried
+            return self._start_phase2()
+
+        self.nodes += 1
+        if self.budget is not None and not self.nodes & BUDGET_INTERVAL:
+            self.budget.check()
+
+        last = self.moves[-1] // 3 if self.moves else None
+        for m in range(N_MOVES):
+            face = m // 3
+            if last is not None and (face == last or (AXES[face] == AXES[last] and face < last)):
+                continue
+            moved_twist = t.twist_move[twist * N_MOVES + m]
+            moved_flip = t.flip_move[flip * N_MOVES + m]
+            moved_slice = t.slice_move[slice_ * N_MOVES + m]
+            # the pruning tables are nibble packed, see rubik.tables.nibble()
+            i, j = moved_twist * N_SLICE + moved_slice, moved_flip * N_SLICE + moved_slice
+            distance = max(
+                (t.twist_prune[i >> 1] >> ((i & 1) << 2)) & 0xF, (t.flip_prune[j >> 1] >> ((j & 1) << 2)) & 0xF
+            )
+            if distance >= togo:
+                continue
+            self.moves.append(m)
+            if self._phase1(moved_twist, moved_flip, moved_slice, togo - 1):
+                return True
+            self.moves.pop()
+        return False
+
+    def _start_phase2(self) -> bool:
+        t = self.tables
+        cubie = self.cubie
+        for m in self.moves:
+            cubie = cubie.multiply(MOVE_CUBIES[m])
+        corners, ud_edges, slice_edges = cubie.corners(), cubie.ud_edges(), cubie.slice_edges()
+        start = max(
+            nibble(t.corners_prune, corners * N_SLICE_PERM + slice_edges),
+            nibble(t.ud_edges_prune, ud_edges * N_SLICE_PERM + slice_edges),
+        )
+        phase1_length = len(self.moves)
+        for depth in range(start, self.max_length - phase1_length + 1):
+            if self._phase2(corners, ud_edges, slice_edges, depth):
+                return True
+        return False
+
+    def _phase2(self, corners: int, ud_edges: int, slice_edges: int, togo: int) -> bool:
+        t = self.tables
+        if togo == 0:
+            return corners == 0 and ud_edges == 0 and slice_edges == 0
+
+        self.nodes += 1
+        if self.budget is not None and not self.nodes & BUDGET_INTERVAL:
+            self.budget.check()
+
+        last = self.moves[-1] // 3 if self.moves else None
+        for i, m in enumerate(PHASE2_MOVES):
+            face = m // 3
+            if last is not None and (face == last or (AXES[face] == AXES[last] and face < last)):
+                continue
+            moved_corners = t.corners_move[corners * N_PHASE2_MOVES + i]
+            moved_ud_edges = t.ud_edges_move[ud_edges * N_PHASE2_MOVES + i]
+            moved_slice_edges = t.slice_edges_move[slice_edges * N_PHASE2_MOVES + i]
+            # the pruning tables are nibble packed, see rubik.tables.nibble()
+            j, k = moved_corners * N_SLICE_PERM + moved_slice_edges, moved_ud_edges * N_SLICE_PERM + moved_slice_edges
+            distance = max(
+                (t.corners_prune[j >> 1] >> ((j & 1) << 2)) & 0xF, (t.ud_edges_prune[k >> 1] >> ((k & 1) << 2)) & 0xF
+            )
+            if distance >= togo:
+                continue
+            self.moves.append(m)
+            if self._phase2(moved_corners, moved_ud_edges, moved_slice_edges, togo - 1):
+                return True
+            self.moves.pop()
+        return False
+
+
+def solve(cube_str: str, max_length: int = 24, budget: Optional[Budget] = None) -> str:
+    """Obtain a solution of at most max_length face turns (half turns counting as one) for a 3x3 cube.
+
+    Args:
+        cube_str: The one-line string representation of the cube.
+        max_length: The maximum number of face turns in the solution.
+        budget: The budget whose deadline the search is bound by, unlimited if None.
+
+    Returns:
+        The solution in rotation chars, where half turns are written as two quarter turns.
+
+    Raises:
+        ValueError: If the cube isn't solvable.
+        BudgetExceeded: If the search passes the budget's deadline.
+    """
+    cubie = to_cubie(cube_str)
+    if cubie is None or not cubie.is_solvable():
+        raise ValueError("The cube is not solvable")
+
+    moves = _Search(cubie, max_length, budget).run()
+    if moves is None:
+        raise ValueError(f"No solution of at most {max_length} moves was found")
+    result = ""
+    for face, power in (MOVES[m] for m in moves):
+        result += MOVE_FACES[face] * power if power != 3 else MOVE_FACES[face].lower()
+    return result
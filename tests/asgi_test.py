@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import json
+import os
+import tempfile
+import threading
+from unittest import mock, TestCase
+
+import asgi
+from rubik.cache import ResponseCache
+from rubik.pool import BoundedExecutor
+
+
+def request(
+    method: str, path: str, query: str = "", body: bytes = b"", chunks: tuple = (), headers: dict = None
+) -> dict:
+    """Send a request through the ASGI app, returning its status, headers and body. The body may be sent as chunks."""
+    response = {"body": b""}
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": body, "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"], response["headers"] = message["status"], dict(message["headers"])
+        else:
+            response["body"] += message["body"]
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode()}
+    scope["headers"] = [(name.encode(), value.encode()) for name, value in (headers or {}).items()]
+    asyncio.run(asgi.app(scope, receive, send))
+    return response
+
+
+class AsgiTest(TestCase):
+    def setUp(self):
+        asgi.RESPONSE_CACHE.clear()
+
+    def test_info(self):
+        response = request("GET", "/rubik", "op=info")
+        self.assertEqual(200, response["status"])
+        self.assertEqual(b"application/json", response["headers"][b"content-type"])
+        self.assertEqual({"status": "wah0028"}, json.loads(response["body"]))
+        self.assertEqual(b"rubik; fwd=miss; stored", response["headers"][b"cache-status"])
+
+    def test_solve(self):
+        query = "op=solve&cube=gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy&rotate=F"
+        response = request("GET", "/rubik", query)
+        self.assertEqual(200, response["status"])
+        cube = "gggggggggwrrwrrwrrbbbbbbbbbooyooyooywwwwwwooorrryyyyyy"
+        self.assertEqual({"status": "ok", "cube": cube}, json.loads(response["body"]))
+
+    def test_solve_etag(self):
+        query = "op=solve&cube=gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy&rotate=F"
+        tag = request("GET", "/rubik", query)["headers"][b"etag"].decode()
+        self.assertEqual(tag, request("GET", "/rubik", query)["headers"][b"etag"].decode())
+        response = request("GET", "/rubik", query, headers={"If-None-Match": tag})
+        self.assertEqual((304, b""), (response["status"], response["body"]))
+        self.assertEqual(200, request("GET", "/rubik", query + "U", headers={"If-None-Match": tag})["status"])
+
+    def test_cached(self):
+        query = "op=solve&cube=gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy&rotate=F"
+        first = request("GET", "/rubik", query)
+        with mock.patch.object(asgi, "dispatch", side_effect=AssertionError("dispatched a cached request")):
+            second = request("GET", "/rubik", query + "&method=&unused=1")
+        self.assertEqual(first["body"], second["body"])
+        self.assertEqual(b"rubik; hit", second["headers"][b"cache-status"])
+        self.assertEqual(b"rubik; fwd=bypass", request("GET", "/rubik", "op=nop")["headers"][b"cache-status"])
+
+    def test_cached_disk(self):
+        query = "op=solve&cube=gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy&rotate=F"
+        threads = []
+
+        def disk(*args):
+            threads.append(threading.current_thread())
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(path=os.path.join(directory, "responses.db"))
+            with mock.patch.object(asgi, "RESPONSE_CACHE", cache), mock.patch.object(
+                cache, "_disk_get", disk
+            ), mock.patch.object(cache, "_disk_put", disk):
+                self.assertEqual(
+                    b"rubik; fwd=miss; stored", request("GET", "/rubik", query)["headers"][b"cache-status"]
+                )
+        # the database is only ever touched off the event loop's thread
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_batch(self):
+        response = request("POST", "/rubik/batch", body=b'[{"op": "info"}, {"op": "nop"}]')
+        self.assertEqual(200, response["status"])
+        self.assertEqual(
+            [{"status": "wah0028"}, {"status": "error: op is not legal"}], json.loads(response["body"].decode())
+        )
+
+    def test_batch_gzip(self):
+        body = "\n".join(['{"op": "info"}'] * 100).encode()
+        response = request("POST", "/rubik/batch", body=body, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(b"gzip", response["headers"][b"content-encoding"])
+        lines = gzip.decompress(response["body"]).decode().splitlines()
+        self.assertEqual([{"status": "wah0028"}] * 100, [json.loads(line) for line in lines])
+
+    def test_stream(self):
+        chunks = (b'{"op": "in', b'fo"}\n{"op":', b' "nop"}\nx\n')
+        response = request("POST", "/rubik/stream", body=b'"nope"', chunks=chunks)
+        self.assertEqual(200, response["status"])
+        self.assertEqual(
+            [
+                {"status": "wah0028"},
+                {"status": "error: op is not legal"},
+                {"status": "error: item is not valid json"},
+                {"status": "error: parameter is not a dictionary"},
+            ],
+            [json.loads(line) for line in response["body"].decode().splitlines()],
+        )
+
+    def test_not_found(self):
+        self.assertEqual(404, request("GET", "/nope")["status"])
+
+    def test_saturated(self):
+        release = threading.Event()
+        executor = BoundedExecutor(ThreadPoolExecutor(1), 1, queue_depth=0)
+        with mock.patch.object(asgi, "EXECUTOR", executor):
+            future = executor.submit(release.wait)
+            response = request("GET", "/rubik", "op=solve&cube=gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy")
+            self.assertEqual(503, response["status"])
+            self.assertEqual(str(asgi.RETRY_AFTER).encode(), response["headers"][b"retry-after"])
+            self.assertEqual(200, request("GET", "/rubik", "op=check")["status"])
+            release.set()
+            future.result()
+        executor.close()
@@ -0,0 +1,95 @@
+import random
+from unittest import skipIf, TestCase
+
+from rubik.batch import CubeBatch, np
+from rubik.check import check
+from rubik.cube import Cube, ROTATIONS
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+SCRAMBLED_CUBE = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+CHARS = "".join(ROTATIONS.keys()) + "".join(ROTATIONS.keys()).upper()
+
+
+@skipIf(np is None, "numpy is not installed")
+class CubeBatchTest(TestCase):
+    def test_to_strings(self):
+        cubes = [SOLVED_CUBE, SCRAMBLED_CUBE, "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy"]
+        self.assertEqual(cubes, CubeBatch(cubes).to_strings())
+
+    def test_non_ascii_colors(self):
+        # any alphanumeric color passes check, not only ascii ones
+        cube = SCRAMBLED_CUBE.translate(str.maketrans("bw", "éß"))
+        self.assertEqual("ok", check({"op": "check", "cube": cube})["status"])
+        batch = CubeBatch([cube, SOLVED_CUBE])
+        batch.rotate_sequence("FRu")
+        expected = Cube(cube)
+        expected.rotate_sequence("FRu")
+        self.assertEqual(str(expected), batch.to_strings()[0])
+
+    def test_empty(self):
+        batch = CubeBatch([])
+        self.assertEqual(0, len(batch))
+        self.assertEqual([], batch.to_strings())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            CubeBatch(["bbbb"])
+        with self.assertRaises(ValueError):
+            CubeBatch(["xbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"])
+
+    def test_rotate(self):
+        batch = CubeBatch([SOLVED_CUBE, SCRAMBLED_CUBE])
+        for rotation in "FrUbLd":
+            batch.rotate(rotation)
+        for cube_str, result in zip([SOLVED_CUBE, SCRAMBLED_CUBE], batch.to_strings()):
+            cube = Cube(cube_str)
+            cube.rotate_sequence("FrUbLd")
+            self.assertEqual(str(cube), result)
+
+    def test_rotate_invalid(self):
+        batch = CubeBatch([SOLVED_CUBE])
+        with self.assertRaises(ValueError):
+            batch.rotate("x")
+        with self.assertRaises(ValueError):
+            batch.rotate_each(["F", "F"])
+
+    def test_rotate_each(self):
+        rng = random.Random(12)
+        cubes = [SOLVED_CUBE] * 20 + [SCRAMBLED_CUBE] * 20
+        batch = CubeBatch(cubes)
+        expected = [Cube(cube_str) for cube_str in cubes]
+        for _ in range(10):
+            faces = [rng.choice(CHARS + " ").strip() for _ in cubes]
+            batch.rotate_each(faces)
+            for cube, face in zip(expected, faces):
+                if face:
+                    cube.rotate(face)
+        self.assertEqual([str(cube) for cube in expected], batch.to_strings())
+
+    def test_rotate_sequence(self):
+        rotations = "DbuFFUUFFrFuBDDRBBULLDRRD"
+        batch = CubeBatch([SCRAMBLED_CUBE, SOLVED_CUBE])
+        batch.rotate_sequence(rotations)
+        cube = Cube(SOLVED_CUBE)
+        cube.rotate_sequence(rotations)
+        self.assertEqual(["ooooooooobbbbbbbbbrrrrrrrrrgggggggggyyyyyyyyywwwwwwwww", str(cube)], batch.to_strings())
+
+    def test_is_solved(self):
+        batch = CubeBatch([SOLVED_CUBE, SCRAMBLED_CUBE])
+        self.assertEqual([True, False], batch.is_solved().tolist())
+        batch.rotate_each(["F", ""])
+        self.assertEqual([False, False], batch.is_solved().tolist())
+        batch.rotate_each(["f", ""])
+        self.assertEqual([True, False], batch.is_solved().tolist())
+
+    def test_is_adjacency_safe(self):
+        cubes = [
+            SOLVED_CUBE,
+            SCRAMBLED_CUBE,
+            "bbgbbbbbbbrrrrrrrrrggggggggoooooooooyyyyyyyyywwwwwwwww",
+            "rbbbbbbbbbrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww",
+        ]
+        expected = [Cube(cube_str).is_adjacency_safe() for cube_str in cubes]
+        self.assertEqual(expected, CubeBatch(cubes).is_adjacency_safe().tolist())
+        self.assertIn(False, expected)
@@ -0,0 +1,92 @@
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from rubik import twophase
+from rubik.budget import Budget, BudgetExceeded
+from rubik.cube import Cube
+from rubik.solve import solve
+
+
+SCRAMBLED_CUBE = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+
+
+class BudgetTest(TestCase):
+    def test_charge(self):
+        budget = Budget(max_rotations=2)
+        budget.charge()
+        budget.charge()
+        with self.assertRaises(BudgetExceeded):
+            budget.charge()
+        self.assertEqual(3, budget.rotations)
+
+    def test_deadline(self):
+        Budget().check()
+        Budget(timeout_ms=60_000).check()
+        with self.assertRaises(BudgetExceeded):
+            Budget(timeout_ms=-1).check()
+
+    def test_default(self):
+        budget = Budget.default(5)
+        self.assertIsNotNone(budget.max_rotations)
+        self.assertIsNotNone(budget.deadline)
+        self.assertLess(budget.deadline, Budget.default().deadline)
+
+    def test_solve(self):
+        budget = Budget(max_rotations=1000)
+        cube = Cube(SCRAMBLED_CUBE)
+        solution = cube.solve(budget=budget)
+        self.assertTrue(cube.is_solved())
+        self.assertGreaterEqual(budget.rotations, len(solution))
+        self.assertNotIn("rotate", cube.__dict__)
+
+    def test_solve_exceeded(self):
+        cube = Cube(SCRAMBLED_CUBE)
+        with self.assertRaises(BudgetExceeded):
+            cube.solve(budget=Budget(max_rotations=10))
+        self.assertNotIn("rotate", cube.__dict__)
+
+    def test_twophase_exceeded(self):
+        with self.assertRaises(BudgetExceeded):
+            twophase.solve(SCRAMBLED_CUBE, budget=Budget(timeout_ms=0))
+
+    def test_paused(self):
+        budget = Budget(timeout_ms=50)
+        with budget.paused():
+            time.sleep(0.1)
+        budget.check()
+
+    def test_twophase_cold_start(self):
+        loaded = twophase.tables()
+
+        def slow_cached(*args):
+            time.sleep(0.3)
+            return loaded.__dict__
+
+        cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+        cube.rotate_sequence("FRu")
+        with patch.object(twophase, "_TABLES", None), patch.object(twophase, "cached", slow_cached):
+            budget = Budget(timeout_ms=200)
+            cube.rotate_sequence(twophase.solve(str(cube), budget=budget))
+            self.assertIsNotNone(twophase._TABLES)
+        self.assertTrue(cube.is_solved())
+        # the time spent loading the tables was left out of the deadline
+        budget.check()
+
+    def test_timeout_ms(self):
+        result = solve({"op": "solve", "cube": SCRAMBLED_CUBE, "timeout_ms": "5000"})
+        self.assertEqual("ok", result.get("status"))
+
+    def test_timeout_ms_exceeded(self):
+        result = solve({"op": "solve", "cube": SCRAMBLED_CUBE, "method": "twophase", "timeout_ms": "1"})
+        self.assertEqual("error: solve exceeded its work budget", result.get("status"))
+
+    def test_long_rotate(self):
+        # a rotate is applied as a single compiled permutation, so it isn't charged to the rotation budget
+        result = solve({"op": "solve", "cube": SCRAMBLED_CUBE, "rotate": "FRBLUD" * 1000})
+        self.assertEqual("ok", result.get("status"))
+
+    def test_invalid_timeout_ms(self):
+        for timeout_ms in ("abc", "-5", "0", "1.5"):
+            result = solve({"op": "solve", "cube": SCRAMBLED_CUBE, "timeout_ms": timeout_ms})
+            self.assertEqual("error: timeout_ms must be a positive integer", result.get("status"))
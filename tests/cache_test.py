@@ -0,0 +1,179 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+from unittest import TestCase
+
+from rubik.cache import cacheable, canonical, normalize, response_key, ResponseCache, SolutionCache, symmetries
+from rubik.cube import Cube
+
+
+SCRAMBLED_CUBE = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+
+
+def solver(calls):
+    def solve(cube_str, method):
+        calls.append(cube_str)
+        return Cube(cube_str).solve(method)
+
+    return solve
+
+
+class CacheTest(TestCase):
+    def assertSolves(self, cube_str, solution):
+        cube = Cube(cube_str)
+        for rotation in solution:
+            cube.rotate(rotation)
+        self.assertTrue(cube.is_solved())
+
+    def test_normalize(self):
+        self.assertEqual(
+            "000000000111111111222222222333333333444444444555555555",
+            normalize("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"),
+        )
+        self.assertEqual(normalize(SCRAMBLED_CUBE), normalize(SCRAMBLED_CUBE.translate(str.maketrans("bro", "123"))))
+
+    def test_symmetries(self):
+        self.assertEqual(48, len(symmetries()))
+        self.assertEqual(48, len(set(symmetry.stickers for symmetry in symmetries())))
+        self.assertEqual(tuple(range(54)), symmetries()[0].stickers)
+
+    def test_symmetries_threaded(self):
+        symmetries.cache_clear()
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda _: symmetries(), range(4)))
+        self.assertEqual([48] * 4, [len(result) for result in results])
+        self.assertEqual(48, len(symmetries()))
+
+    def test_canonical(self):
+        for symmetry in symmetries():
+            self.assertEqual(canonical(SCRAMBLED_CUBE)[0], canonical(symmetry.apply(SCRAMBLED_CUBE))[0])
+        self.assertEqual(normalize(SCRAMBLED_CUBE), canonical(SCRAMBLED_CUBE, symmetry=False)[0])
+
+    def test_symmetric_hits(self):
+        calls = []
+        cache = SolutionCache(16)
+        self.assertSolves(SCRAMBLED_CUBE, cache.solve(SCRAMBLED_CUBE, "beginner", solver(calls)))
+        for symmetry in symmetries():
+            cube_str = symmetry.apply(SCRAMBLED_CUBE).translate(str.maketrans("bgr", "123"))
+            self.assertSolves(cube_str, cache.solve(cube_str, "beginner", solver(calls)))
+        self.assertEqual(1, len(calls))
+        self.assertEqual({"size": 1, "maxsize": 16, "hits": 48, "misses": 1, "evictions": 0}, cache.stats())
+
+    def test_deterministic(self):
+        symmetric = symmetries()[5].apply(SCRAMBLED_CUBE)
+        first, second = SolutionCache(16), SolutionCache(16)
+        first.solve(symmetric, "beginner", solver([]))
+        self.assertEqual(
+            first.solve(SCRAMBLED_CUBE, "beginner", solver([])), second.solve(SCRAMBLED_CUBE, "beginner", solver([]))
+        )
+
+    def test_methods_are_separate(self):
+        calls = []
+        cache = SolutionCache(16)
+        cache.solve(SCRAMBLED_CUBE, "beginner", solver(calls))
+        cache.solve(SCRAMBLED_CUBE, "twophase", solver(calls))
+        self.assertEqual(2, len(calls))
+
+    def test_eviction(self):
+        calls = []
+        cache = SolutionCache(2, symmetry=False)
+        cubes = []
+        for _ in range(3):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            cube.scramble()
+            cubes.append(str(cube))
+        for cube_str in cubes:
+            cache.solve(cube_str, "beginner", solver(calls))
+        cache.solve(cubes[0], "beginner", solver(calls))
+        self.assertEqual(4, len(calls))
+        self.assertEqual({"size": 2, "maxsize": 2, "hits": 0, "misses": 4, "evictions": 2}, cache.stats())
+
+    def test_disabled(self):
+        calls = []
+        cache = SolutionCache(0)
+        cache.solve(SCRAMBLED_CUBE, "beginner", solver(calls))
+        cache.solve(SCRAMBLED_CUBE, "beginner", solver(calls))
+        self.assertEqual(2, len(calls))
+        self.assertEqual(0, len(cache))
+
+    def test_negative_maxsize(self):
+        with self.assertRaises(ValueError):
+            SolutionCache(-1)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ResponseCacheTest(TestCase):
+    def test_response_key(self):
+        solve = {"op": "solve", "cube": SCRAMBLED_CUBE}
+        self.assertEqual(response_key(solve), response_key({**solve, "method": "", "timeout_ms": "50", "x": "1"}))
+        self.assertEqual(response_key(solve), response_key({**solve, "method": "beginner"}))
+        self.assertNotEqual(response_key(solve), response_key({**solve, "method": "twophase"}))
+        self.assertNotEqual(response_key(solve), response_key({**solve, "rotate": ""}))
+        self.assertNotEqual(response_key({"op": "check"}), response_key({"op": "check", "cube": ""}))
+        self.assertEqual(response_key({"op": "info"}), response_key({"op": "info", "cube": SCRAMBLED_CUBE}))
+        self.assertIsNone(response_key({"op": "nop"}))
+        self.assertIsNone(response_key({**solve, "debug": "timings"}))
+        self.assertIsNone(response_key(None))
+
+    def test_cacheable(self):
+        self.assertTrue(cacheable({"op": "check"}, {"status": "error: cube must be present"}))
+        self.assertFalse(cacheable({"op": "solve"}, {"status": "error: solve exceeded its work budget"}))
+
+    def test_lru(self):
+        cache = ResponseCache(maxsize=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        self.assertEqual((b"1", "memory"), cache.get("a"))
+        cache.put("c", b"3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((b"1", "memory"), cache.get("a"))
+        self.assertEqual({"hits": 2, "misses": 1, "size": 2}, {k: cache.stats()[k] for k in ("hits", "misses", "size")})
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = ResponseCache(ttl=10, clock=clock)
+        cache.put("a", b"1")
+        clock.now += 9
+        self.assertIsNotNone(cache.get("a"))
+        clock.now += 1
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
+
+    def test_disabled(self):
+        cache = ResponseCache(maxsize=0)
+        cache.put("a", b"1")
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(ResponseCache().get(None))
+        self.assertRaises(ValueError, ResponseCache, ttl=0)
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "responses.sqlite")
+            clock = Clock()
+            writer, reader = ResponseCache(path=path, ttl=10, clock=clock), ResponseCache(path=path, clock=clock)
+            writer.put("a", b"1")
+            self.assertEqual((b"1", "disk"), reader.get("a"))
+            self.assertEqual((b"1", "memory"), reader.get("a"))
+            self.assertEqual(1, reader.stats()["disk_hits"])
+
+            clock.now += 10
+            self.assertIsNone(ResponseCache(path=path, clock=clock).get("a"))
+            writer.clear()
+            self.assertIsNone(reader.get("b"))
+
+    def test_disk_trim(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(maxsize=1, path=os.path.join(directory, "responses.sqlite"), disk_maxsize=10)
+            for i in range(ResponseCache.TRIM_INTERVAL):
+                cache.put(str(i), b"x")
+            (size,) = cache._connection().execute("SELECT COUNT(*) FROM responses").fetchone()
+            self.assertEqual(10, size)
+            self.assertEqual((b"x", "disk"), cache.get(str(ResponseCache.TRIM_INTERVAL - 2)))
+            self.assertIsNone(cache.get("0"))
@@ -1,6 +1,7 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
-from rubik.check import check
+import rubik.check
+from rubik.check import check, check_many
 
 
 class CheckTest(TestCase):
@@ -60,3 +61,68 @@ class CheckTest(TestCase):
         result = check({"op": "check", "cube": "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"})
         self.assertIn("status", result)
         self.assertEqual("ok", result.get("status"))
+
+    def test_twisted_corner_cube(self):
+        result = check({"op": "check", "cube": "obbbbbbbbrrrrrrrrrgggggggggooyooooooyyyyyybyywwwwwwwww"})
+        self.assertIn("status", result)
+        self.assertEqual("error: cube corners must not be twisted", result.get("status"))
+
+    def test_flipped_edge_cube(self):
+        result = check({"op": "check", "cube": "bybbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww"})
+        self.assertIn("status", result)
+        self.assertEqual("error: cube edges must not be flipped", result.get("status"))
+
+    def test_swapped_pieces_cube(self):
+        result = check({"op": "check", "cube": "bbbbbbbbbrrrrrrrrrgggggggggoooooyoooyyyyyyyoywwwwwwwww"})
+        self.assertIn("status", result)
+        self.assertEqual("error: cube pieces must not be swapped", result.get("status"))
+
+    def test_invalid_pieces_cube(self):
+        result = check({"op": "check", "cube": "bbbbbbbbbrrrrrrrrrgggggggggoooooyoooyyyyyyoyywwwwwwwww"})
+        self.assertIn("status", result)
+        self.assertEqual("error: cube must have each corner and edge piece exactly once", result.get("status"))
+
+    def test_scrambled_cube(self):
+        result = check({"op": "check", "cube": "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"})
+        self.assertIn("status", result)
+        self.assertEqual("ok", result.get("status"))
+
+    def test_check_many(self):
+        results = check_many(
+            [
+                {"op": "check", "cube": "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"},
+                {"op": "check", "cube": 6},
+                "not a dictionary",
+                {"op": "check", "cube": "bybbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww"},
+                {"op": "check", "cube": "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"},
+            ]
+        )
+        self.assertEqual(
+            [
+                {"status": "ok"},
+                {"status": "error: cube must be given as a string"},
+                {"status": "error: parameter is not a dictionary"},
+                {"status": "error: cube edges must not be flipped"},
+                {"status": "ok"},
+            ],
+            results,
+        )
+        self.assertIsNot(results[0], results[4])
+
+    def test_check_many_pieces(self):
+        cubes = [
+            "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww",
+            "bbbbbbbbbrrrrrrgrrggggggggroooooooooyyyyyyyyywwwwwwwww",
+            "obbbbbbbbrrrrrrrrrgggggggggooyooooooyyyyyybyywwwwwwwww",
+            "bybbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww",
+            "bbbbbbbbbrrrrrrrrrgggggggggoooooyoooyyyyyyyoywwwwwwwww",
+            "bbbbbbbbbrrrrrrrrrgggggggggoooooyoooyyyyyyoyywwwwwwwww",
+            "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw",
+            # the same scramble relabeled, which checks the same as it
+            "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw".translate(str.maketrans("bryw", "ywbr")),
+        ]
+        items = [{"op": "check", "cube": cube} for cube in cubes * 2]
+        expected = [check(dict(params)) for params in items]
+        self.assertEqual(expected, check_many([dict(params) for params in items]))
+        with mock.patch.object(rubik.check, "np", None):
+            self.assertEqual(expected, check_many([dict(params) for params in items]))
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+from unittest import mock, TestCase
+
+from rubik.cli import main, scrambles
+
+
+SOLVED_CUBE = "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy"
+
+
+class CliTest(TestCase):
+    def run_cli(self, *argv: str, cubes=None) -> tuple:
+        if cubes is not None:
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+                f.write("\n".join(cubes) + "\n\n")
+            self.addCleanup(os.remove, f.name)
+            argv += (f.name,)
+        output = io.StringIO()
+        return main(list(argv), output), output.getvalue()
+
+    def test_check(self):
+        status, output = self.run_cli("check", cubes=[SOLVED_CUBE, "xx"])
+        self.assertEqual(1, status)
+        self.assertEqual(["ok", "error: cube must have exactly 54 pieces"], output.splitlines())
+
+    def test_rotate(self):
+        status, output = self.run_cli("rotate", "F", cubes=[SOLVED_CUBE])
+        self.assertEqual(0, status)
+        self.assertEqual("gggggggggwrrwrrwrrbbbbbbbbbooyooyooywwwwwwooorrryyyyyy\n", output)
+
+    def test_solve(self):
+        cubes = list(scrambles(3, seed=1))
+        status, output = self.run_cli("solve", "--format", "jsonl", cubes=cubes)
+        self.assertEqual(0, status)
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(cubes, [record["input"] for record in records])
+        for record in records:
+            _, cube = self.run_cli("rotate", record["solution"], cubes=[record["input"]])
+            self.assertEqual([1] * 6, [len(set(cube.strip()[i * 9 : i * 9 + 9])) for i in range(6)])
+
+    def test_solve_workers(self):
+        cubes = list(scrambles(8, seed=2))
+        _, serial = self.run_cli("solve", cubes=cubes)
+        _, parallel = self.run_cli("solve", "--workers", "2", cubes=cubes)
+        self.assertEqual(serial, parallel)
+
+    def test_csv(self):
+        status, output = self.run_cli("rotate", "--format", "csv", "F", cubes=[SOLVED_CUBE, "xx"])
+        self.assertEqual(1, status)
+        rows = list(csv.DictReader(io.StringIO(output)))
+        self.assertEqual(["input", "status", "cube"], list(rows[0]))
+        self.assertEqual({"input": "xx", "status": "error: cube must have exactly 54 pieces", "cube": ""}, rows[1])
+
+    def test_scramble(self):
+        _, first = self.run_cli("scramble", "--count", "4", "--seed", "3")
+        _, second = self.run_cli("scramble", "--count", "4", "--seed", "3")
+        self.assertEqual(first, second)
+        self.assertEqual(4, len(first.splitlines()))
+        status, output = self.run_cli("check", cubes=first.splitlines())
+        self.assertEqual((0, ["ok"] * 4), (status, output.splitlines()))
+
+    def test_scramble_seed_is_local(self):
+        random.seed(4)
+        expected = random.random()
+        random.seed(4)
+        list(scrambles(2, seed=3))
+        self.assertEqual(expected, random.random())
+
+    def test_workers_only_streamed(self):
+        with self.assertRaises(SystemExit), mock.patch("sys.stderr", io.StringIO()):
+            main(["scramble", "--workers", "2"], io.StringIO())
+
+    def test_bench(self):
+        status, output = self.run_cli("bench", "--count", "3")
+        self.assertEqual(0, status)
+        self.assertIn("solves/s", output)
@@ -1,6 +1,7 @@
+import random
 from unittest import TestCase
 
-from rubik.cube import Cube
+from rubik.cube import Cube, face_slots, FACES, normalize, ROTATIONS, simplify_rotations
 
 
 class CubeTest(TestCase):
@@ -302,3 +303,201 @@ class CubeTest(TestCase):
 
     def test_is_solved(self):
         pass
+
+    def test_permutation_parity(self):
+        rng = random.Random(5700)
+        faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+        for _ in range(200):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            reference = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=True)
+            self.assertIsNotNone(cube._stickers)
+            self.assertIsNone(reference._stickers)
+            for _ in range(25):
+                face, offset, rotations = rng.choice(faces), rng.randint(0, 2), rng.randint(0, 5)
+                self.assertEqual(reference.rotate(face, offset, rotations), cube.rotate(face, offset, rotations))
+                self.assertEqual(str(reference), str(cube))
+            for predicate in (
+                "is_solved",
+                "is_bottom_crossed",
+                "is_bottom_layered",
+                "is_middle_layered",
+                "is_top_crossed",
+                "is_top_surfaced",
+                "is_top_cornered",
+                "is_adjacency_safe",
+            ):
+                self.assertEqual(getattr(reference, predicate)(), getattr(cube, predicate)())
+
+    def test_permutation_solve_parity(self):
+        rng = random.Random(5700)
+        faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+        for _ in range(50):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            for _ in range(30):
+                cube.rotate(rng.choice(faces))
+            reference = Cube(str(cube), use_cubelets=True)
+            for rotation in cube.solve():
+                reference.rotate(rotation)
+            self.assertTrue(cube.is_solved())
+            self.assertTrue(reference.is_solved())
+            self.assertEqual(str(reference), str(cube))
+
+    def test_state(self):
+        cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+        self.assertEqual(bytes(i // 9 for i in range(54)), cube.state)
+        self.assertEqual(["b", "r", "g", "o", "y", "w"], cube.palette)
+        relabeled = Cube("111111111222222222333333333444444444555555555666666666")
+        for rotation in "FRBLUDfrblud":
+            cube.rotate(rotation)
+            relabeled.rotate(rotation)
+        self.assertEqual(cube.state, relabeled.state)
+        copy = Cube.from_state(cube.state, cube.palette)
+        self.assertEqual(str(cube), str(copy))
+        copy.rotate("F")
+        self.assertNotEqual(str(cube), str(copy))
+
+    def test_normalize(self):
+        cube_str = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+        state, palette = normalize(cube_str)
+        self.assertEqual(list("obrgyw"), palette)
+        self.assertEqual((Cube(cube_str).state, Cube(cube_str).palette), (state, palette))
+        self.assertEqual(cube_str, "".join(palette[i] for i in state))
+
+    def test_state_centers(self):
+        cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+        cube.rotate("F", offset=1)
+        self.assertEqual(3, cube._color("z_pos"))
+        self.assertEqual("o", cube.palette[cube._color("z_pos")])
+        self.assertFalse(cube.is_solved())
+        cube.rotate("f", offset=1)
+        self.assertEqual("y", cube.palette[cube._color("z_pos")])
+        self.assertTrue(cube.is_solved())
+        with self.assertRaises(ValueError):
+            Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=True).state
+
+    def test_rotate_sequence(self):
+        rng = random.Random(5700)
+        faces = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+        for length in (0, 1, 15, 16, 17, 100, 1000):
+            rotations = "".join(rng.choice(faces) for _ in range(length))
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            reference = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=True)
+            self.assertEqual(rotations, cube.rotate_sequence(rotations))
+            self.assertEqual(rotations, reference.rotate_sequence(rotations))
+            self.assertEqual(str(reference), str(cube))
+            for rotation in cube.solve():
+                reference.rotate(rotation)
+            self.assertTrue(reference.is_solved())
+
+    def test_rotate_sequence_invalid(self):
+        cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+        with self.assertRaises(ValueError):
+            cube.rotate_sequence("FRx")
+        self.assertTrue(cube.is_solved())
+
+    def test_simplify_rotations(self):
+        rng = random.Random(9)
+        for _ in range(50):
+            rotations = "".join(rng.choice("FfRrBbLlUuDd") for _ in range(40))
+            simplified = simplify_rotations(rotations)
+            self.assertLessEqual(len(simplified), len(rotations))
+            self.assertEqual(simplified, simplify_rotations(simplified))
+            expected = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            expected.rotate_sequence(rotations)
+            actual = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            actual.rotate_sequence(simplified)
+            self.assertEqual(str(expected), str(actual))
+
+    def test_copy(self):
+        for use_cubelets in (False, True):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=use_cubelets)
+            cube.rotate_sequence("FRuL")
+            copy = cube.copy()
+            self.assertEqual(str(cube), str(copy))
+            copy.rotate("B")
+            self.assertNotEqual(str(cube), str(copy))
+            cube.rotate("B")
+            self.assertEqual(str(cube), str(copy))
+            copy.solve()
+            self.assertTrue(copy.is_solved())
+            self.assertFalse(cube.is_solved())
+
+    def test_push_pop(self):
+        for use_cubelets in (False, True):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=use_cubelets)
+            self.assertEqual("FF", cube.push("F", rotations=2))
+            cube.push("u")
+            middle = str(cube)
+            cube.push("R", offset=1)
+            cube.push("l", rotations=3)
+            self.assertEqual([("F", 0, 2), ("u", 0, 1), ("R", 1, 1), ("l", 0, 3)], cube.journal)
+            self.assertEqual("LLL1r", cube.pop(2))
+            self.assertEqual(middle, str(cube))
+            cube.pop(2)
+            self.assertTrue(cube.is_solved())
+            self.assertEqual([], cube.journal)
+            with self.assertRaises(ValueError):
+                cube.pop()
+
+    def test_snapshot(self):
+        for use_cubelets in (False, True):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=use_cubelets)
+            cube.push("F")
+            snapshot = cube.snapshot()
+            scrambled = str(cube)
+            for _ in range(2):
+                cube.rotate_sequence("RUrDLLb")
+                cube.push("U", offset=1)
+                cube.restore(snapshot)
+                self.assertEqual(scrambled, str(cube))
+                self.assertEqual([("F", 0, 1)], cube.journal)
+            cube.pop()
+            self.assertTrue(cube.is_solved())
+
+    def test_face_views(self):
+        for use_cubelets in (False, True):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww", use_cubelets=use_cubelets)
+            # a permutation backed cube gives its colors as normalized indices
+            def color(cube, normal):
+                return cube._color(normal) if use_cubelets else cube.palette[cube._color(normal)]
+
+            self.assertIs(cube._face("y_pos"), cube._face("y_pos"))
+            cube.rotate("R", offset=1)
+            self.assertEqual(
+                {"y_pos": "w", "x_pos": "r", "y_neg": "y", "x_neg": "o", "z_pos": "b", "z_neg": "g"},
+                {normal: color(cube, normal) for normal in ("y_pos", "x_pos", "y_neg", "x_neg", "z_pos", "z_neg")},
+            )
+            copy = cube.copy()
+            copy.rotate("r", offset=1)
+            self.assertEqual("b", color(copy, "y_pos"))
+            self.assertEqual("w", color(cube, "y_pos"))
+        with self.assertRaises(ValueError):
+            Cube("b" * 24)._color("y_pos")
+
+    def test_face_slots(self):
+        self.assertEqual(((20, 19, 18), (11, 10, 9), (2, 1, 0)), face_slots(3, "y_neg"))
+        self.assertEqual(((15, 16, 17), (12, 13, 14), (9, 10, 11)), face_slots(3, "z_neg", 1))
+        for n in (2, 3, 4):
+            slots = {slot for normal in FACES for row in face_slots(n, normal) for slot in row}
+            self.assertEqual(n**3 - max(n - 2, 0) ** 3, len(slots))
+
+    def test_progress(self):
+        predicates = ("is_solved", "is_bottom_crossed", "is_bottom_layered", "is_middle_layered", "is_top_crossed")
+        predicates += ("is_top_surfaced", "is_top_cornered")
+        random.seed(24)
+        for _ in range(10):
+            scrambled = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            scrambled.scramble()
+            cube, reference = Cube(str(scrambled)), Cube(str(scrambled), use_cubelets=True)
+            snapshot = cube.snapshot()
+            # the middle slice turns move the centers, then put them back
+            moves = [(rotation, 0) for rotation in scrambled.copy().solve()] + [("R", 1), ("r", 1)]
+            for rotation, offset in moves:
+                cube.rotate(rotation, offset)
+                reference.rotate(rotation, offset)
+                for predicate in predicates:
+                    self.assertEqual(getattr(reference, predicate)(), getattr(cube, predicate)(), predicate)
+            self.assertTrue(cube.is_solved())
+            cube.restore(snapshot)
+            self.assertEqual(str(scrambled), str(cube))
+            self.assertFalse(cube.is_solved())
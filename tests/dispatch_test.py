@@ -1,6 +1,6 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
-from rubik.dispatch import dispatch
+from rubik.dispatch import dispatch, dispatch_many
 
 
 class DispatchTest(TestCase):
@@ -19,6 +19,11 @@ class DispatchTest(TestCase):
         result = dispatch(params)
         self.assertIn("status", result)
 
+    def test_simplify_present(self):
+        params = {"op": "simplify"}
+        result = dispatch(params)
+        self.assertIn("status", result)
+
     def test_missing_param(self):
         result = dispatch()
         self.assertIn("status", result)
@@ -41,3 +46,34 @@ class DispatchTest(TestCase):
         result = dispatch(params)
         self.assertIn("status", result)
         self.assertEqual(result["status"], "error: op is not legal")
+
+    def test_dispatch_many(self):
+        results = dispatch_many(
+            [
+                {"op": "info"},
+                {"op": "solve", "cube": "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy", "rotate": "F"},
+                {"op": "nop"},
+                None,
+                {"op": "check", "cube": "a"},
+            ]
+        )
+        self.assertEqual(5, len(results))
+        self.assertEqual(dispatch({"op": "info"}), results[0])
+        self.assertEqual("gggggggggwrrwrrwrrbbbbbbbbbooyooyooywwwwwwooorrryyyyyy", results[1].get("cube"))
+        self.assertEqual("error: op is not legal", results[2].get("status"))
+        self.assertEqual("error: no parameters are given", results[3].get("status"))
+        self.assertEqual("error: cube must have exactly 54 pieces", results[4].get("status"))
+
+    def test_dispatch_many_checks(self):
+        items = [{"op": "check", "cube": "a"}, {"op": "info"}, {"op": "check", "cube": "b"}]
+        with mock.patch("rubik.dispatch.check_many", return_value=[{"status": "x"}, {"status": "y"}]) as check_many:
+            results = dispatch_many(items)
+        check_many.assert_called_once_with([items[0], items[2]])
+        self.assertEqual([{"status": "x"}, dispatch({"op": "info"}), {"status": "y"}], results)
+
+    def test_timings_repeated(self):
+        params = {"op": "solve", "cube": "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw", "debug": "timings"}
+        first, second = dispatch(dict(params)), dispatch(dict(params))
+        self.assertEqual(first["solution"], second["solution"])
+        self.assertIn("top_layer", first["timings"]["stages"])
+        self.assertEqual(first["timings"]["stages"].keys(), second["timings"]["stages"].keys())
@@ -0,0 +1,73 @@
+import os
+import random
+import time
+from unittest import TestCase
+
+from rubik.budget import Budget, MAX_ROTATIONS, TIMEOUT_MS
+from rubik.cache import CACHE
+from rubik.check import check
+from rubik.cube import Cube
+from rubik.cubie import CubieCube, from_cubie, parity
+from rubik.solve import solve
+
+
+"""
+The number of random cubes fed to the solver, raise RUBIK_FUZZ_CASES for a longer run.
+"""
+CASES = int(os.getenv("RUBIK_FUZZ_CASES", "100"))
+SEED = int(os.getenv("RUBIK_FUZZ_SEED", "5700"))
+COLORS = "brgoyw"
+
+
+def random_cube(rng: random.Random) -> str:
+    """Obtain a uniformly random solvable cube, i.e. a random sticker permutation that passes check."""
+    cp, ep = rng.sample(range(8), 8), rng.sample(range(12), 12)
+    if parity(cp) != parity(ep):
+        ep[0], ep[1] = ep[1], ep[0]
+    co = [rng.randrange(3) for _ in range(7)]
+    eo = [rng.randrange(2) for _ in range(11)]
+    return from_cubie(CubieCube(cp, co + [-sum(co) % 3], ep, eo + [sum(eo) % 2]), COLORS)
+
+
+class FuzzTest(TestCase):
+    def setUp(self):
+        CACHE.clear()
+
+    def assertWithinBudget(self, params: dict):
+        start = time.monotonic()
+        result = solve(params)
+        elapsed = (time.monotonic() - start) * 1000
+        self.assertLess(elapsed, TIMEOUT_MS + 1000, params)
+        self.assertIn(result["status"], ("ok", "error: solve exceeded its work budget"), params)
+        if result["status"] == "ok":
+            cube = Cube(params["cube"])
+            cube.rotate_sequence(result["solution"])
+            self.assertTrue(cube.is_solved(), params)
+
+    def test_random_cubes(self):
+        rng = random.Random(SEED)
+        for _ in range(CASES):
+            cube = random_cube(rng)
+            self.assertEqual("ok", check({"cube": cube})["status"], cube)
+            self.assertWithinBudget({"op": "solve", "cube": cube})
+
+    def test_random_cubes_twophase(self):
+        rng = random.Random(SEED)
+        for _ in range(max(1, CASES // 50)):
+            self.assertWithinBudget({"op": "solve", "cube": random_cube(rng), "method": "twophase"})
+
+    def test_random_stickers(self):
+        rng = random.Random(SEED)
+        stickers = list("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+        for _ in range(CASES * 10):
+            rng.shuffle(stickers)
+            cube = "".join(stickers)
+            if check({"cube": cube})["status"] == "ok":
+                self.assertWithinBudget({"op": "solve", "cube": cube})
+
+    def test_budget(self):
+        rng = random.Random(SEED)
+        for _ in range(CASES):
+            cube = Cube(random_cube(rng))
+            cube.solve(budget=Budget(MAX_ROTATIONS or None))
+            self.assertTrue(cube.is_solved())
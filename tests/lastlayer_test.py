@@ -0,0 +1,71 @@
+import random
+from unittest import TestCase
+
+from rubik import lastlayer
+from rubik.cube import Cube, FACES, simplify_rotations
+from rubik.cubie import CubieCube, from_cubie, parity
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+def last_layer_cube(rng: random.Random) -> str:
+    """Generate a random cube with its first two layers solved."""
+    while True:
+        cp, ep = rng.sample(range(4), 4), rng.sample(range(4), 4)
+        if parity(cp) == parity(ep):
+            break
+    co = [rng.randrange(3) for _ in range(3)]
+    eo = [rng.randrange(2) for _ in range(3)]
+    cubie = CubieCube(
+        cp + [4, 5, 6, 7], co + [-sum(co) % 3] + [0] * 4, ep + list(range(4, 12)), eo + [sum(eo) % 2] + [0] * 8
+    )
+    return from_cubie(cubie, "brgoyw")
+
+
+class LastLayerTest(TestCase):
+    def test_cases(self):
+        oll, pll = lastlayer.cases()
+        self.assertEqual((57, 21), (len(lastlayer.OLL), len(lastlayer.PLL)))
+        # every orientation of 4 corners and 4 edges, and every even permutation of them
+        self.assertEqual(27 * 8, len(oll))
+        self.assertEqual(24 * 24 // 2, len(pll))
+        self.assertEqual("", oll[lastlayer.oll_case(Cube(SOLVED_CUBE))])
+        self.assertEqual("", pll[lastlayer.pll_case(Cube(SOLVED_CUBE))])
+
+    def test_algorithms(self):
+        for algorithms, is_solved in ((lastlayer.OLL, Cube.is_top_surfaced), (lastlayer.PLL, Cube.is_solved)):
+            for algorithm in algorithms:
+                self.assertEqual(algorithm, simplify_rotations(algorithm))
+                cube = Cube(SOLVED_CUBE)
+                cube.rotate_sequence(algorithm.translate(lastlayer.TRANSLATION)[::-1].swapcase())
+                self.assertTrue(cube.is_middle_layered(), algorithm)
+                self.assertFalse(is_solved(cube), algorithm)
+
+    def test_solve(self):
+        rng = random.Random(5700)
+        for _ in range(100):
+            cube_str = last_layer_cube(rng)
+            for use_cubelets in (False, True):
+                cube = Cube(cube_str, use_cubelets=use_cubelets)
+                self.assertTrue(cube.is_middle_layered())
+                solution = cube.solve("cfop")
+                self.assertTrue(cube.is_solved())
+                # one algorithm each for OLL and PLL, with up face turns around them
+                self.assertLessEqual(len(solution), 2 * 19 + 3 * 2)
+                cube = Cube(cube_str, use_cubelets=use_cubelets)
+                cube.rotate_sequence(solution)
+                self.assertTrue(cube.is_solved())
+
+    def test_translation(self):
+        up = FACES["z_pos"]["rotation"]
+        self.assertEqual(up.upper() + up, "Uu".translate(lastlayer.TRANSLATION))
+        self.assertEqual(("", up.upper(), up.upper() * 2, up), lastlayer.AUF)
+
+    def test_unsolvable(self):
+        # the up-front-right corner twisted in place
+        cube = Cube("bbybbbbbbbrrrrrrrrgggggggggoooooooooyyyyyyyyrwwwwwwwww")
+        with self.assertRaises(ValueError):
+            lastlayer.orient(cube)
+        with self.assertRaises(ValueError):
+            cube.solve("cfop")
@@ -0,0 +1,44 @@
+import io
+import json
+import logging
+from unittest import TestCase
+
+from rubik.log import configure
+
+
+class LogTest(TestCase):
+    def tearDown(self):
+        logging.getLogger("rubik.test").handlers = []
+
+    def test_json(self):
+        stream = io.StringIO()
+        logger = configure("rubik.test", buffer=1, stream=stream)
+        logger.info("response", extra={"op": "info", "status": "ok"})
+        record = json.loads(stream.getvalue())
+        self.assertEqual("response", record["message"])
+        self.assertEqual("INFO", record["level"])
+        self.assertEqual("info", record["op"])
+        self.assertEqual("ok", record["status"])
+        self.assertNotIn("args", record)
+
+    def test_buffered(self):
+        stream = io.StringIO()
+        logger = configure("rubik.test", buffer=3, stream=stream)
+        logger.info("first")
+        logger.info("second")
+        self.assertEqual("", stream.getvalue())
+        logger.info("third")
+        messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+        self.assertEqual(["first", "second", "third"], messages)
+
+    def test_error_flushes(self):
+        stream = io.StringIO()
+        logger = configure("rubik.test", buffer=10, stream=stream)
+        logger.info("first")
+        try:
+            raise ValueError("oops")
+        except ValueError:
+            logger.exception("failed")
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(["first", "failed"], [line["message"] for line in lines])
+        self.assertIn("ValueError: oops", lines[1]["exception"])
@@ -0,0 +1,103 @@
+import gzip
+import json
+from unittest import mock, TestCase
+
+import microservice
+from rubik.cache import symmetries
+
+
+SCRAMBLED_CUBE = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+
+
+class MicroserviceTest(TestCase):
+    def setUp(self):
+        microservice.CACHE.clear()
+        microservice.RESPONSE_CACHE.clear()
+        self.client = microservice.app.test_client()
+        # the app's log is buffered and would be flushed at exit, after the test runner has closed stdout
+        logger = mock.patch.object(microservice, "LOGGER")
+        logger.start()
+        self.addCleanup(logger.stop)
+
+    def test_info(self):
+        response = self.client.get("/rubik?op=info")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/json", response.headers["Content-Type"])
+        self.assertEqual({"status": "wah0028"}, response.get_json())
+        self.assertEqual("rubik; fwd=miss; stored", response.headers["Cache-Status"])
+        self.assertEqual("rubik; hit", self.client.get("/rubik?op=info").headers["Cache-Status"])
+
+    def test_solve_etag(self):
+        query = f"/rubik?op=solve&cube={SCRAMBLED_CUBE}"
+        first = self.client.get(query)
+        self.assertEqual("ok", first.get_json()["status"])
+        tag = first.headers["ETag"]
+        response = self.client.get(query, headers={"If-None-Match": tag})
+        self.assertEqual((304, b""), (response.status_code, response.data))
+        self.assertEqual("rubik; hit", response.headers["Cache-Status"])
+
+    def test_solve_etag_deterministic(self):
+        query = f"/rubik?op=solve&cube={SCRAMBLED_CUBE}"
+        tag = self.client.get(query).headers["ETag"]
+        microservice.CACHE.clear()
+        microservice.RESPONSE_CACHE.clear()
+        # a symmetric cube solved first shares the cached solution, which mustn't change the response
+        self.client.get(f"/rubik?op=solve&cube={symmetries()[5].apply(SCRAMBLED_CUBE)}")
+        microservice.RESPONSE_CACHE.clear()
+        response = self.client.get(query)
+        self.assertEqual("rubik; fwd=miss; stored", response.headers["Cache-Status"])
+        self.assertEqual(tag, response.headers["ETag"])
+
+    def test_uncached(self):
+        response = self.client.get("/rubik?op=nop")
+        self.assertEqual({"status": "error: op is not legal"}, response.get_json())
+        self.assertEqual("rubik; fwd=bypass", response.headers["Cache-Status"])
+        self.assertNotIn("ETag", response.headers)
+
+    def test_batch(self):
+        response = self.client.post("/rubik/batch", data=b'[{"op": "info"}, {"op": "nop"}]')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/json", response.headers["Content-Type"])
+        self.assertEqual([{"status": "wah0028"}, {"status": "error: op is not legal"}], response.get_json())
+        self.assertNotIn("ETag", response.headers)
+        self.assertNotIn("Cache-Status", response.headers)
+
+    def test_batch_gzip(self):
+        body = "\n".join(['{"op": "info"}'] * 99 + ["x"]).encode()
+        response = self.client.post("/rubik/batch", data=body, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual("application/x-ndjson", response.headers["Content-Type"])
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        self.assertEqual("Accept-Encoding", response.headers["Vary"])
+        lines = gzip.decompress(response.data).decode().splitlines()
+        self.assertEqual(
+            [{"status": "wah0028"}] * 99 + [{"status": "error: item is not valid json"}],
+            [json.loads(line) for line in lines],
+        )
+
+    def test_stream(self):
+        response = self.client.post("/rubik/stream", data=b'{"op": "info"}\n{"op": "nop"}\nx\n\n"nope"\n')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("application/x-ndjson", response.headers["Content-Type"])
+        self.assertEqual(
+            [
+                {"status": "wah0028"},
+                {"status": "error: op is not legal"},
+                {"status": "error: item is not valid json"},
+                {"status": "error: parameter is not a dictionary"},
+            ],
+            [json.loads(line) for line in response.data.decode().splitlines()],
+        )
+
+    def test_pool(self):
+        with mock.patch.object(microservice, "WORKERS", 1):
+            self.assertIsNone(microservice.pool())
+
+        pools = []
+        with mock.patch.object(microservice, "WORKERS", 2), mock.patch.object(
+            microservice, "SolverPool", side_effect=lambda workers: pools.append(workers) or object()
+        ), mock.patch.object(microservice, "_POOL", None), mock.patch.object(microservice, "_POOL_PID", None):
+            self.assertIs(microservice.pool(), microservice.pool())
+            # a forked worker creates its own pool rather than sharing the master's queues
+            with mock.patch("os.getpid", return_value=-1):
+                microservice.pool()
+        self.assertEqual([2, 2], pools)
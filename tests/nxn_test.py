@@ -0,0 +1,101 @@
+import random
+import string
+from unittest import TestCase
+
+from rubik.cube import Cube, ROTATIONS
+from rubik.nxn import layer_runs, NxNCube
+
+
+FACES = list(ROTATIONS.keys()) + [face.upper() for face in ROTATIONS.keys()]
+
+
+def solved(n: int) -> str:
+    return "".join(color * n**2 for color in "gbrowy")
+
+
+def labels(n: int) -> str:
+    """A cube string where (nearly) every sticker is distinct, so any misplaced sticker shows."""
+    rng = random.Random(n)
+    return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(6 * n**2))
+
+
+class NxNCubeTest(TestCase):
+    def test_matches_cubelets(self):
+        for n in range(2, 6):
+            cube_str = labels(n)
+            for face in FACES:
+                for offset in range(n):
+                    for rotations in (1, 2, 3):
+                        expected = Cube(cube_str, use_cubelets=True)
+                        actual = NxNCube(cube_str)
+                        returned = expected.rotate(face, offset, rotations)
+                        self.assertEqual(returned, actual.rotate(face, offset, rotations))
+                        self.assertEqual(str(expected), str(actual), (n, face, offset, rotations))
+
+    def test_matches_cube_sequence(self):
+        cube_str = labels(3)
+        rotations = "".join(random.Random(3).choice(FACES) for _ in range(100))
+        expected = Cube(cube_str)
+        expected.rotate_sequence(rotations)
+        actual = NxNCube(cube_str)
+        self.assertEqual(rotations, actual.rotate_sequence(rotations))
+        self.assertEqual(str(expected), str(actual))
+
+    def test_rotate_sequence_offsets(self):
+        cube = NxNCube(labels(6))
+        expected = NxNCube(labels(6))
+        expected.rotate("F", 2)
+        expected.rotate("r")
+        expected.rotate("U", 5)
+        self.assertEqual("2Fr5U", cube.rotate_sequence("2Fr") + cube.rotate_sequence("5U"))
+        self.assertEqual(str(expected), str(cube))
+        self.assertRaises(ValueError, cube.rotate_sequence, "F2x")
+        self.assertRaises(ValueError, cube.rotate_sequence, "9F")
+
+    def test_wide(self):
+        cube, expected = NxNCube(labels(5)), NxNCube(labels(5))
+        self.assertEqual("R1R2R", cube.rotate_wide("R", 3))
+        expected.rotate_sequence("R1R2R")
+        self.assertEqual(str(expected), str(cube))
+
+        whole = NxNCube(solved(5))
+        whole.rotate_wide("u", 5)
+        self.assertTrue(whole.is_solved())
+        self.assertNotEqual(solved(5), str(whole))
+        self.assertRaises(ValueError, whole.rotate_wide, "u", 6)
+
+    def test_inverse(self):
+        for n in (2, 7, 21):
+            cube = NxNCube(labels(n))
+            rng = random.Random(n)
+            moves = [(rng.choice(FACES), rng.randrange(n), rng.randint(1, 3)) for _ in range(200)]
+            for face, offset, rotations in moves:
+                cube.rotate(face, offset, rotations)
+            for face, offset, rotations in reversed(moves):
+                cube.rotate(face.swapcase(), offset, rotations)
+            self.assertEqual(labels(n), str(cube))
+
+    def test_is_solved(self):
+        cube = NxNCube(solved(4))
+        self.assertTrue(cube.is_solved())
+        cube.rotate("F", 1)
+        self.assertFalse(cube.is_solved())
+
+    def test_big(self):
+        cube = NxNCube(solved(100))
+        random.seed(100)
+        cube.scramble(50)
+        self.assertFalse(cube.is_solved())
+        self.assertEqual(100, cube.n)
+        self.assertEqual(sorted(solved(100)), sorted(str(cube)))
+        # an inner slice turn is four strided copies however big the cube is
+        self.assertEqual(4, len(layer_runs(100, ROTATIONS["f"]["normal"], 50, 1)))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, NxNCube, "abc")
+        # a 1x1 cube only turns as a whole, which Cube never does
+        self.assertRaises(ValueError, NxNCube, "FRBLUD")
+        cube = NxNCube(solved(3))
+        self.assertRaises(ValueError, cube.rotate, "x")
+        self.assertRaises(ValueError, cube.rotate, "F", 3)
+        self.assertRaises(ValueError, cube.rotate, "F", 0, -1)
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest import mock, TestCase
+
+from rubik.cube import Cube
+from rubik.dispatch import dispatch_batch, INVALID_JSON
+from rubik.pool import bounded_executor, BoundedExecutor, cpu_limit, memory_limit, Saturated, SolverPool
+from rubik.solve import solve_many
+
+
+SOLVED_CUBE = "bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"
+
+
+class PoolTest(TestCase):
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            SolverPool(0)
+
+    def test_empty_batch(self):
+        with SolverPool(2) as pool:
+            self.assertEqual([], pool.solve_many([]))
+
+    def test_ordered_results(self):
+        items = []
+        for i in range(40):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            cube.scramble()
+            items.append({"op": "solve", "cube": str(cube), "rotate": "FRBLUDfrblud"[i % 12]})
+        items.append({"op": "solve", "cube": "******"})
+
+        with SolverPool(2, chunksize=3) as pool:
+            results = pool.solve_many(items)
+        self.assertEqual(solve_many(items), results)
+
+    def test_solutions(self):
+        cubes = []
+        for _ in range(20):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            cube.scramble()
+            cubes.append(str(cube))
+
+        with SolverPool(2) as pool:
+            results = pool.solve_many({"op": "solve", "cube": cube} for cube in cubes)
+        self.assertEqual(len(cubes), len(results))
+        for cube_str, result in zip(cubes, results):
+            self.assertEqual("ok", result.get("status"))
+            cube = Cube(cube_str)
+            for rotation in result["solution"]:
+                cube.rotate(rotation)
+            self.assertTrue(cube.is_solved())
+
+
+class BoundedExecutorTest(TestCase):
+    def test_saturated(self):
+        release = threading.Event()
+        with BoundedExecutor(ThreadPoolExecutor(1), 1, queue_depth=1) as executor:
+            futures = [executor.submit(release.wait), executor.submit(release.wait)]
+            with self.assertRaises(Saturated):
+                executor.submit(release.wait)
+            self.assertEqual(2, executor.pending)
+            release.set()
+            for future in futures:
+                future.result()
+            deadline = time.monotonic() + 5
+            while executor.pending and time.monotonic() < deadline:  # done callbacks may run after result() returns
+                time.sleep(0.01)
+            self.assertEqual(0, executor.pending)
+            self.assertEqual(3, executor.submit(len, "abc").result())
+
+    def test_invalid_queue_depth(self):
+        with self.assertRaises(ValueError):
+            BoundedExecutor(ThreadPoolExecutor(1), 1, queue_depth=-1)
+
+    def test_bounded_executor(self):
+        with self.assertRaises(ValueError):
+            bounded_executor(0)
+        with bounded_executor(2) as executor:
+            self.assertEqual(8, executor.queue_depth)
+            results = executor.submit(solve_many, [{"op": "solve", "cube": SOLVED_CUBE, "rotate": "F"}]).result()
+            self.assertEqual("ok", results[0].get("status"))
+
+    def test_bounded_executor_invalid_json(self):
+        with bounded_executor(2) as executor:
+            items = [INVALID_JSON, {"op": "solve", "cube": SOLVED_CUBE, "rotate": "F"}]
+            results = executor.submit(dispatch_batch, items).result()
+        self.assertEqual("error: item is not valid json", results[0].get("status"))
+        self.assertEqual("ok", results[1].get("status"))
+
+
+class LimitsTest(TestCase):
+    def test_cpu_limit(self):
+        self.assertGreaterEqual(cpu_limit(), 1)
+        files = {"/sys/fs/cgroup/cpu.max": "150000 100000"}
+        with mock.patch("rubik.pool._read", files.get), mock.patch("os.sched_getaffinity", return_value=set(range(8))):
+            self.assertEqual(1, cpu_limit())
+        files = {"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "400000", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}
+        with mock.patch("rubik.pool._read", files.get), mock.patch("os.sched_getaffinity", return_value=set(range(8))):
+            self.assertEqual(4, cpu_limit())
+        files = {"/sys/fs/cgroup/cpu.max": "max 100000"}
+        with mock.patch("rubik.pool._read", files.get), mock.patch("os.sched_getaffinity", return_value=set(range(8))):
+            self.assertEqual(8, cpu_limit())
+
+    def test_memory_limit(self):
+        with mock.patch("rubik.pool._read", {"/sys/fs/cgroup/memory.max": "268435456"}.get):
+            self.assertEqual(268435456, memory_limit())
+        with mock.patch("rubik.pool._read", {"/sys/fs/cgroup/memory.max": "max"}.get):
+            self.assertIsNone(memory_limit())
+        with mock.patch("rubik.pool._read", {"/sys/fs/cgroup/memory/memory.limit_in_bytes": "9223372036854771712"}.get):
+            self.assertIsNone(memory_limit())
+        with mock.patch("rubik.pool._read", {}.get):
+            self.assertIsNone(memory_limit())
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from rubik.cube import Cube
+from rubik.profiling import profile
+
+
+SCRAMBLED_CUBE = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+
+
+class ProfilingTest(TestCase):
+    def test_stages(self):
+        cube = Cube(SCRAMBLED_CUBE)
+        with profile() as timings:
+            solution = cube._top_layer()
+        self.assertTrue(cube.is_solved())
+        self.assertEqual(
+            [
+                "daisy",
+                "bottom_cross",
+                "bottom_layer",
+                "middle_layer",
+                "top_cross",
+                "top_surface",
+                "top_corners",
+                "top_layer",
+            ],
+            list(timings.stages.keys()),
+        )
+        self.assertEqual(len(solution), sum(timing.moves for timing in timings.stages.values()))
+        self.assertEqual(len(solution), sum(timing.rotations for timing in timings.stages.values()))
+        self.assertGreater(timings.stages["middle_layer"].calls, 0)
+        self.assertNotIn("rotate", cube.__dict__)
+
+    def test_callback(self):
+        calls = []
+        with profile(lambda *args: calls.append(args)) as timings:
+            Cube(SCRAMBLED_CUBE).solve()
+        self.assertEqual(sum(timing.calls for timing in timings.stages.values()), len(calls))
+        self.assertTrue(all(seconds >= 0 for _, seconds, _, _ in calls))
+
+    def test_to_dict(self):
+        with profile() as timings:
+            Cube(SCRAMBLED_CUBE).solve()
+        result = timings.to_dict()
+        self.assertIn("ms", result)
+        self.assertEqual({"calls", "ms", "rotations", "moves"}, set(result["stages"]["top_layer"].keys()))
+
+    def test_disabled(self):
+        with profile() as timings:
+            pass
+        Cube(SCRAMBLED_CUBE).solve()
+        self.assertEqual({}, timings.stages)
+
+    def test_nested(self):
+        with profile() as outer:
+            with profile() as inner:
+                Cube(SCRAMBLED_CUBE).solve()
+            self.assertEqual({}, outer.stages)
+            Cube(SCRAMBLED_CUBE).solve()
+        self.assertEqual(inner.stages.keys(), outer.stages.keys())
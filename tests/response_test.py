@@ -0,0 +1,71 @@
+import gzip
+import json
+from unittest import mock, skipIf, TestCase
+
+from rubik import response
+from rubik.response import coding, dumps, dumps_lines, etag, render, render_result
+
+
+LARGE = {"status": "ok", "solution": "FRBLUD" * 500}
+
+
+class ResponseTest(TestCase):
+    def test_dumps(self):
+        value = {"status": "ok", "solution": "FRU", "nested": [1, None, True]}
+        self.assertEqual(value, json.loads(dumps(value)))
+        with mock.patch.object(response, "orjson", None):
+            fallback = dumps(value)
+        # the same bytes whichever encoder is installed, so ETags don't change with it
+        self.assertEqual(dumps(value), fallback)
+
+    def test_dumps_lines(self):
+        self.assertEqual(b'{"status":"ok"}\n[1]\n', dumps_lines([{"status": "ok"}, [1]]))
+
+    def test_coding(self):
+        body = dumps(LARGE)
+        self.assertIsNone(coding(body, ""))
+        self.assertIsNone(coding(body, "identity"))
+        self.assertIsNone(coding(body, "gzip;q=0"))
+        self.assertIsNone(coding(b"{}", "gzip"))
+        with mock.patch.object(response, "brotli", None):
+            self.assertEqual("gzip", coding(body, "gzip, br"))
+            self.assertEqual("gzip", coding(body, "*"))
+
+    @skipIf(response.brotli is None, "brotli is not installed")
+    def test_coding_brotli(self):
+        body = dumps(LARGE)
+        self.assertEqual("br", coding(body, "gzip, br"))
+        self.assertEqual("gzip", coding(body, "gzip, br;q=0.5"))
+        status, headers, compressed = render(body, request_headers={"accept-encoding": "br"})
+        self.assertEqual("br", headers["Content-Encoding"])
+        self.assertEqual(body, response.brotli.decompress(compressed))
+
+    def test_render(self):
+        body = dumps(LARGE)
+        status, headers, rendered = render(body)
+        self.assertEqual((200, body), (status, rendered))
+        self.assertEqual({"Content-Type": "application/json", "Vary": "Accept-Encoding"}, headers)
+
+        status, headers, rendered = render(body, request_headers={"accept-encoding": "gzip;q=1.0"})
+        self.assertEqual("gzip", headers["Content-Encoding"])
+        self.assertEqual(body, gzip.decompress(rendered))
+        self.assertLess(len(rendered), len(body))
+
+    def test_etag(self):
+        body = dumps(LARGE)
+        _, headers, _ = render(body, tagged=True)
+        self.assertEqual(etag(body), headers["ETag"])
+        _, gzipped, _ = render(body, request_headers={"accept-encoding": "gzip"}, tagged=True)
+        self.assertNotEqual(headers["ETag"], gzipped["ETag"])
+
+        for if_none_match in (headers["ETag"], f'"other", W/{headers["ETag"]}', "*"):
+            status, _, rendered = render(body, request_headers={"if-none-match": if_none_match}, tagged=True)
+            self.assertEqual((304, b""), (status, rendered))
+        self.assertEqual(200, render(body, request_headers={"if-none-match": gzipped["ETag"]}, tagged=True)[0])
+
+    def test_render_result(self):
+        self.assertIn("ETag", render_result({"op": "solve"}, {"status": "ok", "solution": ""})[1])
+        self.assertNotIn("ETag", render_result({"op": "solve"}, {"status": "error: solve exceeded its work budget"})[1])
+        self.assertIn("ETag", render_result({"op": "check"}, {"status": "error: cube must be present"})[1])
+        self.assertNotIn("ETag", render_result({"op": "solve", "debug": "timings"}, {"status": "ok", "timings": {}})[1])
+        self.assertNotIn("ETag", render_result({"op": "nop"}, {"status": "error: op is not legal"})[1])
@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from rubik.simplify import simplify
+
+
+class SimplifyTest(TestCase):
+    def test_missing_rotate(self):
+        result = simplify({"op": "simplify"})
+        self.assertIn("status", result)
+        self.assertEqual("error: rotate must be present", result.get("status"))
+
+    def test_int_rotate(self):
+        result = simplify({"op": "simplify", "rotate": 6})
+        self.assertIn("status", result)
+        self.assertEqual("error: rotate must be given as a string", result.get("status"))
+
+    def test_invalid_char_rotate(self):
+        result = simplify({"op": "simplify", "rotate": "xxxx"})
+        self.assertIn("status", result)
+        self.assertEqual("error: rotate must be comprised of characters in FfRrBbLlUuDd", result.get("status"))
+
+    def test_empty_rotate(self):
+        result = simplify({"op": "simplify", "rotate": ""})
+        self.assertEqual({"status": "ok", "rotate": ""}, result)
+
+    def test_inverse_cancel(self):
+        result = simplify({"op": "simplify", "rotate": "FfRrBUub"})
+        self.assertEqual({"status": "ok", "rotate": ""}, result)
+
+    def test_same_face_merge(self):
+        result = simplify({"op": "simplify", "rotate": "FFFRRRRUU"})
+        self.assertEqual({"status": "ok", "rotate": "fUU"}, result)
+
+    def test_opposite_face_commute(self):
+        result = simplify({"op": "simplify", "rotate": "UDUUU"})
+        self.assertEqual({"status": "ok", "rotate": "D"}, result)
+
+    def test_nested_cancel(self):
+        result = simplify({"op": "simplify", "rotate": "RUFfur"})
+        self.assertEqual({"status": "ok", "rotate": ""}, result)
@@ -1,6 +1,8 @@
 from unittest import TestCase
+from unittest.mock import patch
 
-from rubik.solve import solve
+from rubik.cube import Cube
+from rubik.solve import solve, solve_many
 
 
 class SolveTest(TestCase):
@@ -62,3 +64,79 @@ class SolveTest(TestCase):
         self.assertIn("status", result)
         self.assertEqual("ok", result.get("status"))
         self.assertEqual("ooooooooobbbbbbbbbrrrrrrrrrgggggggggyyyyyyyyywwwwwwwww", result.get("cube"))
+
+    def test_solve_many(self):
+        results = solve_many(
+            [
+                {"op": "solve", "cube": "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy", "rotate": "F"},
+                {"op": "solve", "cube": "******"},
+                "not a dictionary",
+                {"op": "solve", "cube": "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"},
+                {"op": "solve", "cube": "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy", "rotate": "F"},
+            ]
+        )
+        self.assertEqual(5, len(results))
+        self.assertEqual("ok", results[0].get("status"))
+        self.assertEqual("gggggggggwrrwrrwrrbbbbbbbbbooyooyooywwwwwwooorrryyyyyy", results[0].get("cube"))
+        self.assertEqual("error: cube must be given as a solely alphanumeric string", results[1].get("status"))
+        self.assertEqual("error: parameter is not a dictionary", results[2].get("status"))
+        self.assertEqual("ok", results[3].get("status"))
+        self.assertIn("solution", results[3])
+        self.assertEqual(results[0], results[4])
+        self.assertIsNot(results[0], results[4])
+
+    def test_solve_many_unexpected_error(self):
+        cube = "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw"
+        with patch("rubik.solve.solve", side_effect=[RuntimeError("boom"), {"status": "ok", "solution": "F"}]):
+            results = solve_many([{"op": "solve", "cube": cube}, {"op": "solve", "cube": cube, "method": "cfop"}])
+        self.assertEqual([{"status": "error: boom"}, {"status": "ok", "solution": "F"}], results)
+
+    def test_solve_many_empty(self):
+        self.assertEqual([], solve_many([]))
+
+    def test_invalid_method(self):
+        result = solve(
+            {"op": "solve", "cube": "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy", "method": "nop"}
+        )
+        self.assertIn("status", result)
+        self.assertEqual("error: method must be one of beginner, twophase, cfop", result.get("status"))
+
+    def test_invalid_method_rotate(self):
+        result = solve(
+            {
+                "op": "solve",
+                "cube": "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy",
+                "rotate": "F",
+                "method": "nop",
+            }
+        )
+        self.assertEqual("error: method must be one of beginner, twophase, cfop", result.get("status"))
+
+    def test_twophase_method(self):
+        result = solve(
+            {"op": "solve", "cube": "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw", "method": "twophase"}
+        )
+        self.assertIn("status", result)
+        self.assertEqual("ok", result.get("status"))
+        cube = Cube("bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw")
+        for rotation in result.get("solution"):
+            cube.rotate(rotation)
+        self.assertTrue(cube.is_solved())
+
+    def test_cfop_method(self):
+        result = solve(
+            {"op": "solve", "cube": "bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw", "method": "cfop"}
+        )
+        self.assertIn("status", result)
+        self.assertEqual("ok", result.get("status"))
+        cube = Cube("bbrgoywwgbrbgbgrbgobowrwobryyorgobrggowoygywwroyywyyrw")
+        for rotation in result.get("solution"):
+            cube.rotate(rotation)
+        self.assertTrue(cube.is_solved())
+
+    def test_unsolvable_twophase(self):
+        result = solve(
+            {"op": "solve", "cube": "bbybbbbbbbrrrrrrrrgggggggggoooooooooyyyyyyyyrwwwwwwwww", "method": "twophase"}
+        )
+        self.assertIn("status", result)
+        self.assertEqual("error: cube corners must not be twisted", result.get("status"))
@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from rubik.dispatch import INVALID_JSON
+from rubik.stream import dispatch_stream, main, parse_lines
+
+
+SOLVED_CUBE = "gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy"
+
+
+class StreamTest(TestCase):
+    def test_parse_lines(self):
+        items = list(parse_lines(['{"op": "info"}\n', "\n", "nope\n", b'{"op": "check"}']))
+        self.assertEqual([{"op": "info"}, INVALID_JSON, {"op": "check"}], items)
+
+    def test_parse_lines_lazy(self):
+        def lines():
+            yield '{"op": "info"}\n'
+            raise AssertionError("read past the first line")
+
+        self.assertEqual({"op": "info"}, next(parse_lines(lines())))
+
+    def test_dispatch_stream(self):
+        items = [{"op": "info"}, INVALID_JSON, "not a dictionary", {"op": "solve", "cube": SOLVED_CUBE, "rotate": "F"}]
+        results = list(dispatch_stream(items))
+        self.assertEqual(
+            [
+                {"status": "wah0028"},
+                {"status": "error: item is not valid json"},
+                {"status": "error: parameter is not a dictionary"},
+                {"status": "ok", "cube": "gggggggggwrrwrrwrrbbbbbbbbbooyooyooywwwwwwooorrryyyyyy"},
+            ],
+            results,
+        )
+
+    def test_dispatch_stream_workers(self):
+        items = [{"op": "solve", "cube": SOLVED_CUBE, "rotate": "FRBLUD"[i % 6]} for i in range(30)]
+        items.insert(7, INVALID_JSON)
+        self.assertEqual(list(dispatch_stream(items)), list(dispatch_stream(iter(items), workers=2, window=3)))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, target = os.path.join(directory, "in.jsonl"), os.path.join(directory, "out.jsonl")
+            with open(source, "w") as file:
+                file.write('{"op": "info"}\n{"op": "nop"}\n')
+            main([source, target])
+            with open(target) as file:
+                results = [json.loads(line) for line in file]
+        self.assertEqual([{"status": "wah0028"}, {"status": "error: op is not legal"}], results)
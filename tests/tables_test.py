@@ -0,0 +1,65 @@
+from array import array
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from rubik import tables
+
+
+class TablesTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.tbl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pack_nibbles(self):
+        values = bytes([1, 2, 3, 15, 0, 7, 9])
+        packed = tables.pack_nibbles(values)
+        self.assertEqual(4, len(packed))
+        self.assertEqual(list(values), [tables.nibble(packed, i) for i in range(len(values))])
+
+    def test_pack_large_nibbles(self):
+        with self.assertRaises(ValueError):
+            tables.pack_nibbles(bytes([16]))
+
+    def test_round_trip(self):
+        moves = array("H", [0, 1, 65535, 300])
+        pruning = bytearray([3, 1, 4, 1, 5])
+        tables.save(self.path, 1, {"moves": moves, "raw": b"abc", "pruning": pruning}, ("pruning",))
+        loaded = tables.load(self.path, 1)
+        self.assertEqual(list(moves), list(loaded["moves"]))
+        self.assertEqual(b"abc", bytes(loaded["raw"]))
+        self.assertEqual(list(pruning), [tables.nibble(loaded["pruning"], i) for i in range(len(pruning))])
+
+    def test_missing_file(self):
+        self.assertIsNone(tables.load(self.path, 1))
+
+    def test_wrong_version(self):
+        tables.save(self.path, 1, {"raw": b"abc"})
+        self.assertIsNone(tables.load(self.path, 2))
+
+    def test_corrupt_file(self):
+        tables.save(self.path, 1, {"raw": b"abc"})
+        with open(self.path, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b"x")
+        self.assertIsNone(tables.load(self.path, 1))
+
+    def test_cached(self):
+        builds = []
+
+        def build():
+            builds.append(True)
+            return {"moves": array("H", [1, 2, 3]), "pruning": bytearray([1, 2])}
+
+        with patch.object(tables, "TABLE_DIR", self.directory.name):
+            first = tables.cached("test", 1, build, ("pruning",))
+            second = tables.cached("test", 1, build, ("pruning",))
+            tables.cached("test", 2, build, ("pruning",))
+        self.assertEqual(2, len(builds))
+        self.assertEqual([1, 2, 3], list(first["moves"]))
+        self.assertEqual([1, 2, 3], list(second["moves"]))
+        self.assertEqual([1, 2], [tables.nibble(second["pruning"], i) for i in range(2)])
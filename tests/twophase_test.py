@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+import random
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from rubik.cube import Cube
+from rubik import twophase
+
+
+class TwophaseTest(TestCase):
+    def test_move_cubies(self):
+        rng = random.Random(5700)
+        for _ in range(100):
+            cube = Cube("FFFFFFFFFRRRRRRRRRBBBBBBBBBLLLLLLLLLUUUUUUUUUDDDDDDDDD")
+            cubie = twophase.CubieCube()
+            for _ in range(25):
+                m = rng.randrange(twophase.N_MOVES)
+                face, power = twophase.MOVES[m]
+                cube.rotate(twophase.MOVE_FACES[face], rotations=power)
+                cubie = cubie.multiply(twophase.MOVE_CUBIES[m])
+            self.assertEqual(cubie, twophase.to_cubie(str(cube)))
+            self.assertTrue(cubie.is_solvable())
+
+    def test_solved(self):
+        self.assertEqual("", twophase.solve("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww"))
+
+    def test_twisted_corner(self):
+        # the up-front-right corner twisted in place
+        with self.assertRaises(ValueError):
+            twophase.solve("bbybbbbbbbrrrrrrrrgggggggggoooooooooyyyyyyyyrwwwwwwwww")
+
+    def test_flipped_edge(self):
+        # the up-front edge flipped in place
+        with self.assertRaises(ValueError):
+            twophase.solve("byb" "bbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww")
+
+    def test_solve(self):
+        for _ in range(5):
+            cube = Cube("bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww")
+            cube.scramble(50)
+            scrambled_cube = str(cube)
+            solution = cube.solve("twophase")
+            self.assertTrue(cube.is_solved())
+            face_turns = sum(1 for i, rotation in enumerate(solution) if i == 0 or rotation != solution[i - 1])
+            self.assertLessEqual(face_turns, 24)
+            cube = Cube(scrambled_cube)
+            for rotation in solution:
+                cube.rotate(rotation)
+            self.assertTrue(cube.is_solved())
+
+    def test_tables_threaded(self):
+        loaded, calls = twophase.tables(), []
+
+        def slow_cached(*args):
+            calls.append(args)
+            time.sleep(0.1)
+            return loaded.__dict__
+
+        with patch.object(twophase, "_TABLES", None), patch.object(twophase, "cached", slow_cached):
+            with ThreadPoolExecutor(4) as executor:
+                results = list(executor.map(lambda _: twophase.tables(), range(4)))
+        # the tables are loaded once, however many solves start cold at the same time
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, len(set(map(id, results))))